@@ -1,5 +1,6 @@
+import os
+import sys
 import pandas as pd
-import pickle
 import streamlit as st
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
@@ -7,11 +8,15 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings("ignore")
 
+# Package ``skill_radar`` à la racine du dépôt
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from skill_radar.model_registry import ModelRegistry
+
 # 🔹 Chargement des modèles et prévisions
 @st.cache_resource
 def load_models():
-    with open("prophet_models.pkl", "rb") as f:
-        return pickle.load(f)
+    # Seul le manifeste est lu ; chaque modèle est chargé à la demande
+    return ModelRegistry("prophet_registry")
 
 @st.cache_data
 def load_forecasts():
@@ -2,7 +2,23 @@ import streamlit as st
 import pandas as pd
 from pymongo import MongoClient
 import plotly.express as px
+import plotly.graph_objects as go
 from collections import Counter
+import os
+import sys
+
+# Package ``skill_radar`` à la racine du dépôt
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from skill_radar import metrics
+from skill_radar.config import SALARY_SKETCH_COLLECTION
+from skill_radar.countries import UNKNOWN, resolve_countries
+from skill_radar.dedup import DISTINCT   # each near-duplicate posting counted once
+from skill_radar.salary_sketches import MIN_COUNT, load_quantiles
+from skill_radar.shared_datasets import shared_frame
+from skill_radar.skill_network import EDGE_METRICS, MIN_COOCCURRENCE, TOP_N, data_version, edge_weights, layout, load_network
+from skill_radar.titles import normalize_title
+
+stop_profiling = metrics.profile_from_env("dashboard", st.session_state)   # un profiler par session
 # --------------------------
 # MongoDB Configuration
 # --------------------------
@@ -21,23 +37,35 @@ CUSTOM_PALETTE = [
 # --------------------------
 # MongoDB Aggregation
 # --------------------------
+@st.cache_data(ttl=60)
+def get_data_version():
+    # Number + last _id of the distinct postings with skills + in-place rewrites (skill_radar.data_versions):
+    # the large datasets are rebuilt when it changes
+    client = MongoClient(MONGO_URI)
+    return data_version(client[DB_NAME][COLLECTION_NAME])
+
 @st.cache_data
+@metrics.timed("dashboard_query", loader="get_job_count_by_country")
 def get_job_count_by_country():
     client = MongoClient(MONGO_URI)
     collection = client[DB_NAME][COLLECTION_NAME]
 
+    # Canonical Country (python -m skill_radar.countries); postings not backfilled yet are grouped by raw Location
     pipeline = [
-        {"$match": {"Location": {"$ne": None, "$ne": ""}}},
-        {"$group": {"_id": "$Location", "Job Count": {"$sum": 1}}},
-        {"$sort": {"Job Count": -1}}
+        {"$match": {**DISTINCT, "$or": [{"Country": {"$nin": [None, ""]}}, {"Location": {"$nin": [None, ""]}}]}},
+        {"$set": {"country": {"$ifNull": ["$Country", ""]}}},
+        {"$group": {"_id": {"country": "$country",
+                            "location": {"$cond": [{"$eq": ["$country", ""]}, "$Location", None]}},
+                    "Job Count": {"$sum": 1}}},
     ]
 
     results = list(collection.aggregate(pipeline))
-    df = pd.DataFrame(results)
-    df.rename(columns={"_id": "Country"}, inplace=True)
-    df["Country"] = df["Country"].str.strip().str.title()
+    df = pd.DataFrame([{**r["_id"], "Job Count": r["Job Count"]} for r in results],
+                      columns=["country", "location", "Job Count"])
+    df["Country"] = df["country"].where(df["country"] != "", resolve_countries(df["location"]))
+    df = df[df["Country"] != UNKNOWN].groupby("Country", as_index=False)["Job Count"].sum()
 
-    return df
+    return df.sort_values("Job Count", ascending=False)
 
 # --------------------------
 # Streamlit App
@@ -76,18 +104,19 @@ with st.spinner("🔄 Loading data from MongoDB..."):
 col1, col2 = st.columns([1.5,1.5])
 col3, col4 = st.columns(2)
 col5, col6 = st.columns([2,1])
-with col4:
+with col4, metrics.timer("dashboard_render", panel="top_companies"):
     st.subheader("🏢 Top Companies by Job Offers")
     # --------------------------
     # Get Top Companies by Offer Count
     # --------------------------
     @st.cache_data
+    @metrics.timed("dashboard_query", loader="get_top_companies")
     def get_top_companies(limit=20):
         client = MongoClient(MONGO_URI)
         collection = client[DB_NAME][COLLECTION_NAME]
 
         pipeline = [
-            {"$match": {"Company": {"$ne": None, "$ne": ""}}},
+            {"$match": {**DISTINCT, "Company": {"$ne": None, "$ne": ""}}},
             {"$group": {"_id": "$Company", "Job Count": {"$sum": 1}}},
             {"$sort": {"Job Count": -1}},
             {"$limit": limit}
@@ -124,7 +153,7 @@ with col4:
     st.plotly_chart(fig_companies, use_container_width=True)
 
 
-with col2:
+with col2, metrics.timer("dashboard_render", panel="country_map"):
     st.header("🌍 Job Offers by Country")
     fig = px.choropleth(
     df,
@@ -152,18 +181,19 @@ with col2:
     st.plotly_chart(fig, use_container_width=True)
 
 
-with col3:
+with col3, metrics.timer("dashboard_render", panel="offers_over_time"):
     st.header("📈 Job Offers Over Time")
     # --------------------------
     # Get Job Count by Month (Python version)
     # --------------------------
     @st.cache_data
+    @metrics.timed("dashboard_query", loader="get_job_count_by_month")
     def get_job_count_by_month():
         client = MongoClient(MONGO_URI)
         collection = client[DB_NAME][COLLECTION_NAME]
 
         # Only fetch the Date field
-        cursor = collection.find({"Date": {"$ne": None}}, {"Date": 1})
+        cursor = collection.find({**DISTINCT, "Date": {"$ne": None}}, {"Date": 1})
         dates = list(cursor)
         df = pd.DataFrame(dates)
 
@@ -200,7 +230,7 @@ with col3:
 
     st.plotly_chart(fig_months, use_container_width=True)
 
-with col1:
+with col1, metrics.timer("dashboard_render", panel="top_job_titles"):
     st.header("• Top Job Titles ")
     # --------------------------
     # Get Top Job Titles for Treemap
@@ -208,12 +238,13 @@ with col1:
     # Get Top Job Titles (Python cleaning)
     # --------------------------
     @st.cache_data
+    @metrics.timed("dashboard_query", loader="get_top_job_titles")
     def get_top_job_titles(limit=20):
         client = MongoClient(MONGO_URI)
         collection = client[DB_NAME][COLLECTION_NAME]
 
         # Only fetch the Job Title field
-        cursor = collection.find({}, {"Job Title": 1})
+        cursor = collection.find(DISTINCT, {"Job Title": 1})
         data = list(cursor)
         df = pd.DataFrame(data)
 
@@ -255,17 +286,18 @@ with col1:
 
 
 
-with col5:
+with col5, metrics.timer("dashboard_render", panel="top_skills"):
     # --------------------------
     # Get Top Skills from Skills Field
     # --------------------------
     @st.cache_data
+    @metrics.timed("dashboard_query", loader="get_top_skills")
     def get_top_skills(limit=20):
         client = MongoClient(MONGO_URI)
         collection = client[DB_NAME][COLLECTION_NAME]
 
         # Only fetch Skills field
-        cursor = collection.find({"Skills": {"$ne": None}}, {"Skills": 1})
+        cursor = collection.find({**DISTINCT, "Skills": {"$ne": None}}, {"Skills": 1})
         data = list(cursor)
         df = pd.DataFrame(data)
 
@@ -307,57 +339,19 @@ with col5:
     )
 
     st.plotly_chart(fig_skills, use_container_width=True)
-with col6:
-    # --------------------------
-    # Normalize Job Titles
-    # --------------------------
-    def normalize_title(title):
-        title = title.lower().strip()
-
-        if "senior" in title and "data analyst" in title:
-            return "Senior Data Analyst"
-        elif "lead" in title and "data analyst" in title:
-            return "Lead Data Analyst"
-        elif "data analyst" in title:
-            return "Data Analyst"
-
-        elif "senior" in title and "data engineer" in title:
-            return "Senior Data Engineer"
-        elif "lead" in title and "data engineer" in title:
-            return "Lead Data Engineer"
-        elif "data engineer" in title:
-            return "Data Engineer"
-
-        elif "machine learning" in title or "ml engineer" in title:
-            return "Machine Learning Engineer"
-        elif "data scientist" in title and "senior" in title:
-            return "Senior Data Scientist"
-        elif "data scientist" in title:
-            return "Data Scientist"
-
-        elif "business analyst" in title:
-            return "Business Analyst"
-        elif "cloud engineer" in title:
-            return "Cloud Engineer"
-        elif "software engineer" in title:
-            return "Software Engineer"
-        elif "database administrator" in title:
-            return "Database Administrator"
-        else:
-            return "Other"
-
+with col6, metrics.timer("dashboard_render", panel="skills_per_title"):
     # --------------------------
     # Get Skills by Normalized Job Title
     # --------------------------
-    @st.cache_data
+    @metrics.timed("dashboard_query", loader="get_job_title_skills")
     def get_job_title_skills():
         client = MongoClient(MONGO_URI)
         collection = client[DB_NAME][COLLECTION_NAME]
 
         # Fetch only job title and skills
         cursor = collection.find(
-            {"Job Title": {"$ne": None}, "Skills": {"$ne": None}},
-            {"Job Title": 1, "Skills": 1}
+            {**DISTINCT, "Job Title": {"$ne": None}, "Skills": {"$ne": None}},
+            {"_id": 0, "Job Title": 1, "Skills": 1}
         )
         data = list(cursor)
         df = pd.DataFrame(data)
@@ -376,12 +370,17 @@ with col6:
 
         return df
 
+    @st.cache_resource(max_entries=2)
+    def get_shared_job_title_skills(version):
+        # Published once per data version as Arrow in shared memory; every session / worker maps the same copy
+        return shared_frame("job_title_skills", version, get_job_title_skills)
+
     # --------------------------
     # Section: Pie Chart of Skills by Job Title
     # --------------------------
     st.header("• Skill Distribution per Job Title")
 
-    df_skills_by_title = get_job_title_skills()
+    df_skills_by_title = get_shared_job_title_skills(get_data_version())
 
     # Dropdown for normalized job title
     # Exclude 'Other' from dropdown
@@ -421,3 +420,136 @@ with col6:
 
     fig_pie.update_traces(textinfo="percent+label")
     st.plotly_chart(fig_pie, use_container_width=True)
+
+with metrics.timer("dashboard_render", panel="skill_network"):
+    # --------------------------
+    # Skill Co-occurrence Network (Xᵀ X over a sparse posting x skill matrix)
+    # --------------------------
+    @st.cache_resource(max_entries=2)
+    @metrics.timed("dashboard_query", loader="get_skill_network")
+    def get_skill_network(version):
+        # Built once per data version; every filter below reuses the same matrix
+        client = MongoClient(MONGO_URI)
+        return load_network(client[DB_NAME][COLLECTION_NAME], normalize_title)
+
+    @st.cache_data(max_entries=64)
+    def get_skill_graph(version, title, start, end, top_n, min_count):
+        return get_skill_network(version).graph(title, start, end, top_n, min_count)
+
+    # --------------------------
+    # Section: Skill Network
+    # --------------------------
+    st.header("🕸️ Skill Co-occurrence Network")
+
+    version = get_data_version()
+    network = get_skill_network(version)
+
+    f1, f2, f3, f4 = st.columns([1.2, 2, 1, 1])
+    network_title = f1.selectbox("Job Title", ["All Titles"] + network.title_counts().index.tolist(), key="network_title")
+    month_range = network.month_range()
+    start = end = None
+    if month_range:
+        months = pd.period_range(*month_range, freq="M").astype(str).tolist()
+        start, end = f2.select_slider("Months", options=months, value=(months[0], months[-1]))
+        if (start, end) == (months[0], months[-1]):
+            start = end = None   # whole range: undated postings included
+    top_n = f3.slider("Top skills", 10, 60, TOP_N, step=5)
+    min_count = f3.number_input("Min. co-occurrences", 1, 1000, MIN_COOCCURRENCE)
+    edge_metric = f4.radio("Edge weight", EDGE_METRICS)
+
+    nodes, edges = get_skill_graph(version, None if network_title == "All Titles" else network_title,
+                                   start, end, top_n, min_count)
+    if nodes.empty:
+        st.info("No posting matches these filters.")
+    else:
+        positions = layout(edge_weights(nodes, edges, edge_metric))
+        index = {skill: i for i, skill in enumerate(nodes["Skill"])}
+        fig_network = go.Figure()
+        # Edges in three bands of weight (thin → thick)
+        bands = (3 * edges[edge_metric].rank(method="first", pct=True)).clip(upper=2.999).astype(int)
+        for band, width in zip(range(3), [0.5, 1.5, 3]):
+            xs, ys = [], []
+            for source, target in edges.loc[bands == band, ["source", "target"]].itertuples(index=False):
+                (x0, y0), (x1, y1) = positions[index[source]], positions[index[target]]
+                xs += [x0, x1, None]
+                ys += [y0, y1, None]
+            fig_network.add_trace(go.Scatter(x=xs, y=ys, mode="lines", hoverinfo="skip", showlegend=False,
+                                             line=dict(width=width, color="rgba(2, 62, 138, 0.35)")))
+        fig_network.add_trace(go.Scatter(
+            x=positions[:, 0], y=positions[:, 1], mode="markers+text", text=nodes["Skill"],
+            textposition="top center", showlegend=False,
+            marker=dict(size=10 + 30 * nodes["Share"] / nodes["Share"].max(), color=nodes["Cluster"],
+                        colorscale=CUSTOM_PALETTE[1:], line=dict(width=1, color="#03045e")),
+            customdata=nodes[["Count", "Cluster"]],
+            hovertemplate="%{text}<br>Postings: %{customdata[0]}<br>Cluster: %{customdata[1]}<extra></extra>",
+        ))
+        fig_network.update_layout(
+            height=700, margin={"t": 20, "r": 0, "l": 0, "b": 0},
+            xaxis=dict(visible=False), yaxis=dict(visible=False), plot_bgcolor="white"
+        )
+        st.plotly_chart(fig_network, use_container_width=True)
+
+        st.dataframe(
+            edges.sort_values(edge_metric, ascending=False).head(50).round({"lift": 2, "pmi": 3}),
+            use_container_width=True, hide_index=True
+        )
+
+with metrics.timer("dashboard_render", panel="salary_distribution"):
+    # --------------------------
+    # Salary quantiles read from the t-digest sketches (no scan of the postings)
+    # --------------------------
+    @st.cache_data(ttl=300)
+    @metrics.timed("dashboard_query", loader="get_salary_quantiles")
+    def get_salary_quantiles(dimension, country=None, min_count=MIN_COUNT, limit=None):
+        client = MongoClient(MONGO_URI)
+        return load_quantiles(dimension, country, client[DB_NAME][SALARY_SKETCH_COLLECTION], min_count, limit=limit)
+
+    # --------------------------
+    # Section: Salary Distribution
+    # --------------------------
+    st.header("💰 Salary Distribution")
+    st.caption("Yearly salaries of the postings that publish one: the bar spans p10 → p90, the marker is the median.")
+
+    s1, s2, s3 = st.columns([1, 1, 1])
+    salary_view = s1.radio("Group by", ["Job Title", "Skill", "Country"], horizontal=True)
+    min_salaries = s3.number_input("Min. salaries per group", 1, 10_000, MIN_COUNT)
+    if salary_view == "Job Title":
+        countries = get_salary_quantiles("country", min_count=min_salaries)["country"].tolist()
+        salary_country = s2.selectbox("Country", ["All Countries"] + countries, key="salary_country")
+        if salary_country == "All Countries":
+            df_salary = get_salary_quantiles("title", min_count=min_salaries)
+        else:
+            df_salary = get_salary_quantiles("title_country", salary_country, min_salaries)
+        label = "title"
+    elif salary_view == "Skill":
+        top_skills = s2.slider("Top skills", 10, 60, 25, step=5)
+        df_salary = get_salary_quantiles("skill", min_count=min_salaries, limit=top_skills)
+        label = "skill"
+    else:
+        df_salary = get_salary_quantiles("country", min_count=min_salaries)
+        label = "country"
+
+    if df_salary.empty:
+        st.info("Not enough salaries for this selection.")
+    else:
+        df_salary = df_salary.sort_values("p50")
+        fig_salary = go.Figure()
+        fig_salary.add_trace(go.Bar(
+            y=df_salary[label], x=df_salary["p90"] - df_salary["p10"], base=df_salary["p10"],
+            orientation="h", marker_color="#90e0ef", name="p10 – p90",
+            customdata=df_salary[["p10", "p90", "count"]],
+            hovertemplate="p10: %{customdata[0]:,.0f}<br>p90: %{customdata[1]:,.0f}<br>Salaries: %{customdata[2]}<extra></extra>",
+        ))
+        fig_salary.add_trace(go.Scatter(
+            y=df_salary[label], x=df_salary["p50"], mode="markers", name="Median",
+            marker=dict(color="#03045e", size=10, symbol="diamond"),
+            hovertemplate="Median: %{x:,.0f}<extra></extra>",
+        ))
+        fig_salary.update_layout(
+            height=max(400, 28 * len(df_salary)), margin={"t": 20, "r": 0, "l": 0, "b": 0},
+            xaxis_title="Yearly salary", yaxis_title=None, plot_bgcolor="white"
+        )
+        st.plotly_chart(fig_salary, use_container_width=True)
+
+metrics.incr("dashboard_runs")
+stop_profiling()
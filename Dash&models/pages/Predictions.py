@@ -1,14 +1,26 @@
 import streamlit as st
-import joblib
-import tensorflow as tf
 import pandas as pd
 import numpy as np
-from tensorflow.keras.models import load_model
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from datetime import datetime
-import pickle
 import warnings
+import os
+import sys
+
+# Make the shared ``skill_radar`` package (repository root) importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from skill_radar.forecast_ranking import forecast_matrices, rank_skills, top_movers, RANKING_METRICS
+from skill_radar.numpy_recommender import export_weights
+from skill_radar.cooccurrence_recommender import CooccurrenceRecommender
+from skill_radar.prediction_client import PredictionClient, SERVICE_URL_ENV
+from skill_radar.prediction_service import Predictor
+from skill_radar.model_registry import ModelRegistry
+from skill_radar.skill_trends import history, load_state, summary
+from skill_radar.shared_datasets import file_version, shared_frame
+from skill_radar import metrics
+
+stop_profiling = metrics.profile_from_env("predictions", st.session_state)   # un profiler par session
 
 # ======================
 # ✅ SETUP
@@ -20,7 +32,7 @@ st.set_page_config(layout="wide", page_title="Prediction Tools")
 st.sidebar.header("🔧 Select One Prediction Tool")
 selected_tool = st.sidebar.radio(
     "Choose the type of prediction you want to perform:",
-    ["📈 Skill Forecast", "🧠 Skill Recommendation", "💰 Salary Estimation"]
+    ["📈 Skill Forecast", "🚀 Rising Skills", "🧠 Skill Recommendation", "💰 Salary Estimation"]
 )
 
 st.title("🧮 Prediction Center")
@@ -30,49 +42,119 @@ st.title("🧮 Prediction Center")
 # ======================
 RECOMMENDER_MODEL_PATH = "D:\cycle_ing\\2eme anne bdia\S4\web scrapping\\final\projectfinal\Dash&models\\build model\skill recomendation\dl model\skill_recommender.h5"
 RECOMMENDER_MLB_PATH = "D:\cycle_ing\\2eme anne bdia\S4\web scrapping\\final\projectfinal\Dash&models\\build model\skill recomendation\dl model\skill_label_binarizer (1).pkl"
+RECOMMENDER_VOCABULARY_PATH = os.path.join(os.path.dirname(RECOMMENDER_MODEL_PATH), "skill_vocabulary.json")
+RECOMMENDER_WEIGHTS_PATH = os.path.join(os.path.dirname(RECOMMENDER_MODEL_PATH), "skill_recommender_weights.npz")
+COOCCURRENCE_ENGINE_PATH = os.path.join(os.path.dirname(RECOMMENDER_MODEL_PATH), "cooccurrence_engine.pkl")
 
 FORECAST_MODEL_PATH = "D:\cycle_ing\\2eme anne bdia\S4\web scrapping\\final\projectfinal\Dash&models\\build model\skill forcasting\prophet_models.pkl"
 FORECAST_CSV_PATH = "D:\cycle_ing\\2eme anne bdia\S4\web scrapping\\final\projectfinal\Dash&models\\build model\skill forcasting\\forecast_all_skills.csv"
+FORECAST_REGISTRY_PATH = os.path.join(os.path.dirname(FORECAST_MODEL_PATH), "prophet_registry")
 
 SALARY_MODEL_PATH = "D:\cycle_ing\\2eme anne bdia\S4\web scrapping\\final\projectfinal\Dash&models\\build model\salary estimation\\final_deep_learning_model.h5"
 SALARY_SCALER_PATH = "D:\cycle_ing\\2eme anne bdia\S4\web scrapping\\final\projectfinal\Dash&models\\build model\salary estimation\\feature_scaler (1).pkl"
 
+# Set PREDICTION_SERVICE_URL (e.g. http://127.0.0.1:8765) to use the shared prediction service
+PREDICTION_SERVICE_URL = os.getenv(SERVICE_URL_ENV)
+
 # ======================
 # 📦 LOAD MODELS
 # ======================
 @st.cache_resource
-def load_recommender():
-    return load_model(RECOMMENDER_MODEL_PATH), joblib.load(RECOMMENDER_MLB_PATH)
+@metrics.timed("prediction_model_load", model="predictor")
+def load_predictor():
+    # Shared service: no model is loaded in this process
+    if PREDICTION_SERVICE_URL:
+        return PredictionClient(PREDICTION_SERVICE_URL)
+    # NumPy recommender: TensorFlow is only needed once, to export the weights
+    if not os.path.exists(RECOMMENDER_WEIGHTS_PATH):
+        # Vocabulaire du SkillFeaturizer si le modèle a été ré-entraîné avec, sinon l'ancien MultiLabelBinarizer
+        classes_path = RECOMMENDER_VOCABULARY_PATH if os.path.exists(RECOMMENDER_VOCABULARY_PATH) else RECOMMENDER_MLB_PATH
+        export_weights(RECOMMENDER_MODEL_PATH, classes_path, RECOMMENDER_WEIGHTS_PATH)
+    # Prévisions : tranches du frame Arrow partagé (load_skill_forecast), pas de copie par processus
+    return Predictor(RECOMMENDER_WEIGHTS_PATH, SALARY_MODEL_PATH, SALARY_SCALER_PATH, forecast_csv_path=None)
+
+@st.cache_data
+def load_predictor_metadata():
+    return load_predictor().metadata()
+
+@st.cache_data(ttl=60)
+def get_cooccurrence_version():
+    # Taille + mtime du pickle : rechargé après chaque "cooccurrence_recommender update"
+    return file_version(COOCCURRENCE_ENGINE_PATH) if os.path.exists(COOCCURRENCE_ENGINE_PATH) else None
+
+@st.cache_resource(max_entries=1)
+@metrics.timed("prediction_model_load", model="cooccurrence")
+def load_cooccurrence_engine(version):
+    if version is None:
+        return None
+    return CooccurrenceRecommender.load(COOCCURRENCE_ENGINE_PATH)
 
 @st.cache_resource
-def load_forecast_models():
-    with open(FORECAST_MODEL_PATH, "rb") as f:
-        return pickle.load(f)
+@metrics.timed("prediction_model_load", model="prophet_registry")
+def load_model_registry():
+    # Only the manifest is read here; each Prophet model is loaded on demand
+    return ModelRegistry(FORECAST_REGISTRY_PATH)
 
-@st.cache_data
-def load_forecast_data():
+def read_forecast_csv():
     df = pd.read_csv(FORECAST_CSV_PATH)
     df["ds"] = pd.to_datetime(df["ds"])
     return df
 
-@st.cache_resource
-def load_salary_model():
-    model = tf.keras.models.load_model(SALARY_MODEL_PATH)
-    scaler = joblib.load(SALARY_SCALER_PATH)
-    return model, scaler
+@st.cache_data(ttl=60)
+def get_forecast_version():
+    return file_version(FORECAST_CSV_PATH)
+
+@st.cache_resource(max_entries=2)
+@metrics.timed("prediction_model_load", model="forecast_csv")
+def load_forecast_data(version):
+    # Une seule copie Arrow par machine (mémoire partagée), attachée sans copie par chaque session / worker
+    return shared_frame("forecasts", version, read_forecast_csv)
+
+@st.cache_resource(max_entries=2)
+def load_forecast_matrices(version):
+    return forecast_matrices(load_forecast_data(version))
+
+@st.cache_data(max_entries=2)
+def load_forecast_skills(version):
+    if PREDICTION_SERVICE_URL:
+        return predictor_metadata["forecast_skills"]
+    return sorted(load_forecast_data(version)["Skill"].unique())
+
+@st.cache_data(ttl=60)
+@metrics.timed("prediction_predict", tool="forecast")
+def load_skill_forecast(skill, start, end, version):
+    # Service partagé (/forecast)
+    if PREDICTION_SERVICE_URL:
+        return predictor.forecast(skill, f"{start:%Y-%m-%d}", f"{end:%Y-%m-%d}")
+    # Mode local : tranche du frame Arrow partagé (une copie par machine, rafraîchie avec le CSV)
+    df = load_forecast_data(version)
+    return df[(df["Skill"] == skill) & (df["ds"] >= start) & (df["ds"] <= end)].drop(columns="Skill")
+
+@st.cache_data(ttl=300)
+@metrics.timed("prediction_model_load", model="skill_trends")
+def load_live_trend(skill):
+    # Statistiques mises à jour à l'ingestion (skill_radar.skill_trends) : aucun réentraînement
+    try:
+        state = load_state(skill)
+    except Exception as e:
+        print(f"⚠️ Live trends unavailable: {e}")
+        return None, None
+    if state is None:
+        return None, None
+    return summary(state), history(state)
 
 # Load once
-forecast_models = load_forecast_models()
-df_forecasts = load_forecast_data()
-recommender_model, mlb = load_recommender()
-salary_model, scaler = load_salary_model()
+model_registry = load_model_registry()
+forecast_version = get_forecast_version()
+predictor = load_predictor()
+predictor_metadata = load_predictor_metadata()
 
 # ======================
 # 📈 SKILL FORECAST
 # ======================
 if selected_tool == "📈 Skill Forecast":
     st.header("📈 Skill Demand Forecast")
-    selected_skill = st.selectbox("🔍 Select a skill to forecast:", sorted(df_forecasts["Skill"].unique()))
+    selected_skill = st.selectbox("🔍 Select a skill to forecast:", load_forecast_skills(forecast_version))
 
     if selected_skill:
         # 📆 Définir les bornes temporelles
@@ -80,39 +162,117 @@ if selected_tool == "📈 Skill Forecast":
         start_date = today - pd.DateOffset(months=6)
         end_date = today + pd.DateOffset(months=12)
 
+        # 🔁 Recalcul à la demande avec le modèle Prophet (chargé uniquement ici)
+        refit = selected_skill in model_registry and st.checkbox("🔁 Re-forecast with the Prophet model")
+
         # 🔍 Filtrer la compétence sélectionnée
-        df_skill = df_forecasts[df_forecasts["Skill"] == selected_skill]
+        if refit:
+            with st.spinner("🔄 Loading the Prophet model..."), metrics.timer("prediction_predict", tool="reforecast"):
+                df_skill = model_registry.forecast(selected_skill, periods=12)
+        else:
+            df_skill = load_skill_forecast(selected_skill, start_date, end_date, forecast_version)
         df_skill = df_skill[(df_skill["ds"] >= start_date) & (df_skill["ds"] <= end_date)]
 
-        # ➗ Séparer historique et prévision
-        df_hist = df_skill[df_skill["ds"] <= today]
-        df_pred = df_skill[df_skill["ds"] > today]
+        if df_skill.empty:
+            # Prévisions plus anciennes que la fenêtre affichée (modèles à ré-entraîner)
+            st.info(f"No forecast for {selected_skill} between {start_date:%Y-%m} and {end_date:%Y-%m}. "
+                    "Retrain the models: python -m skill_radar.forecast_training")
+        else:
+            # ➗ Séparer historique et prévision
+            df_hist = df_skill[df_skill["ds"] <= today]
+            df_pred = df_skill[df_skill["ds"] > today]
 
-        # 📈 Tracer le graphe
-        fig, ax = plt.subplots(figsize=(14, 6))
+            # 📈 Tracer le graphe
+            fig, ax = plt.subplots(figsize=(14, 6))
 
-        # Historique : ligne bleue
-        ax.plot(df_hist["ds"], df_hist["yhat"], label="Historique (yhat)", color="blue")
+            # Historique : ligne bleue
+            ax.plot(df_hist["ds"], df_hist["yhat"], label="Historique (yhat)", color="blue")
 
-        # Prévision : ligne orange pointillée (sans intervalle)
-        ax.plot(df_pred["ds"], df_pred["yhat"], label="Prévision (yhat)", color="orange", linestyle="--")
+            # Live : comptages mensuels ingérés et niveau EWMA depuis le dernier entraînement
+            live, live_history = load_live_trend(selected_skill)
+            if live_history is not None:
+                live_history = live_history[live_history["ds"] >= start_date]
+                ax.scatter(live_history["ds"], live_history["count"], label="Comptage live", color="gray", zorder=3)
+                ax.plot(live_history["ds"], live_history["level"], label="Niveau EWMA (live)", color="green")
 
-        # Ligne verticale pour aujourd’hui
-        ax.axvline(today, color='red', linestyle=':', label="Aujourd’hui")
+            # Prévision : ligne orange pointillée (sans intervalle)
+            ax.plot(df_pred["ds"], df_pred["yhat"], label="Prévision (yhat)", color="orange", linestyle="--")
+
+            # Ligne verticale pour aujourd’hui
+            ax.axvline(today, color='red', linestyle=':', label="Aujourd’hui")
+
+            # Axe des dates
+            ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
 
-        # Axe des dates
+            # Titres et style
+            ax.set_title(f"Prévision de la demande pour : {selected_skill}")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Nombre d'occurrences")
+            ax.legend()
+            ax.grid(True)
+
+            # Affichage dans Streamlit
+            st.pyplot(fig)
+
+            # ⚡ Momentum live, à côté de la courbe Prophet
+            if live is not None:
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Live level (postings / month)", f"{live['level']:.1f}",
+                            f"{live['current_count']} so far this month", delta_color="off")
+                col2.metric("Live slope", f"{live['slope']:+.2f} / month", f"{live['momentum_pct']:+.1f}%")
+                col3.metric("Change-point score", f"{live['change_score']:+.2f}",
+                            f"last change: {live['last_change']} ({live['change_direction']})" if live["last_change"] else None,
+                            delta_color="off")
+            else:
+                st.caption("No live statistics for this skill yet (python -m skill_radar.skill_trends --rebuild).")
+
+
+# ======================
+# 🚀 RISING SKILLS
+# ======================
+elif selected_tool == "🚀 Rising Skills":
+    st.header("🚀 Fastest Rising & Falling Skills")
+    matrices = load_forecast_matrices(forecast_version)
+    today = pd.to_datetime(datetime.today().date())
+
+    col_h, col_n, col_m = st.columns(3)
+    horizon = col_h.slider("📆 Horizon (months)", 1, 12, 6)
+    top_n = col_n.slider("🔝 Number of skills", 5, 50, 10)
+    metric = col_m.selectbox("📐 Rank by", RANKING_METRICS)
+
+    with metrics.timer("prediction_predict", tool="ranking"):
+        ranking = rank_skills(matrices, today, horizon)
+        risers, fallers = top_movers(ranking, top_n, by=metric)
+    st.caption(f"Projection from {ranking.attrs['from']:%Y-%m} to {ranking.attrs['to']:%Y-%m}")
+
+    col_up, col_down = st.columns(2)
+    with col_up:
+        st.subheader("📈 Top risers")
+        st.dataframe(risers.round(2), use_container_width=True, hide_index=True)
+    with col_down:
+        st.subheader("📉 Top fallers")
+        st.dataframe(fallers.round(2), use_container_width=True, hide_index=True)
+
+    # Comparer plusieurs compétences sur un même graphe
+    compare = st.multiselect("📊 Compare skills", sorted(ranking["Skill"]), default=risers["Skill"].head(3).tolist())
+    if compare:
+        yhat = matrices["yhat"]
+        window = yhat.columns[(yhat.columns >= today - pd.DateOffset(months=6)) &
+                              (yhat.columns <= today + pd.DateOffset(months=horizon))]
+        fig, ax = plt.subplots(figsize=(14, 6))
+        for skill in compare:
+            ax.plot(window, yhat.loc[skill, window], label=skill)
+        ax.axvline(today, color='red', linestyle=':', label="Aujourd’hui")
         ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
         plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-
-        # Titres et style
-        ax.set_title(f"Prévision de la demande pour : {selected_skill}")
+        ax.set_title("Comparaison des prévisions")
         ax.set_xlabel("Date")
         ax.set_ylabel("Nombre d'occurrences")
         ax.legend()
         ax.grid(True)
-
-        # Affichage dans Streamlit
         st.pyplot(fig)
 
 
@@ -121,14 +281,23 @@ if selected_tool == "📈 Skill Forecast":
 # ======================
 elif selected_tool == "🧠 Skill Recommendation":
     st.header("🧠 Skill Recommendation")
-    all_skills = sorted(mlb.classes_)
+    engine_name = st.radio(
+        "⚙️ Recommender engine",
+        ["🧠 Deep Learning", "🔗 Co-occurrence (PMI)", "📍 Similar postings (ANN)"],
+        horizontal=True
+    )
+    cooc_engine = load_cooccurrence_engine(get_cooccurrence_version()) if engine_name != "🧠 Deep Learning" else None
+    if engine_name != "🧠 Deep Learning" and cooc_engine is None:
+        st.warning("Co-occurrence engine not built yet: run `python -m skill_radar.cooccurrence_recommender build`.")
+        st.stop()
+
+    all_skills = sorted(cooc_engine.classes_) if cooc_engine else predictor_metadata["skills"]
 
     def recommend_skills(input_skills, top_k=5):
-        input_vec = mlb.transform([input_skills])
-        preds = recommender_model.predict(input_vec)[0]
-        preds[input_vec[0] == 1] = 0
-        top_indices = preds.argsort()[-top_k:][::-1]
-        return mlb.classes_[top_indices].tolist()
+        if cooc_engine is None:
+            return predictor.recommend(input_skills, top_k)
+        method = "pmi" if engine_name == "🔗 Co-occurrence (PMI)" else "ann"
+        return cooc_engine.recommend(input_skills, top_k, method=method)
 
     selected_skills = st.multiselect("✅ Select your known skills", options=all_skills)
     top_k = st.slider("🔝 Number of skills to recommend", 3, 20, 5)
@@ -137,7 +306,8 @@ elif selected_tool == "🧠 Skill Recommendation":
         if not selected_skills:
             st.warning("Please select at least one skill.")
         else:
-            suggestions = recommend_skills(selected_skills, top_k)
+            with metrics.timer("prediction_predict", tool="recommend", engine=engine_name.split(" ", 1)[1]):
+                suggestions = recommend_skills(selected_skills, top_k)
             st.success("💡 Recommended skills:")
             for skill in suggestions:
                 st.markdown(f"- {skill}")
@@ -147,25 +317,43 @@ elif selected_tool == "🧠 Skill Recommendation":
 # ======================
 elif selected_tool == "💰 Salary Estimation":
     st.header("💰 Salary Estimation")
-    scaler_features = scaler.feature_names_in_
-    job_titles = sorted([f.replace("jobtitle_", "") for f in scaler_features if f.startswith("jobtitle_")])
-    skills_list = sorted([f.replace("skill_", "") for f in scaler_features if f.startswith("skill_")])
+    job_titles = predictor_metadata["job_titles"]
+    skills_list = predictor_metadata["salary_skills"]
 
-    selected_job = st.selectbox("🧠 Select job title", job_titles)
-    selected_salary_skills = st.multiselect("🛠️ Select skills", options=skills_list)
+    single_tab, batch_tab = st.tabs(["👤 Single profile", "📂 Batch (CSV)"])
 
-    if st.button("🔍 Estimate Salary", key="salary"):
-        if not selected_salary_skills:
-            st.warning("Please select at least one skill.")
-        else:
-            X_input = pd.DataFrame(0, index=[0], columns=scaler_features)
-            job_col = f"jobtitle_{selected_job}"
-            if job_col in X_input.columns:
-                X_input[job_col] = 1
-            for skill in selected_salary_skills:
-                skill_col = f"skill_{skill}"
-                if skill_col in X_input.columns:
-                    X_input[skill_col] = 1
-            X_scaled = scaler.transform(X_input)
-            predicted_salary = salary_model.predict(X_scaled)[0][0]
-            st.success(f"💵 Estimated Salary: **{predicted_salary:,.2f} €**")
+    with single_tab:
+        selected_job = st.selectbox("🧠 Select job title", job_titles)
+        selected_salary_skills = st.multiselect("🛠️ Select skills", options=skills_list)
+
+        if st.button("🔍 Estimate Salary", key="salary"):
+            if not selected_salary_skills:
+                st.warning("Please select at least one skill.")
+            else:
+                with metrics.timer("prediction_predict", tool="salary"):
+                    predicted_salary = predictor.estimate(selected_job, selected_salary_skills)
+                st.success(f"💵 Estimated Salary: **{predicted_salary:,.2f} €**")
+
+    with batch_tab:
+        st.markdown("Upload a CSV with a `Job Title` column and a comma-separated `Skills` column.")
+        uploaded = st.file_uploader("📂 Candidate profiles", type="csv")
+        if uploaded is not None:
+            df_profiles = pd.read_csv(uploaded)
+            missing = {"Job Title", "Skills"} - set(df_profiles.columns)
+            if missing:
+                st.error(f"Missing columns: {', '.join(sorted(missing))}")
+            else:
+                with st.spinner(f"🔄 Scoring {len(df_profiles)} profiles..."):
+                    profiles = list(zip(df_profiles["Job Title"], df_profiles["Skills"].fillna("").astype(str)))
+                    with metrics.timer("prediction_predict", tool="salary_batch"):
+                        df_profiles["Estimated Salary"] = predictor.estimate_batch(profiles)
+                    metrics.incr("prediction_profiles_scored", len(profiles))
+                st.dataframe(df_profiles.head(100), use_container_width=True)
+                st.download_button(
+                    "⬇️ Download estimates",
+                    df_profiles.to_csv(index=False).encode("utf-8"),
+                    file_name="salary_estimates.csv",
+                    mime="text/csv"
+                )
+
+stop_profiling()
@@ -0,0 +1,104 @@
+import streamlit as st
+import pandas as pd
+from pymongo import MongoClient
+from datetime import date
+import os
+import sys
+
+# Package ``skill_radar`` à la racine du dépôt
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from skill_radar import metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, DESCRIPTIONS_COLLECTION, MONGO_URI
+from skill_radar.countries import COUNTRY_FIELD, UNKNOWN
+from skill_radar.posting_search import PAGE_SIZE, description, description_matches, search
+
+stop_profiling = metrics.profile_from_env("search", st.session_state)   # un profiler par session
+
+# ======================
+# ✅ SETUP
+# ======================
+st.set_page_config(layout="wide", page_title="Posting Search")
+st.title("🔎 Posting Search")
+st.caption("The postings behind the numbers: full-text search on the title, skills and description, with skill, country and date filters.")
+
+@st.cache_resource
+def get_collection():
+    return MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+
+@st.cache_data(ttl=600)
+@metrics.timed("dashboard_query", loader="get_countries")
+def get_countries():
+    countries = get_collection().distinct(COUNTRY_FIELD)
+    return sorted(c for c in countries if c and c != UNKNOWN)
+
+collection = get_collection()
+
+# ======================
+# 🎛️ FILTERS
+# ======================
+c1, c2, c3, c4 = st.columns([2, 1.5, 1, 1.5])
+text = c1.text_input("Search in title / skills / description", placeholder="rag pipeline")
+skills_text = c2.text_input("Skills (all required, comma-separated)", placeholder="langchain, python")
+country = c3.selectbox("Country", ["All Countries"] + get_countries())
+use_dates = c4.checkbox("Filter by posting date")
+start = end = None
+if use_dates:
+    today = date.today()
+    dates = c4.date_input("Posted between", (today.replace(day=1), today))
+    if len(dates) == 2:   # only the first day is set while the range is being picked
+        start, end = dates
+include_duplicates = st.checkbox("Include near-duplicate postings", value=False)
+
+filters = dict(
+    text=text,
+    skills=[s for s in skills_text.split(",") if s.strip()],
+    country=None if country == "All Countries" else country,
+    start=start,
+    end=end,
+    include_duplicates=include_duplicates,
+)
+
+# Keyset pagination: the key of each page is kept, "Previous" pops it (no skip / limit)
+try:
+    if st.session_state.get("search_filters") != filters:
+        # Matching stored descriptions: looked up once per search, reused by every page
+        st.session_state.search_hashes = description_matches(
+            collection.database[DESCRIPTIONS_COLLECTION], text.strip()) if text.strip() else []
+        st.session_state.search_filters = filters
+        st.session_state.search_keys = [None]
+    keys = st.session_state.search_keys
+    rows, next_key = search(collection, after=keys[-1], page_size=PAGE_SIZE,
+                            description_hashes=st.session_state.search_hashes, **filters)
+except Exception as e:
+    st.error(f"❌ Search failed: {e}")
+    st.stop()
+
+# ======================
+# 📋 RESULTS
+# ======================
+page = len(keys)
+st.subheader(f"Page {page}" + (" (last)" if next_key is None else ""))
+if not rows:
+    st.info("No posting matches these filters.")
+else:
+    df = pd.DataFrame(rows).drop(columns=["PostedAt"], errors="ignore")
+    df["_id"] = df["_id"].astype(str)
+    st.dataframe(df.set_index("_id"), use_container_width=True,
+                 column_config={"URL": st.column_config.LinkColumn("URL")})
+
+    # Description chargée uniquement pour le poste sélectionné
+    labels = {str(r["_id"]): f"{r.get('Job Title')} — {r.get('Company')}" for r in rows}
+    selected = st.selectbox("Show the description of", list(labels), format_func=labels.get)
+    with st.expander("📄 Description"):
+        _id = next(r["_id"] for r in rows if str(r["_id"]) == selected)
+        st.write(description(collection, _id) or "No description.")
+
+prev_col, next_col = st.columns(2)
+if prev_col.button("⬅️ Previous", disabled=page == 1):
+    keys.pop()
+    st.rerun()
+if next_col.button("Next ➡️", disabled=next_key is None):
+    keys.append(next_key)
+    st.rerun()
+
+stop_profiling()
@@ -3,6 +3,18 @@ from pymongo import MongoClient
 from tqdm import tqdm
 import re
 import traceback
+import os
+import sys
+
+# Package ``skill_radar`` à la racine du dépôt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from skill_radar import data_versions
+from skill_radar.config import DESCRIPTIONS_COLLECTION, SALARY_SKETCH_COLLECTION, TRENDS_COLLECTION
+from skill_radar.description_store import HASH_FIELD, attach
+from skill_radar.posting_search import search_fields
+from skill_radar.salary_sketches import SalarySketcher
+from skill_radar.skill_aliases import canonicalize
+from skill_radar.skill_trends import TrendTracker
 
 # ------------------------------ CONFIG ------------------------------
 DB_NAME = "job_database"                  # ← Change if needed
@@ -22,6 +34,9 @@ client = MongoClient(MONGO_URI)
 db = client[DB_NAME]
 collection = db[COLLECTION_NAME]
 collection.create_index("Skills")  # Optional index
+trends = TrendTracker(db[TRENDS_COLLECTION])  # live skill trends (python -m skill_radar.skill_trends)
+salaries = SalarySketcher(db[SALARY_SKETCH_COLLECTION])  # salary sketches of the newly extracted skills
+descriptions = db[DESCRIPTIONS_COLLECTION]  # python -m skill_radar.description_store
 print(f"✅ Connected to collection '{COLLECTION_NAME}' in DB '{DB_NAME}'.")
 
 # ------------------------------ Clean Extracted Skills ------------------------------
@@ -78,12 +93,19 @@ def extract_skills_full_text(text, max_tokens=512):
 
 # ------------------------------ Mongo Query ------------------------------
 query = {
-    "$or": [
-        {"Skills": {"$exists": False}},
-        {"Skills": None},
-        {"Skills": ""}
+    "$and": [
+        {"$or": [
+            {"Skills": {"$exists": False}},
+            {"Skills": None},
+            {"Skills": ""}
+        ]},
+        # inline Description (not migrated yet) or DescriptionHash (description store)
+        {"$or": [
+            {"Description": {"$exists": True}},
+            {HASH_FIELD: {"$ne": None}}
+        ]}
     ],
-    "Description": {"$exists": True}
+    "DuplicateOf": None   # near-duplicates (python -m skill_radar.dedup) are extracted once, on their canonical posting
 }
 
 total = collection.count_documents(query)
@@ -91,19 +113,31 @@ print(f"📊 Found {total} documents missing skills.")
 
 cursor = collection.find(query, no_cursor_timeout=True)
 
+def with_descriptions(cursor, batch_size=100):
+    """Postings of the cursor with their Description, read from the store one batch at a time."""
+    batch = []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield from attach(batch, descriptions)
+            batch = []
+    yield from attach(batch, descriptions)
+
 # ------------------------------ Process and Update ------------------------------
 updated_count = 0
 
-for doc in tqdm(cursor, total=total, desc="⏳ Processing"):
+for doc in tqdm(with_descriptions(cursor), total=total, desc="⏳ Processing"):
     try:
-        description = doc.get("Description", "")
-        skills = extract_skills_full_text(description)
+        description = doc.get("Description") or ""
+        skills = canonicalize(extract_skills_full_text(description))
 
         if skills:
             collection.update_one(
                 {"_id": doc["_id"]},
-                {"$set": {"Skills": ", ".join(skills)}}
+                {"$set": {"Skills": ", ".join(skills), **search_fields({**doc, "Skills": ", ".join(skills)})}}
             )
+            trends.add({**doc, "Skills": ", ".join(skills)})
+            salaries.add({**doc, "Skills": ", ".join(skills)}, dimensions=("skill",))
             updated_count += 1
             print(f"✅ Updated _id: {doc['_id']} with {len(skills)} skills.")
         else:
@@ -115,4 +149,8 @@ for doc in tqdm(cursor, total=total, desc="⏳ Processing"):
         continue
 
 cursor.close()
+if updated_count:
+    data_versions.bump(collection)   # cached datasets of the dashboard are rebuilt
+trends.flush()
+salaries.flush()
 print(f"\n🎉 Done. Total documents updated: {updated_count} / {total}")
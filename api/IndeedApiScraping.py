@@ -1,12 +1,26 @@
-from apify_client import ApifyClient
 from pymongo import MongoClient
 from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
 import re
 import pandas as pd
 from dotenv import load_dotenv
 import os
+import sys
+
+# Package ``skill_radar`` à la racine du dépôt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from skill_radar import dedup, metrics
+from skill_radar.apify_fanout import MAX_IN_FLIGHT, fan_out_inputs, stream_items
+from skill_radar.apify_replay import client_from_env
+from skill_radar.config import DESCRIPTIONS_COLLECTION, SALARY_SKETCH_COLLECTION, TRENDS_COLLECTION
+from skill_radar.countries import resolve_country
+from skill_radar.description_store import HASH_FIELD, put
+from skill_radar.posting_search import search_fields
+from skill_radar.salary_sketches import SalarySketcher
+from skill_radar.skill_aliases import canonicalize
+from skill_radar.skill_trends import TrendTracker
 
 load_dotenv()
+metrics.profile_from_env("indeed_scraper")
 
 
 # -------------------- CONFIGURATION --------------------
@@ -14,6 +28,11 @@ APIFY_API_TOKEN = os.getenv("APIFY_TOKEN")
 MONGO_URI = "mongodb://localhost:27017"
 DB_NAME = "job_database"
 COLLECTION_NAME = "job_offers"
+SOURCE = "indeed"
+ACTOR_ID = "hMvNSpz3JnHgl5jkh"
+POSITIONS = ["AI engineer", "Data scientist", "Data engineer", "Data analyst", "ML engineer"]
+COUNTRIES = os.getenv("SKILL_RADAR_SCRAPE_COUNTRIES", "US,GB,CA,IN").split(",")   # Indeed country codes
+MAX_RUNS_IN_FLIGHT = int(os.getenv("SKILL_RADAR_APIFY_CONCURRENCY", MAX_IN_FLIGHT))
 
 # -------------------- INITIALIZATION --------------------
 print("🚀 Loading model...")
@@ -26,13 +45,14 @@ mongo_client = MongoClient(MONGO_URI)
 db = mongo_client[DB_NAME]
 collection = db[COLLECTION_NAME]
 collection.create_index("Skills")
+dedup.ensure_indexes(collection)  # LSH candidates + DuplicateOf
+trends = TrendTracker(db[TRENDS_COLLECTION])  # live monthly counts / EWMA per skill
+salaries = SalarySketcher(db[SALARY_SKETCH_COLLECTION])  # p10 / p50 / p90 per title, skill and country
+descriptions = db[DESCRIPTIONS_COLLECTION]  # compressed, de-duplicated descriptions
 
-client = ApifyClient(APIFY_API_TOKEN)
+client = client_from_env(APIFY_API_TOKEN, SOURCE, asynchronous=True)  # SKILL_RADAR_APIFY=fake → offline replay
 
 # -------------------- HELPERS --------------------
-def extract_country(location):
-    return location.split(",")[-1].strip() if location else "Unknown"
-
 def normalize_salary(s: str | None) -> int | None:
     """
     Convert any hourly / daily / weekly / monthly / yearly pay string
@@ -115,9 +135,11 @@ def extract_skills(text):
     if not text:
         return []
     try:
-        encoding = tokenizer(text, truncation=True, max_length=512, return_tensors="pt")
-        truncated = tokenizer.decode(encoding["input_ids"][0], skip_special_tokens=True)
-        results = skill_ner(truncated)
+        with metrics.timer("scraper_tokenize", source=SOURCE):
+            encoding = tokenizer(text, truncation=True, max_length=512, return_tensors="pt")
+            truncated = tokenizer.decode(encoding["input_ids"][0], skip_special_tokens=True)
+        with metrics.timer("scraper_ner", source=SOURCE):
+            results = skill_ner(truncated)
     except Exception as e:
         print("❌ Skill extraction failed:", e)
         return []
@@ -129,24 +151,25 @@ def extract_skills(text):
         elif r["entity_group"] == "I":
             current.append(r["word"])
     if current: raw.append(" ".join(current))
-    return clean_skills(raw)
+    with metrics.timer("scraper_clean_skills", source=SOURCE):
+        return clean_skills(raw)
 
 # -------------------- SCRAPING --------------------
 run_input = {
-    "position": "AI engineer, Data scientist, Data engineer, Data analyst, ML engineer",
-    "country": "US",
     "location": "",
-    "maxItems": 10,
+    "maxItems": 10,           # per (position, country) run
     "parseCompanyDetails": False,
     "saveOnlyUniqueItems": True,
     "followApplyRedirects": False,
 }
 
-run = client.actor("hMvNSpz3JnHgl5jkh").call(run_input=run_input)
-
-for item in client.dataset(run["defaultDatasetId"]).iterate_items():
+# One actor run per (position, country), MAX_RUNS_IN_FLIGHT at a time, merged and de-duplicated by URL
+runs = fan_out_inputs(run_input, "position", POSITIONS, "country", COUNTRIES)
+print(f"🚀 {len(runs)} actor runs, {MAX_RUNS_IN_FLIGHT} in flight")
+items = stream_items(client, ACTOR_ID, runs, key=lambda item: item.get("url"),
+                     max_in_flight=MAX_RUNS_IN_FLIGHT, source=SOURCE)
+for item in metrics.timed_iter(items, "scraper_apify_fetch", source=SOURCE):
     desc = re.sub(r"\s+", " ", item.get("description", ""))
-    skills = extract_skills(desc)
     raw_salary = item.get("salary", "")
     salary = normalize_salary(raw_salary)
     from datetime import datetime
@@ -164,12 +187,28 @@ for item in client.dataset(run["defaultDatasetId"]).iterate_items():
         "Job Title": item.get("positionName"),
         "Description": desc,
         "Location": item.get("location"),
-        "Country": extract_country(item.get("location", "")),
+        "Country": resolve_country(item.get("location")),
         "Company": item.get("company"),
         "Date": formatted_date,
         "Salary": salary,
         "URL": item.get("url"),
-        "Skills": ", ".join(skills) if skills else None
     }
-    collection.insert_one(job)
-    print(f"✅ Inserted: {job['Job Title']} — {job['Company']} — Salary: {salary}")
+    # Near-duplicate of a stored posting → reuse its skills instead of running the NER again
+    canonical = dedup.annotate(job, collection)
+    if canonical is not None:
+        job["Skills"] = canonical.get("Skills")
+    else:
+        skills = canonicalize(extract_skills(desc))
+        job["Skills"] = ", ".join(skills) if skills else None
+    job.update(search_fields(job))  # PostedAt / SkillTags of the Search page
+    job[HASH_FIELD] = put(descriptions, job.pop("Description"))  # stored before the posting that references it
+    with metrics.timer("scraper_mongo_write", source=SOURCE):
+        collection.insert_one(job)
+    trends.add(job)
+    salaries.add(job)
+    metrics.incr("scraper_items", source=SOURCE)
+    print(f"✅ Inserted: {job['Job Title']} — {job['Company']} — Salary: {salary}"
+          + (f" (duplicate of {canonical['_id']})" if canonical is not None else ""))
+
+trends.flush()
+salaries.flush()
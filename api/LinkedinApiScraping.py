@@ -1,4 +1,3 @@
-from apify_client import ApifyClient
 from pymongo import MongoClient
 from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
 import re
@@ -6,14 +5,34 @@ import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 import os
+import sys
+
+# Package ``skill_radar`` à la racine du dépôt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from skill_radar import dedup, metrics
+from skill_radar.apify_fanout import MAX_IN_FLIGHT, fan_out_inputs, stream_items
+from skill_radar.apify_replay import client_from_env
+from skill_radar.config import DESCRIPTIONS_COLLECTION, SALARY_SKETCH_COLLECTION, TRENDS_COLLECTION
+from skill_radar.countries import resolve_country
+from skill_radar.description_store import HASH_FIELD, put
+from skill_radar.posting_search import search_fields
+from skill_radar.salary_sketches import SalarySketcher
+from skill_radar.skill_aliases import canonicalize
+from skill_radar.skill_trends import TrendTracker
 
 load_dotenv()
+metrics.profile_from_env("linkedin_scraper")
 
 # -------------------- CONFIGURATION --------------------
 APIFY_API_TOKEN = os.getenv("APIFY_TOKEN")
 MONGO_URI = "mongodb://localhost:27017"
 DB_NAME = "job_database"
 COLLECTION_NAME = "job_offers"
+SOURCE = "linkedin"
+ACTOR_ID = "BHzefUZlZRKWxkTck"
+POSITIONS = ["AI engineer", "Data scientist", "Data engineer", "Data analyst", "ML engineer"]
+COUNTRIES = os.getenv("SKILL_RADAR_SCRAPE_COUNTRIES", "United States,United Kingdom,Canada,India").split(",")
+MAX_RUNS_IN_FLIGHT = int(os.getenv("SKILL_RADAR_APIFY_CONCURRENCY", MAX_IN_FLIGHT))
 
 # -------------------- INITIALIZATION --------------------
 print("🚀 Loading model...")
@@ -35,26 +54,13 @@ mongo_client = MongoClient(MONGO_URI)
 db = mongo_client[DB_NAME]
 collection = db[COLLECTION_NAME]
 collection.create_index("Skills")  # Optional performance index
-client = ApifyClient(APIFY_API_TOKEN)
+dedup.ensure_indexes(collection)  # LSH candidates + DuplicateOf
+trends = TrendTracker(db[TRENDS_COLLECTION])  # live monthly counts / EWMA per skill
+salaries = SalarySketcher(db[SALARY_SKETCH_COLLECTION])  # p10 / p50 / p90 per title, skill and country
+descriptions = db[DESCRIPTIONS_COLLECTION]  # compressed, de-duplicated descriptions
+client = client_from_env(APIFY_API_TOKEN, SOURCE, asynchronous=True)  # SKILL_RADAR_APIFY=fake → offline replay
 
 # -------------------- HELPERS --------------------
-def extract_country(location):
-    US_STATES = {"AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
-                 "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
-                 "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"}
-    US_FULL_NAMES = {"california", "texas", "new york", "florida", "georgia", "illinois", "washington", "ohio", "colorado"}
-
-    if not location:
-        return "Unknown"
-    parts = location.split(",")
-    last_part = parts[-1].strip()
-    if last_part.upper() in US_STATES or last_part.lower() in US_FULL_NAMES:
-        return "United States"
-    elif len(parts) == 1:
-        return "Unknown"
-    else:
-        return last_part
-
 def normalize_salary(s):
     if not s or pd.isna(s):
         return None
@@ -120,16 +126,18 @@ def extract_skills(text):
 
     try:
         # 🧠 Properly truncate before passing to the pipeline
-        encoding = tokenizer(
-            text,
-            truncation=True,
-            max_length=512,
-            return_tensors="pt"
-        )
-        truncated_text = tokenizer.decode(encoding["input_ids"][0], skip_special_tokens=True)
+        with metrics.timer("scraper_tokenize", source=SOURCE):
+            encoding = tokenizer(
+                text,
+                truncation=True,
+                max_length=512,
+                return_tensors="pt"
+            )
+            truncated_text = tokenizer.decode(encoding["input_ids"][0], skip_special_tokens=True)
 
         # ✅ Run the NER pipeline on the truncated string
-        results = skill_ner(truncated_text)
+        with metrics.timer("scraper_ner", source=SOURCE):
+            results = skill_ner(truncated_text)
     except Exception as e:
         print(f"❌ Error during skill extraction: {e}")
         return []
@@ -151,28 +159,29 @@ def extract_skills(text):
     if current_skill:
         raw_skills.append(" ".join(current_skill))
 
-    return clean_skills(raw_skills)
+    with metrics.timer("scraper_clean_skills", source=SOURCE):
+        return clean_skills(raw_skills)
 
 
 # -------------------- APIFY ACTOR CONFIG --------------------
 run_input = {
-    "title": "AI engineer, Data scientist, Data engineer, Data analyst, ML engineer",
-    "location": "",
     "companyName": [],
     "companyId": [],
     "publishedAt": "r86400", 
-    "rows": 50,
+    "rows": 50,               # per (title, location) run
     "proxy": {}
 }
 
 # -------------------- SCRAPE, PROCESS & SAVE --------------------
-run = client.actor("BHzefUZlZRKWxkTck").call(run_input=run_input)
-for item in client.dataset(run["defaultDatasetId"]).iterate_items():
+# One actor run per (title, location), MAX_RUNS_IN_FLIGHT at a time, merged and de-duplicated by URL
+runs = fan_out_inputs(run_input, "title", POSITIONS, "location", COUNTRIES)
+print(f"🚀 {len(runs)} actor runs, {MAX_RUNS_IN_FLIGHT} in flight")
+items = stream_items(client, ACTOR_ID, runs, key=lambda item: item.get("jobUrl"),
+                     max_in_flight=MAX_RUNS_IN_FLIGHT, source=SOURCE)
+for item in metrics.timed_iter(items, "scraper_apify_fetch", source=SOURCE):
     desc = item.get("description", "").strip()
     desc = re.sub(r'\s+', ' ', desc)  # remove extra spaces/newlines
 
-    skills = extract_skills(desc)
-    location = extract_country(item.get("location", ""))
     raw_salary = item.get("salary", "").strip()
 
     # Only normalize if the original salary field has a value
@@ -182,13 +191,30 @@ for item in client.dataset(run["defaultDatasetId"]).iterate_items():
     job = {
         "Job Title": item.get("title"),
         "Description": desc,
-        "Location": location,
+        "Location": item.get("location"),
+        "Country": resolve_country(item.get("location")),
         "Date": item.get("publishedAt"),
         "Company": item.get("companyName"),
         "Salary": salary,
         "URL": item.get("jobUrl"),
-        "Skills": ", ".join(skills) if skills else None
     }
-
-    collection.insert_one(job)
-    print(f"✅ Inserted: {job['Job Title']} — {job['Company']}")
+    # Near-duplicate of a stored posting → reuse its skills instead of running the NER again
+    canonical = dedup.annotate(job, collection)
+    if canonical is not None:
+        job["Skills"] = canonical.get("Skills")
+    else:
+        skills = canonicalize(extract_skills(desc))
+        job["Skills"] = ", ".join(skills) if skills else None
+
+    job.update(search_fields(job))  # PostedAt / SkillTags of the Search page
+    job[HASH_FIELD] = put(descriptions, job.pop("Description"))  # stored before the posting that references it
+    with metrics.timer("scraper_mongo_write", source=SOURCE):
+        collection.insert_one(job)
+    trends.add(job)
+    salaries.add(job)
+    metrics.incr("scraper_items", source=SOURCE)
+    print(f"✅ Inserted: {job['Job Title']} — {job['Company']}"
+          + (f" (duplicate of {canonical['_id']})" if canonical is not None else ""))
+
+trends.flush()
+salaries.flush()
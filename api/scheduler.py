@@ -6,6 +6,7 @@ from datetime import datetime
 # Paths to your scripts
 SCRIPT_1 = "d:/cycle_ing/2eme anne bdia/S4/web scrapping/final/api/LinkedinApiScraping.py"
 SCRIPT_2 = "d:/cycle_ing/2eme anne bdia/S4/web scrapping/final/api/IndeedApiScraping.py"
+REPO_ROOT = "d:/cycle_ing/2eme anne bdia/S4/web scrapping/final"   # contains the skill_radar package
 
 def run_script(script_path):
     print(f"[{datetime.now()}] ▶️ Running: {script_path}")
@@ -15,9 +16,19 @@ def run_script(script_path):
     except subprocess.CalledProcessError as e:
         print(f"[{datetime.now()}] ❌ Error running {script_path}:\n{e}")
 
+def run_module(module, *args):
+    print(f"[{datetime.now()}] ▶️ Running: {module}")
+    try:
+        subprocess.run(["E:/anaconda/python.exe", "-m", module, *args], check=True, cwd=REPO_ROOT)
+        print(f"[{datetime.now()}] ✅ Finished: {module}")
+    except subprocess.CalledProcessError as e:
+        print(f"[{datetime.now()}] ❌ Error running {module}:\n{e}")
+
 def job():
     run_script(SCRIPT_1)
     run_script(SCRIPT_2)
+    # Add the new postings to the co-occurrence / ANN recommender engine
+    run_module("skill_radar.cooccurrence_recommender", "update")
 
 # Schedule the job once a day at a specific time (24h format)
 schedule.every().day.at("18:45").do(job)
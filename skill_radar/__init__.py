@@ -0,0 +1,6 @@
+"""
+Shared building blocks for Skill Radar (training pipelines, model helpers).
+
+Run the command-line tools from the repository root, e.g.
+``python -m skill_radar.forecast_training``.
+"""
@@ -0,0 +1,104 @@
+"""
+Concurrent fan-out of Apify actor runs, merged into one de-duplicated stream.
+
+Instead of one blocking run with every position packed in a single string,
+the scrapers start one run per (position, country) with the async Apify
+client. At most ``max_in_flight`` runs are active at once; the dataset of each
+run is streamed as soon as that run finishes, and items already seen (same
+URL, e.g. a posting returned for "Data scientist" and "ML engineer") are
+dropped. Total wall time stays close to the slowest run instead of the sum
+of the runs.
+
+The scrapers keep their synchronous per-item loop: ``stream_items`` runs the
+event loop in a background thread and hands the items over through a bounded
+queue (the fan-out waits when the NER / MongoDB side falls behind).
+
+    runs = fan_out_inputs(RUN_INPUT, "position", POSITIONS, "country", COUNTRIES)
+    for item in stream_items(client, ACTOR_ID, runs, key=lambda item: item.get("url"), source="indeed"):
+        ...
+"""
+import asyncio
+import queue
+import threading
+
+from skill_radar import metrics
+
+# -------------------- CONFIGURATION --------------------
+MAX_IN_FLIGHT = 5
+BUFFER_SIZE = 1_000   # items waiting for the scraper loop
+_DONE = object()
+
+
+def fan_out_inputs(base_input, position_key, positions, country_key, countries):
+    """One (label, run_input) per (position, country) pair, the other fields copied from ``base_input``."""
+    return [(f"{position} / {country}", {**base_input, position_key: position, country_key: country})
+            for position in positions for country in countries]
+
+
+async def iterate_runs(client, actor_id, runs, key, max_in_flight=MAX_IN_FLIGHT, source=""):
+    """
+    Async generator over the items of every run, in completion order.
+    A failing run is reported and skipped; the other runs go on.
+    """
+    semaphore = asyncio.Semaphore(max_in_flight)
+    merged = asyncio.Queue(maxsize=BUFFER_SIZE)
+    seen = set()
+
+    async def run_one(label, run_input):
+        async with semaphore:
+            try:
+                with metrics.timer("scraper_apify_run", source=source):
+                    run = await client.actor(actor_id).call(run_input=run_input)
+                if run is None:
+                    raise RuntimeError("the actor run did not finish")
+                count = 0
+                async for item in client.dataset(run["defaultDatasetId"]).iterate_items():
+                    await merged.put(item)
+                    count += 1
+                print(f"✅ Run {label}: {count} items")
+            except Exception as e:
+                metrics.incr("scraper_apify_failed_runs", source=source)
+                print(f"❌ Run {label} failed: {e}")
+
+    async def run_all():
+        await asyncio.gather(*(run_one(label, run_input) for label, run_input in runs))
+        await merged.put(_DONE)
+
+    producer = asyncio.create_task(run_all())
+    try:
+        while (item := await merged.get()) is not _DONE:
+            k = key(item)
+            if k is not None and k in seen:
+                metrics.incr("scraper_duplicates", source=source)
+                continue
+            seen.add(k)
+            yield item
+    finally:
+        producer.cancel()
+
+
+def stream_items(client, actor_id, runs, key, max_in_flight=MAX_IN_FLIGHT, source=""):
+    """Synchronous view of ``iterate_runs`` (event loop in a background thread)."""
+    handoff = queue.Queue(maxsize=BUFFER_SIZE)
+
+    async def pump():
+        async for item in iterate_runs(client, actor_id, runs, key, max_in_flight, source):
+            while True:   # never block the event loop: the other runs keep streaming
+                try:
+                    handoff.put_nowait(item)
+                    break
+                except queue.Full:
+                    await asyncio.sleep(0.05)
+
+    def worker():
+        try:
+            asyncio.run(pump())
+        except BaseException as e:
+            handoff.put(e)
+        handoff.put(_DONE)
+
+    threading.Thread(target=worker, name="apify-fanout", daemon=True).start()
+    while (item := handoff.get()) is not _DONE:
+        if isinstance(item, BaseException):
+            raise item
+        yield item
@@ -0,0 +1,326 @@
+"""
+Local stand-in for the Apify actors used by the scrapers.
+
+``FakeApifyClient`` has the client surface the scrapers use
+(``client.actor(id).call(run_input=...)`` and
+``client.dataset(id).iterate_items()``, plus ``FakeApifyClientAsync`` for
+``ApifyClientAsync``) and replays either a recording (JSON
+lines, one dataset item per line) or synthetic Indeed / LinkedIn items. The
+stream is served page by page at a configurable rate, with optional slow pages
+and transient failures (retried like the real client, then raised), so an
+ingestion run of any size can be reproduced and timed offline.
+
+The scrapers pick their client with ``client_from_env``:
+
+    SKILL_RADAR_APIFY=live | fake | record     (default: live)
+    SKILL_RADAR_APIFY_REPLAY=recording.jsonl   replayed by ``fake`` (synthetic items otherwise)
+    SKILL_RADAR_APIFY_ITEMS=100000             items per run (default: maxItems / rows of the run input)
+    SKILL_RADAR_APIFY_RATE=2000                items / second (0 = as fast as possible)
+    SKILL_RADAR_APIFY_PAGE_SIZE=1000
+    SKILL_RADAR_APIFY_SLOW_PAGES=0.05          share of pages delayed by SKILL_RADAR_APIFY_SLOW_SECONDS (default 2)
+    SKILL_RADAR_APIFY_FAILURE_RATE=0.01        share of page requests failing
+    SKILL_RADAR_APIFY_RUN_SECONDS=30           mean duration of an actor run (0 = instant)
+    SKILL_RADAR_APIFY_SEED=42
+
+``record`` wraps the live client and saves every item it streams to
+``recordings/<source>-<date>.jsonl`` (or ``SKILL_RADAR_APIFY_RECORDING``).
+
+    SKILL_RADAR_APIFY=fake SKILL_RADAR_APIFY_ITEMS=100000 SKILL_RADAR_METRICS=jsonl python api/IndeedApiScraping.py
+    python -m skill_radar.apify_replay generate --source linkedin --items 5000 --output linkedin.jsonl
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from skill_radar.config import REPO_ROOT
+from skill_radar.synthetic import COMPANIES, FILLER, LOCATIONS, SKILLS, TITLES
+
+# -------------------- CONFIGURATION --------------------
+RECORDINGS_DIR = REPO_ROOT / "recordings"
+PAGE_SIZE = 1000
+MAX_RETRIES = 3        # page retries before a failure reaches the scraper
+RETRY_DELAY = 0.5      # seconds, doubled at each retry
+SLOW_SECONDS = 2.0
+DEFAULT_ITEMS = 100
+SHARED_ITEMS = 0.1     # share of items (synthetic or replayed) duplicated across runs
+SEED = 42
+
+
+class FakeApifyError(Exception):
+    """A dataset page still failing after ``MAX_RETRIES`` retries."""
+
+
+# -------------------- SYNTHETIC ITEMS --------------------
+def _synthetic_fields(rng, i, run=0):
+    words = [rng.choice(SKILLS) if rng.random() < 0.08 else rng.choice(FILLER) for _ in range(rng.randint(80, 400))]
+    low = rng.choice([25, 40, 60, 80_000, 100_000, 130_000])
+    salary = rng.choice([f"${low:,} - ${low * 1.2:,.0f} a year" if low > 1000 else f"${low} - ${low + 15} an hour", ""])
+    posted = datetime(2025, 1, 1) + timedelta(days=rng.randint(0, 300))
+    return {
+        "title": rng.choice(TITLES),
+        "description": " ".join(words),
+        "location": rng.choice([loc for loc in LOCATIONS if loc]),
+        "company": rng.choice(COMPANIES),
+        "salary": salary,
+        "posted": posted,
+        # a share of the items is also returned by the other runs (same posting, same URL)
+        "url_id": f"{i:08d}" if run == 0 or rng.random() < SHARED_ITEMS else f"{run}-{i:08d}",
+    }
+
+
+def synthetic_item(source, rng, i, run=0):
+    """One dataset item shaped like the output of the Indeed or LinkedIn actor (``run``: index of the actor run)."""
+    f = _synthetic_fields(rng, i, run)
+    if source == "indeed":
+        return {
+            "positionName": f["title"], "description": f["description"], "location": f["location"],
+            "company": f["company"], "salary": f["salary"], "postingDateParsed": f["posted"].isoformat(),
+            "url": f"https://www.indeed.com/viewjob?jk=fake{f['url_id']}",
+        }
+    if source == "linkedin":
+        return {
+            "title": f["title"], "description": f["description"], "location": f["location"],
+            "companyName": f["company"], "salary": f["salary"], "publishedAt": f["posted"].strftime("%Y-%m-%d"),
+            "jobUrl": f"https://www.linkedin.com/jobs/view/fake{f['url_id']}",
+        }
+    raise ValueError(f"Unknown source: {source!r} (indeed, linkedin)")
+
+
+def read_recording(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replayed_items(recording, n_items, run=0, rng=None):
+    """
+    ``n_items`` items cycling over a recording; repeated items get a distinct URL so they stay distinct postings.
+    Every run (``run``: index of the actor run) replays the same recording, so outside a ``SHARED_ITEMS`` share
+    the items of the later runs are also suffixed with the run: the fan-out's URL dedup keeps them.
+    """
+    rng = rng or random.Random(run)
+    for i, item in zip(range(n_items), itertools.cycle(recording)):
+        lap = i // len(recording)
+        shared = run == 0 or rng.random() < SHARED_ITEMS
+        tag = (f"replay{lap}" if lap else "") if shared else f"run{run}-replay{lap}"
+        if tag:
+            item = {**item, **{k: f"{v}#{tag}" for k, v in item.items() if k in ("url", "jobUrl") and v}}
+        yield item
+
+
+# -------------------- FAKE CLIENT --------------------
+class FakeDataset:
+    def __init__(self, run):
+        self.run = run
+
+    def pages(self, offset=0, limit=None):
+        """(page, seconds to wait before serving it) with the configured rate, slow pages and failures."""
+        backend = self.run["backend"]
+        items = itertools.islice(self.run["items"](), offset, None if limit is None else offset + limit)
+        rng = random.Random(f"{self.run['seed']}-pages")
+        while True:
+            page = list(itertools.islice(items, backend.page_size))
+            if not page:
+                return
+            yield page, backend.page_delay(len(page), rng)
+
+    def iterate_items(self, offset=0, limit=None):
+        for page, delay in self.pages(offset, limit):
+            time.sleep(delay)
+            yield from page
+
+
+class FakeActor:
+    def __init__(self, backend, actor_id):
+        self.backend = backend
+        self.actor_id = actor_id
+
+    def call(self, run_input=None, **kwargs):
+        """Waits for the simulated run; its dataset is generated lazily while being iterated."""
+        run = self.backend.start_run(self.actor_id, run_input or {})
+        time.sleep(run["runSeconds"])
+        return run
+
+
+class FakeDatasetAsync(FakeDataset):
+    async def iterate_items(self, offset=0, limit=None):
+        for page, delay in self.pages(offset, limit):
+            await asyncio.sleep(delay)
+            for item in page:
+                yield item
+
+
+class FakeActorAsync(FakeActor):
+    async def call(self, run_input=None, **kwargs):
+        run = self.backend.start_run(self.actor_id, run_input or {})
+        await asyncio.sleep(run["runSeconds"])
+        return run
+
+
+class FakeApifyClient:
+    """Drop-in replacement of ``ApifyClient`` for the scrapers."""
+
+    def __init__(self, source, recording=None, items=None, rate=0.0, page_size=PAGE_SIZE,
+                 slow_pages=0.0, slow_seconds=SLOW_SECONDS, failure_rate=0.0, run_seconds=0.0, seed=SEED):
+        self.source = source
+        self.recording = read_recording(recording) if recording else None
+        if self.recording == []:
+            raise ValueError(f"Empty recording: {recording}")
+        self.n_items = items
+        self.rate = rate
+        self.page_size = page_size
+        self.slow_pages = slow_pages
+        self.slow_seconds = slow_seconds
+        self.failure_rate = failure_rate
+        self.run_seconds = run_seconds
+        self.seed = seed
+        self.runs = {}
+
+    def actor(self, actor_id):
+        return FakeActor(self, actor_id)
+
+    def dataset(self, dataset_id):
+        return FakeDataset(self.runs[dataset_id])
+
+    def start_run(self, actor_id, run_input):
+        n_items = self.n_items or run_input.get("maxItems") or run_input.get("rows") or DEFAULT_ITEMS
+        dataset_id = uuid.uuid4().hex[:17]
+        run_index = len(self.runs)
+        run_seed = f"{self.seed}-{run_index}"
+
+        def items():
+            if self.recording:
+                return replayed_items(self.recording, n_items, run_index, random.Random(run_seed))
+            rng = random.Random(run_seed)
+            return (synthetic_item(self.source, rng, i, run_index) for i in range(n_items))
+
+        self.runs[dataset_id] = {"id": dataset_id, "backend": self, "items": items, "input": run_input,
+                                 "seed": run_seed}
+        now = datetime.now().isoformat()
+        run_seconds = self.run_seconds * (0.5 + random.Random(run_seed).random())   # runs differ in length
+        return {"id": dataset_id, "actId": actor_id, "status": "SUCCEEDED", "startedAt": now, "finishedAt": now,
+                "defaultDatasetId": dataset_id, "itemCount": n_items, "runSeconds": run_seconds}
+
+    def page_delay(self, n_items, rng):
+        """Time spent fetching one page: transfer at ``rate``, optional slow page, retried failures."""
+        delay = n_items / self.rate if self.rate else 0.0
+        if rng.random() < self.slow_pages:
+            delay += self.slow_seconds
+        for attempt in range(MAX_RETRIES + 1):
+            if rng.random() >= self.failure_rate:
+                return delay
+            if attempt == MAX_RETRIES:
+                raise FakeApifyError(f"dataset page failed {MAX_RETRIES + 1} times")
+            delay += RETRY_DELAY * 2 ** attempt
+
+
+class FakeApifyClientAsync(FakeApifyClient):
+    """Drop-in replacement of ``ApifyClientAsync``."""
+
+    def actor(self, actor_id):
+        return FakeActorAsync(self, actor_id)
+
+    def dataset(self, dataset_id):
+        return FakeDatasetAsync(self.runs[dataset_id])
+
+
+# -------------------- RECORDING --------------------
+class _RecordingDataset:
+    def __init__(self, dataset, path):
+        self.dataset = dataset
+        self.path = path
+
+    def iterate_items(self, *args, **kwargs):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for item in self.dataset.iterate_items(*args, **kwargs):
+                f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+                yield item
+
+
+class _RecordingDatasetAsync(_RecordingDataset):
+    async def iterate_items(self, *args, **kwargs):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            async for item in self.dataset.iterate_items(*args, **kwargs):
+                f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+                yield item
+
+
+class RecordingClient:
+    """Wraps a live ``ApifyClient`` (or ``ApifyClientAsync``) and appends every streamed item to a JSON lines file."""
+
+    def __init__(self, client, path, asynchronous=False):
+        self.client = client
+        self.path = Path(path)
+        self.dataset_class = _RecordingDatasetAsync if asynchronous else _RecordingDataset
+
+    def actor(self, actor_id):
+        return self.client.actor(actor_id)
+
+    def dataset(self, dataset_id):
+        return self.dataset_class(self.client.dataset(dataset_id), self.path)
+
+
+# -------------------- SWITCH --------------------
+def _env(name, cast, default):
+    value = os.getenv(f"SKILL_RADAR_APIFY_{name}")
+    return cast(value) if value not in (None, "") else default
+
+
+def client_from_env(token, source, asynchronous=False):
+    """Live, fake or recording client (async with ``asynchronous``) according to ``SKILL_RADAR_APIFY``."""
+    mode = os.getenv("SKILL_RADAR_APIFY", "live").lower()
+    if mode == "fake":
+        fake_class = FakeApifyClientAsync if asynchronous else FakeApifyClient
+        client = fake_class(
+            source,
+            recording=_env("REPLAY", str, None),
+            items=_env("ITEMS", int, None),
+            rate=_env("RATE", float, 0.0),
+            page_size=_env("PAGE_SIZE", int, PAGE_SIZE),
+            slow_pages=_env("SLOW_PAGES", float, 0.0),
+            slow_seconds=_env("SLOW_SECONDS", float, SLOW_SECONDS),
+            failure_rate=_env("FAILURE_RATE", float, 0.0),
+            run_seconds=_env("RUN_SECONDS", float, 0.0),
+            seed=_env("SEED", int, SEED),
+        )
+        print(f"🧪 Fake Apify backend: {_env('REPLAY', str, None) or f'synthetic {source} items'}")
+        return client
+    if mode not in ("live", "record"):
+        raise ValueError(f"SKILL_RADAR_APIFY must be live, fake or record (got {mode!r})")
+
+    from apify_client import ApifyClient, ApifyClientAsync
+    client = ApifyClientAsync(token) if asynchronous else ApifyClient(token)
+    if mode == "record":
+        path = _env("RECORDING", str, RECORDINGS_DIR / f"{source}-{datetime.now():%Y%m%d-%H%M%S}.jsonl")
+        print(f"🎙️ Recording Apify items to {path}")
+        return RecordingClient(client, path, asynchronous)
+    return client
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic Apify items as a JSON lines recording.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    generate = sub.add_parser("generate", help="Synthetic Indeed / LinkedIn items")
+    generate.add_argument("--source", choices=["indeed", "linkedin"], required=True)
+    generate.add_argument("--items", type=int, default=1000)
+    generate.add_argument("--seed", type=int, default=SEED)
+    generate.add_argument("--output", required=True)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for i in range(args.items):
+            f.write(json.dumps(synthetic_item(args.source, rng, i), ensure_ascii=False) + "\n")
+    print(f"✅ {args.items} {args.source} items written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
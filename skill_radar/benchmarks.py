@@ -0,0 +1,428 @@
+"""
+Offline micro-benchmarks of the project's hot functions.
+
+Every case runs on fixed synthetic corpora (seeded, no dataset, no network):
+
+    salary      normalize_salary of both scrapers + the vectorized ETL version
+    skills      clean_skills (scrapers, SkillEtraction.py), extract_skills /
+                extract_skills_full_text with the real tokenizer and a stub NER model
+    dashboard   the dashboard.py loaders against mongomock, normalize_title,
+                the skill co-occurrence network (matrix build, filtered graph)
+    predict     NumPy recommender, co-occurrence recommender, salary features
+
+Functions of the scripts (scrapers, SkillEtraction.py, dashboard.py) are taken
+from their source with ``ast``, without running the scripts (no model download,
+no Apify call, no Streamlit). Cases whose optional dependency is missing
+(``mongomock``, a cached ``transformers`` tokenizer) are skipped; any other
+failure, e.g. a script function that was renamed or moved, is an error and
+makes ``run`` exit with status 1.
+
+Each case is timed ``timeit``-style (calls per round calibrated to ~0.2 s, best /
+median of the rounds) and a run is saved as JSON in ``benchmarks/``, named after
+the commit, so two commits can be compared locally:
+
+    python -m skill_radar.benchmarks run                      # every case → benchmarks/<date>_<commit>.json
+    python -m skill_radar.benchmarks run --filter salary --rounds 3
+    python -m skill_radar.benchmarks compare benchmarks/A.json benchmarks/B.json --threshold 0.1
+"""
+import argparse
+import ast
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from skill_radar import metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, MONGO_URI, REPO_ROOT
+from skill_radar.synthetic import COMPANIES, FILLER, LOCATIONS, SKILLS, TITLES
+
+# -------------------- CONFIGURATION --------------------
+BENCHMARK_DIR = REPO_ROOT / "benchmarks"
+INDEED_SCRAPER = REPO_ROOT / "api" / "IndeedApiScraping.py"
+LINKEDIN_SCRAPER = REPO_ROOT / "api" / "LinkedinApiScraping.py"
+SKILL_EXTRACTION = REPO_ROOT / "DataCleaning&Preprocessing" / "SkillEtraction.py"
+DASHBOARD = REPO_ROOT / "Dash&models" / "dashboard.py"
+NER_MODEL = "jjzha/jobbert_knowledge_extraction"
+SEED = 42
+ROUNDS = 5
+MIN_ROUND_SECONDS = 0.2
+
+
+class Skip(Exception):
+    """A case cannot run here (missing optional dependency)."""
+
+
+# -------------------- SYNTHETIC CORPORA --------------------
+SALARIES = ["${:,} - ${:,} a year", "${:,} a year", "${} - ${} an hour", "${} an hour", "From ${:,} a month",
+            "Up to ${:,} a year", "${:,}–${:,} per year", "${} - ${} per day", "{:,}", ""]
+
+
+def corpus(seed=SEED, n_postings=5_000, n_salaries=2_000, n_descriptions=200):
+    """Deterministic synthetic data shared by every case."""
+    rng = random.Random(seed)
+
+    def salary():
+        template = rng.choice(SALARIES)
+        low = rng.choice([20, 35, 50, 80, 4_000, 60_000, 95_000, 120_000])
+        return template.format(low, low + rng.choice([5, 10, 20_000]))
+
+    def skills(k):
+        return rng.sample(SKILLS, k)
+
+    def description():
+        words = []
+        for _ in range(rng.randint(150, 450)):
+            words.append(rng.choice(SKILLS) if rng.random() < 0.08 else rng.choice(FILLER))
+        return " ".join(words)
+
+    postings = [{
+        "Job Title": rng.choice(TITLES),
+        "Company": rng.choice(COMPANIES),
+        "Location": rng.choice(LOCATIONS),
+        "Date": f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.choice([2023, 2024, 2025])}",
+        "Skills": ", ".join(skills(rng.randint(2, 10))) if rng.random() < 0.9 else None,
+    } for _ in range(n_postings)]
+    raw_skills = [[rng.choice(["##i", ".", "’s", "• ", "(", ""]) + s + rng.choice(["", " ", ")", " / sql"])
+                   for s in skills(rng.randint(3, 12))] for _ in range(n_salaries // 4)]
+    return SimpleNamespace(
+        salaries=[salary() for _ in range(n_salaries)],
+        raw_skills=raw_skills,
+        descriptions=[description() for _ in range(n_descriptions)],
+        titles=[rng.choice(TITLES) + rng.choice(["", " II", " - Remote", " (Senior)"]) for _ in range(n_salaries)],
+        postings=postings,
+        profiles=[(p["Job Title"], p["Skills"] or "") for p in postings[:1024]],
+        skill_lists=[skills(rng.randint(1, 6)) for _ in range(256)],
+    )
+
+
+# -------------------- SCRIPT FUNCTIONS --------------------
+def script_functions(path, names, namespace):
+    """
+    Compile the functions ``names`` of a script (nested ones included, decorators
+    such as ``@st.cache_data`` removed) in ``namespace`` without running the script.
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+    found = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name in names and node.name not in found:
+            node.decorator_list = []
+            found[node.name] = node
+    missing = set(names) - set(found)
+    if missing:   # the script changed: an error, not a missing optional dependency
+        raise LookupError(f"{Path(path).name}: functions not found {sorted(missing)}")
+    module = ast.Module(body=[found[name] for name in names], type_ignores=[])
+    exec(compile(module, str(path), "exec"), namespace)
+    return [namespace[name] for name in names]
+
+
+def load_tokenizer():
+    """The real NER tokenizer, from the local Hugging Face cache only."""
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(NER_MODEL, local_files_only=True)
+    except Exception as e:
+        raise Skip(f"tokenizer {NER_MODEL} not available offline ({e.__class__.__name__})")
+
+
+class StubNER:
+    """Stand-in for the token-classification pipeline: tags the known skills of the text as B / I spans."""
+
+    def __init__(self, skills=SKILLS):
+        self.first_words = {s.split()[0]: s.split()[1:] for s in skills}
+
+    def __call__(self, text):
+        results, words = [], text.lower().split()
+        for i, word in enumerate(words):
+            if word in self.first_words:
+                results.append({"entity_group": "B", "word": word})
+                rest = self.first_words[word]
+                if rest and words[i + 1:i + 1 + len(rest)] == rest:
+                    results.extend({"entity_group": "I", "word": w} for w in rest)
+        return results
+
+
+def mongomock_client(postings):
+    try:
+        import mongomock
+    except ImportError:
+        raise Skip("mongomock is not installed")
+    client = mongomock.MongoClient()
+    client[DB_NAME][COLLECTION_NAME].insert_many([dict(p) for p in postings])
+    return client
+
+
+# -------------------- CASES --------------------
+CASES = {}
+
+
+def case(name):
+    """Register ``setup(data) -> callable``; the returned callable is what gets timed."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _scraper_namespace(source):
+    import re
+    return {"re": re, "pd": pd, "metrics": metrics, "SOURCE": source}
+
+
+@case("salary.indeed_scraper")
+def salary_indeed_scraper(data):
+    normalize_salary, = script_functions(INDEED_SCRAPER, ["normalize_salary"], _scraper_namespace("indeed"))
+    return lambda: [normalize_salary(s) for s in data.salaries]
+
+
+@case("salary.linkedin_scraper")
+def salary_linkedin_scraper(data):
+    normalize_salary, = script_functions(LINKEDIN_SCRAPER, ["normalize_salary"], _scraper_namespace("linkedin"))
+    return lambda: [normalize_salary(s) for s in data.salaries]
+
+
+@case("salary.etl_vectorized")
+def salary_etl_vectorized(data):
+    from skill_radar.etl.normalize import normalize_salary
+    return lambda: normalize_salary(data.salaries)
+
+
+@case("skills.clean_indeed")
+def skills_clean_indeed(data):
+    clean_skills, = script_functions(INDEED_SCRAPER, ["clean_skills"], _scraper_namespace("indeed"))
+    return lambda: [clean_skills(s) for s in data.raw_skills]
+
+
+@case("skills.clean_linkedin")
+def skills_clean_linkedin(data):
+    clean_skills, = script_functions(LINKEDIN_SCRAPER, ["clean_skills"], _scraper_namespace("linkedin"))
+    return lambda: [clean_skills(s) for s in data.raw_skills]
+
+
+@case("skills.clean_extraction")
+def skills_clean_extraction(data):
+    clean_skills, = script_functions(SKILL_EXTRACTION, ["clean_skills"], _scraper_namespace("extraction"))
+    return lambda: [clean_skills(s) for s in data.raw_skills]
+
+
+def _extract_case(path, function, source):
+    def setup(data):
+        namespace = {**_scraper_namespace(source), "tokenizer": load_tokenizer(), "skill_ner": StubNER()}
+        _, extract = script_functions(path, ["clean_skills", function], namespace)
+        return lambda: [extract(d) for d in data.descriptions]
+    return setup
+
+
+case("skills.extract_indeed")(_extract_case(INDEED_SCRAPER, "extract_skills", "indeed"))
+case("skills.extract_linkedin")(_extract_case(LINKEDIN_SCRAPER, "extract_skills", "linkedin"))
+case("skills.extract_full_text")(_extract_case(SKILL_EXTRACTION, "extract_skills_full_text", "extraction"))
+
+DASHBOARD_LOADERS = ["get_job_count_by_country", "get_top_companies", "get_job_count_by_month",
+                     "get_top_job_titles", "get_top_skills", "get_job_title_skills"]
+
+
+def _dashboard_namespace(data):
+    from skill_radar.countries import UNKNOWN, resolve_countries
+    from skill_radar.dedup import DISTINCT
+    from skill_radar.titles import normalize_title
+    client = mongomock_client(data.postings)
+    namespace = {"pd": pd, "Counter": Counter, "MongoClient": lambda *a, **k: client,
+                 "MONGO_URI": MONGO_URI, "DB_NAME": DB_NAME, "COLLECTION_NAME": COLLECTION_NAME,
+                 "DISTINCT": DISTINCT, "UNKNOWN": UNKNOWN, "resolve_countries": resolve_countries,
+                 "normalize_title": normalize_title}
+    script_functions(DASHBOARD, DASHBOARD_LOADERS, namespace)
+    return namespace
+
+
+def _loader_case(loader):
+    def setup(data):
+        return _dashboard_namespace(data)[loader]
+    return setup
+
+
+for _loader in DASHBOARD_LOADERS:
+    case(f"dashboard.{_loader}")(_loader_case(_loader))
+
+
+@case("dashboard.normalize_title")
+def dashboard_normalize_title(data):
+    from skill_radar.titles import normalize_title
+    return lambda: [normalize_title(t) for t in data.titles]
+
+
+@case("dashboard.skill_network_build")
+def dashboard_skill_network_build(data):
+    from skill_radar.skill_network import SkillNetwork
+    from skill_radar.titles import normalize_title
+    return lambda: SkillNetwork.from_postings(data.postings, normalize_title)
+
+
+@case("dashboard.skill_network_graph")
+def dashboard_skill_network_graph(data):
+    from skill_radar.skill_network import SkillNetwork
+    from skill_radar.titles import normalize_title
+    network = SkillNetwork.from_postings(data.postings, normalize_title)
+    title = network.title_counts().index[0]
+    return lambda: network.graph(title, "2023-06", "2024-06")
+
+
+@case("predict.numpy_recommender")
+def predict_numpy_recommender(data):
+    from skill_radar.numpy_recommender import NumpyRecommender
+    rng = np.random.default_rng(SEED)
+    sizes = [len(SKILLS), 256, 128, len(SKILLS)]
+    arrays = {}
+    for i, (n_in, n_out) in enumerate(zip(sizes, sizes[1:])):
+        arrays[f"W{i}"] = rng.normal(0, 0.1, (n_in, n_out)).astype(np.float32)
+        arrays[f"b{i}"] = np.zeros(n_out, dtype=np.float32)
+    path = Path(tempfile.mkdtemp()) / "weights.npz"
+    np.savez(path, activations=np.array(["relu", "relu", "sigmoid"]), classes=np.array(SKILLS), **arrays)
+    reco = NumpyRecommender(path)
+    return lambda: reco.recommend_batch(data.skill_lists, [5] * len(data.skill_lists))
+
+
+@case("predict.cooccurrence_recommender")
+def predict_cooccurrence_recommender(data):
+    from skill_radar.cooccurrence_recommender import CooccurrenceRecommender
+    engine = CooccurrenceRecommender()
+    engine.add_postings([p["Skills"] for p in data.postings if p["Skills"]])
+    return lambda: [engine.recommend(skills, top_k=5) for skills in data.skill_lists]
+
+
+@case("predict.salary_features")
+def predict_salary_features(data):
+    from skill_radar.salary_features import SalaryFeaturizer
+    names = [f"jobtitle_{t}" for t in TITLES] + [f"skill_{s}" for s in SKILLS]
+    rng = np.random.default_rng(SEED)
+    scaler = SimpleNamespace(feature_names_in_=np.array(names), mean_=rng.random(len(names)),
+                             scale_=rng.random(len(names)) + 0.5)
+    featurizer = SalaryFeaturizer(scaler)
+    return lambda: featurizer.scaled(featurizer.transform(data.profiles))
+
+
+# -------------------- RUNNER --------------------
+def measure(fn, rounds=ROUNDS, min_seconds=MIN_ROUND_SECONDS):
+    """Per-call seconds over ``rounds`` rounds (calls per round calibrated like ``timeit.autorange``)."""
+    fn()   # warm-up (caches, lazy imports)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_seconds / elapsed) + 1)
+    timings = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return {"min": min(timings), "median": statistics.median(timings), "mean": statistics.fmean(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0, "rounds": rounds, "number": number}
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def run(names=None, rounds=ROUNDS, output=None, seed=SEED):
+    """Run the selected cases and save the results as JSON; returns the results dict."""
+    data = corpus(seed)
+    commit, dirty = git_commit()
+    results = {"commit": commit, "dirty": dirty, "created": datetime.now().isoformat(timespec="seconds"),
+               "python": platform.python_version(), "machine": platform.platform(), "seed": seed,
+               "benchmarks": {}, "skipped": {}, "errors": {}}
+    for name in names or CASES:
+        try:
+            fn = CASES[name](data)
+            stats = measure(fn, rounds)
+        except Skip as e:
+            results["skipped"][name] = str(e)
+            print(f"⚠️ {name}: skipped ({e})")
+            continue
+        except Exception as e:
+            results["errors"][name] = f"{type(e).__name__}: {e}"
+            print(f"❌ {name}: {type(e).__name__}: {e}")
+            continue
+        results["benchmarks"][name] = stats
+        print(f"✅ {name:45s}{stats['median'] * 1000:12.3f} ms  (min {stats['min'] * 1000:.3f}, x{stats['number']})")
+
+    if output is None:
+        BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = BENCHMARK_DIR / f"{stamp}_{commit or 'nogit'}{'-dirty' if dirty else ''}.json"
+    Path(output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"📊 {len(results['benchmarks'])} benchmarks saved to {output}")
+    return results
+
+
+def compare(old_path, new_path, threshold=0.1, stat="median"):
+    """Print new/old ratios; returns the names that got slower by more than ``threshold``."""
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{'benchmark':45s}{old.get('commit') or 'old':>12s}{new.get('commit') or 'new':>12s}{'ratio':>9s}")
+    regressions = []
+    for name in sorted(set(old["benchmarks"]) & set(new["benchmarks"])):
+        before, after = old["benchmarks"][name][stat], new["benchmarks"][name][stat]
+        ratio = after / before if before else float("inf")
+        flag = "❌" if ratio > 1 + threshold else "🚀" if ratio < 1 - threshold else ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+        print(f"{name:45s}{before * 1000:10.3f}ms{after * 1000:10.3f}ms{ratio:8.2f}x {flag}")
+    for name in sorted(set(old["benchmarks"]) ^ set(new["benchmarks"])):
+        print(f"{name:45s}  only in {'the old' if name in old['benchmarks'] else 'the new'} run")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks of the Skill Radar hot functions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Run the benchmarks and save them as JSON")
+    run_parser.add_argument("--filter", nargs="+", help="Only the cases whose name contains one of these strings")
+    run_parser.add_argument("--rounds", type=int, default=ROUNDS)
+    run_parser.add_argument("--seed", type=int, default=SEED)
+    run_parser.add_argument("--output", help=f"Default: {BENCHMARK_DIR}/<date>_<commit>.json")
+    compare_parser = sub.add_parser("compare", help="Compare two saved runs")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown reported as a regression")
+    compare_parser.add_argument("--stat", choices=["min", "median", "mean"], default="median")
+    sub.add_parser("list", help="List the cases")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(CASES))
+    elif args.command == "run":
+        names = [n for n in CASES if not args.filter or any(f in n for f in args.filter)]
+        results = run(names, args.rounds, args.output, args.seed)
+        if results["errors"]:
+            print(f"❌ {len(results['errors'])} cases failed: {', '.join(results['errors'])}")
+            sys.exit(1)
+    else:
+        regressions = compare(args.old, args.new, args.threshold, args.stat)
+        if regressions:
+            print(f"❌ {len(regressions)} regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Settings shared by the Skill Radar scripts (override them with environment variables)."""
+import os
+from pathlib import Path
+
+# -------------------- MONGODB --------------------
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+DB_NAME = os.getenv("MONGO_DB", "job_database")
+COLLECTION_NAME = os.getenv("MONGO_COLLECTION", "job_offers")
+TRENDS_COLLECTION = os.getenv("MONGO_TRENDS_COLLECTION", "skill_trends")   # skill_radar.skill_trends
+SALARY_SKETCH_COLLECTION = os.getenv("MONGO_SALARY_SKETCH_COLLECTION", "salary_sketches")   # skill_radar.salary_sketches
+DESCRIPTIONS_COLLECTION = os.getenv("MONGO_DESCRIPTIONS_COLLECTION", "posting_descriptions")   # skill_radar.description_store
+VERSIONS_COLLECTION = os.getenv("MONGO_VERSIONS_COLLECTION", "data_versions")   # skill_radar.data_versions
+
+# -------------------- PATHS --------------------
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR = REPO_ROOT / "Dash&models" / "build model"
+FORECAST_DIR = MODELS_DIR / "skill forcasting"
+RECOMMENDER_DIR = MODELS_DIR / "skill recomendation" / "dl model"
+SALARY_DIR = MODELS_DIR / "salary estimation"
+DATA_DIR = Path(os.getenv("SKILL_RADAR_DATA_DIR", REPO_ROOT / "DataCleaning&Preprocessing"))  # Kaggle CSVs
@@ -0,0 +1,297 @@
+"""
+Skill recommender engine based on co-occurrence statistics and approximate nearest neighbours.
+
+Two ways to score the unknown skills of a profile:
+
+- ``"pmi"``: sum of the positive PMI rows of the known skills, read from a
+  precomputed sparse skill x skill matrix (``Xᵀ X`` over the posting x skill matrix).
+- ``"ann"``: postings similar to the profile are found with random-hyperplane
+  LSH (cosine) over the sparse posting vectors, then re-ranked exactly and their
+  skills averaged — the scalable version of ``recommend_skills_knn``.
+
+Both structures are updated incrementally with ``add_postings`` as new postings
+arrive: the co-occurrence counts are updated from the batch alone, and the
+batch's rows are appended to the posting matrix only when it is next read, so
+an update costs O(batch), not O(postings).
+
+``update`` feeds the saved engine with the postings inserted since it was
+last built or updated: the engine remembers the newest ObjectId ``_id`` it
+has seen (the scrapers insert with ObjectIds, in increasing order). The
+scheduler (``api/scheduler.py``) runs it after the scrapers. Postings loaded
+by the ETL have hashed string ids: rebuild the engine after a load.
+
+    python -m skill_radar.cooccurrence_recommender build
+    python -m skill_radar.cooccurrence_recommender update    # new scraped postings only
+"""
+import argparse
+import os
+import pickle
+from collections import defaultdict
+
+import numpy as np
+import scipy.sparse as sp
+from bson import ObjectId
+from pymongo import MongoClient
+
+from skill_radar.config import COLLECTION_NAME, DB_NAME, MONGO_URI, RECOMMENDER_DIR
+from skill_radar.dedup import DISTINCT
+from skill_radar.skill_featurizer import SkillFeaturizer, parse_skills
+
+# -------------------- CONFIGURATION --------------------
+ENGINE_PATH = RECOMMENDER_DIR / "cooccurrence_engine.pkl"
+N_TABLES = 8               # LSH tables
+N_BITS = 12                # Hyperplanes per table (bucket = 12-bit signature)
+MAX_CANDIDATES = 500       # Candidates re-ranked exactly per query
+PMI_TOP_K = 50             # Neighbours kept per skill in the PMI matrix
+MIN_COOCCURRENCE = 2       # Pairs seen less often are ignored
+BATCH_SIZE = 50_000
+QUERY = {**DISTINCT, "Skills": {"$nin": [None, ""]}}
+
+
+class CooccurrenceRecommender:
+    """Sparse PMI matrix + LSH index over postings, both growable batch by batch."""
+
+    def __init__(self, n_tables=N_TABLES, n_bits=N_BITS, seed=42):
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.rng = np.random.default_rng(seed)
+        self.classes_ = []
+        self.index = {}
+        self._X = sp.csr_matrix((0, 0), dtype=np.float32)     # postings x skills (see ``X``)
+        self._blocks = []                                      # batches not stacked into ``_X`` yet
+        self.counts = np.zeros(0)                              # postings per skill
+        self.C = sp.csr_matrix((0, 0), dtype=np.float32)      # skill co-occurrence counts
+        self.planes = np.zeros((0, n_tables * n_bits), dtype=np.float32)
+        self.buckets = [defaultdict(list) for _ in range(n_tables)]
+        self._pmi = None
+        self._featurizer = None
+        self._powers = (1 << np.arange(n_bits)).astype(np.int64)
+        self.last_id = None                                    # newest ObjectId added (``update_from_mongo``)
+
+    # -------------------- UPDATES --------------------
+    def _grow_vocabulary(self, skill_lists):
+        new = [s for skills in skill_lists for s in skills if s not in self.index]
+        for skill in dict.fromkeys(new):
+            self.index[skill] = len(self.classes_)
+            self.classes_.append(skill)
+        n_new = len(self.classes_) - self.planes.shape[0]
+        if n_new:
+            extra = self.rng.standard_normal((n_new, self.planes.shape[1])).astype(np.float32)
+            self.planes = np.vstack([self.planes, extra])
+            V = len(self.classes_)
+            self.C.resize((V, V))
+            self.counts = np.concatenate([self.counts, np.zeros(n_new)])
+            self._featurizer = None
+
+    def __setstate__(self, state):
+        if "X" in state:   # engines pickled before the batches were stacked lazily
+            state["_X"], state["_blocks"] = state.pop("X"), []
+        state.setdefault("last_id", None)
+        self.__dict__.update(state)
+
+    @property
+    def X(self):
+        """Posting x skill matrix; the batches added since the last read are stacked here, once."""
+        V = len(self.classes_)
+        if self._blocks or self._X.shape[1] != V:
+            blocks = [self._X, *self._blocks]
+            for block in blocks:
+                block.resize((block.shape[0], V))   # the vocabulary may have grown since
+            self._X = sp.vstack(blocks, format="csr") if self._blocks else self._X
+            self._blocks = []
+        return self._X
+
+    @property
+    def n_postings(self):
+        return self._X.shape[0] + sum(block.shape[0] for block in self._blocks)
+
+    @property
+    def featurizer(self):
+        """``SkillFeaturizer`` over the current vocabulary (rebuilt when it grows)."""
+        if getattr(self, "_featurizer", None) is None:   # engines pickled before it existed
+            self._featurizer = SkillFeaturizer(self.classes_)
+        return self._featurizer
+
+    def _encode(self, skill_lists):
+        return self.featurizer.transform(skill_lists)
+
+    def _signatures(self, X):
+        """One integer bucket key per (row, table)."""
+        proj = np.asarray(X @ self.planes) > 0
+        bits = proj.reshape(X.shape[0], self.n_tables, self.n_bits)
+        return bits @ self._powers
+
+    def add_postings(self, skill_lists):
+        """Add a batch of postings (lists of skills or comma-separated strings) to the statistics and to the index."""
+        skill_lists = [skills for skills in map(parse_skills, skill_lists) if skills]
+        if not skill_lists:
+            return 0
+        self._grow_vocabulary(skill_lists)
+        X_new = self._encode(skill_lists)
+
+        first_id = self.n_postings
+        for offset, keys in enumerate(self._signatures(X_new)):
+            for table, key in enumerate(keys):
+                self.buckets[table][int(key)].append(first_id + offset)
+
+        self._blocks.append(X_new)
+        self.counts += np.asarray(X_new.sum(axis=0)).ravel()
+        self.C = (self.C + (X_new.T @ X_new).tocsr()).tocsr()
+        self._pmi = None
+        return len(skill_lists)
+
+    # -------------------- PMI --------------------
+    @property
+    def pmi(self):
+        """Positive PMI matrix, recomputed lazily after updates and pruned to PMI_TOP_K per skill."""
+        if self._pmi is None:
+            C = self.C.tocoo()
+            keep = (C.row != C.col) & (C.data >= MIN_COOCCURRENCE)
+            rows, cols, c = C.row[keep], C.col[keep], C.data[keep]
+            n = max(self.n_postings, 1)
+            pmi = np.log(c * n / (self.counts[rows] * self.counts[cols]))
+            positive = pmi > 0
+            M = sp.csr_matrix((pmi[positive].astype(np.float32), (rows[positive], cols[positive])),
+                              shape=self.C.shape)
+            self._pmi = _prune_rows(M, PMI_TOP_K)
+        return self._pmi
+
+    # -------------------- QUERIES --------------------
+    def indices(self, skills):
+        return self.featurizer.indices(skills)
+
+    def scores_pmi(self, idx):
+        return np.asarray(self.pmi[idx].sum(axis=0)).ravel()
+
+    def neighbours(self, idx, n_neighbors=20):
+        """Approximate most similar postings (cosine) to the sparse profile ``idx``."""
+        if len(idx) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        q = sp.csr_matrix((np.ones(len(idx), dtype=np.float32), idx, [0, len(idx)]),
+                          shape=(1, len(self.classes_)))
+        keys = self._signatures(q)[0]
+        candidates = set()
+        for table, key in enumerate(keys):
+            candidates.update(self.buckets[table].get(int(key), ()))
+            if len(candidates) >= MAX_CANDIDATES:
+                break
+        if not candidates:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        cand = np.fromiter(candidates, dtype=np.int64)[:MAX_CANDIDATES]
+        X_cand = self.X[cand]
+        overlap = np.asarray(X_cand @ q.T.toarray()).ravel()
+        sims = overlap / np.sqrt(np.diff(X_cand.indptr) * len(idx))
+        order = np.argsort(-sims)[:n_neighbors]
+        return cand[order], sims[order]
+
+    def scores_ann(self, idx, n_neighbors=20):
+        ids, sims = self.neighbours(idx, n_neighbors)
+        if len(ids) == 0:
+            return np.zeros(len(self.classes_))
+        weighted = sp.diags(sims.astype(np.float32)) @ self.X[ids]
+        return np.asarray(weighted.sum(axis=0)).ravel() / sims.sum()
+
+    def recommend(self, input_skills, top_k=5, method="pmi"):
+        idx = self.indices(input_skills)
+        if len(idx) == 0:
+            return []
+        scores = self.scores_pmi(idx) if method == "pmi" else self.scores_ann(idx)
+        scores[idx] = -np.inf
+        top_k = min(top_k, len(scores) - len(idx))
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [self.classes_[i] for i in top if scores[i] > 0]
+
+    # -------------------- PERSISTENCE --------------------
+    def save(self, path=ENGINE_PATH):
+        self.pmi  # materialise before pickling
+        self.X
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)   # the Prediction Center may be reading the previous version
+
+    @staticmethod
+    def load(path=ENGINE_PATH):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+def _prune_rows(M, k):
+    """Keep the ``k`` largest values of each CSR row."""
+    M = M.tocsr()
+    rows, cols, vals = [], [], []
+    for i in range(M.shape[0]):
+        start, end = M.indptr[i], M.indptr[i + 1]
+        if end == start:
+            continue
+        data, idx = M.data[start:end], M.indices[start:end]
+        if len(data) > k:
+            keep = np.argpartition(-data, k - 1)[:k]
+            data, idx = data[keep], idx[keep]
+        rows.append(np.full(len(idx), i))
+        cols.append(idx)
+        vals.append(data)
+    if not rows:
+        return sp.csr_matrix(M.shape, dtype=np.float32)
+    return sp.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=M.shape)
+
+
+# -------------------- BUILD FROM MONGODB --------------------
+def add_from_cursor(engine, cursor, batch_size=BATCH_SIZE):
+    """Add the postings of a cursor (``_id`` + ``Skills``) batch by batch; moves ``engine.last_id`` forward."""
+    batch, total = [], 0
+    for doc in cursor:
+        batch.append(parse_skills(doc["Skills"]))
+        if isinstance(doc["_id"], ObjectId) and (engine.last_id is None or doc["_id"] > engine.last_id):
+            engine.last_id = doc["_id"]
+        if len(batch) >= batch_size:
+            total += engine.add_postings(batch)
+            batch = []
+            print(f"   {total} postings indexed")
+    return total + engine.add_postings(batch)
+
+
+def build_from_mongo(batch_size=BATCH_SIZE, path=ENGINE_PATH):
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    engine = CooccurrenceRecommender()
+    total = add_from_cursor(engine, collection.find(QUERY, {"Skills": 1}, batch_size=batch_size), batch_size)
+    engine.save(path)
+    print(f"✅ Engine built on {total} postings / {len(engine.classes_)} skills → {path}")
+    return engine
+
+
+def update_from_mongo(batch_size=BATCH_SIZE, path=ENGINE_PATH):
+    """Add the postings inserted after ``engine.last_id`` to the saved engine (built when missing)."""
+    if not os.path.exists(path):
+        return build_from_mongo(batch_size, path)
+    engine = CooccurrenceRecommender.load(path)
+    if engine.last_id is None:   # engine built before updates were tracked
+        print("⚠️ The saved engine does not know its last posting: rebuilding it")
+        return build_from_mongo(batch_size, path)
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    cursor = collection.find({**QUERY, "_id": {"$gt": engine.last_id}}, {"Skills": 1},
+                             sort=[("_id", 1)], batch_size=batch_size)
+    total = add_from_cursor(engine, cursor, batch_size)
+    if total:
+        engine.save(path)
+    print(f"✅ {total} new postings added ({engine.n_postings} postings / {len(engine.classes_)} skills) → {path}")
+    return engine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the co-occurrence / ANN skill recommender.")
+    parser.add_argument("command", choices=["build", "update"])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--output", default=str(ENGINE_PATH))
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        build_from_mongo(args.batch_size, args.output)
+    else:
+        update_from_mongo(args.batch_size, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Location → country resolution shared by the scrapers, the ETL and the dashboard.
+
+``gazetteer.json`` (next to this module) lists, per canonical country name
+(the names understood by plotly's ``locationmode="country names"``):
+
+    countries     names, aliases and ISO 3166 alpha-2 codes
+    subdivisions  states / provinces with their postal codes ("TX", "ON", "NSW"...)
+    places        metropolitan areas and major cities
+
+A location string ("Remote in Austin, TX 78701", "London, England, United
+Kingdom", "Bengaluru, Karnataka", "Greater Toronto Area") is split on commas and
+read from its last segment backwards; a segment resolves when it is a known
+name, or a subdivision code (only after a comma, so "CA" alone is Canada and
+"San Jose, CA" is the United States). Codes that are also ISO country codes
+("DE", "IL", "NL"...) are read as a subdivision only when the segments before
+them agree or are unknown: "Munich, DE" is Germany, "Dover, DE" the United States. Segments that are not a name themselves
+are scanned for known names ("Hybrid work in Pune"). Results are cached, and
+``resolve_countries`` only resolves the distinct values of a Series.
+
+    python -m skill_radar.countries            # write ``Country`` on the postings that have none
+    python -m skill_radar.countries --rebuild  # recompute it everywhere (after editing the gazetteer)
+"""
+import argparse
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pymongo import MongoClient, UpdateOne
+
+from skill_radar import data_versions, metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, MONGO_URI
+
+# -------------------- CONFIGURATION --------------------
+GAZETTEER_PATH = Path(__file__).resolve().parent / "gazetteer.json"
+UNKNOWN = "Unknown"
+COUNTRY_FIELD = "Country"
+CHUNK_SIZE = 50_000
+CACHE_SIZE = 65_536
+
+_MAX_WORDS = 4   # longest name of the gazetteer, in words
+_SEPARATORS = re.compile(r"[,;()|/•·]| - ")
+_NOISE = re.compile(r"\d+|\+")
+_WORD = re.compile(r"[^\W\d_][\w.'-]*")
+
+
+# -------------------- GAZETTEER --------------------
+def load_gazetteer(path=GAZETTEER_PATH):
+    """Flatten the gazetteer into (name → country, code → country); countries win over subdivisions and places."""
+    with open(path, encoding="utf-8") as f:
+        gazetteer = json.load(f)
+    names, codes = {}, {}
+    for country, aliases in gazetteer["countries"].items():
+        names.setdefault(country.lower(), country)
+        for alias in aliases:
+            # two-letter aliases are ISO codes: only trusted when they are the whole location
+            (codes if len(alias) == 2 else names).setdefault(alias, country)
+    subdivision_codes = {}
+    for country, subdivisions in gazetteer["subdivisions"].items():
+        for code, name in subdivisions.items():
+            names.setdefault(name, country)
+            subdivision_codes.setdefault(code.lower(), country)
+    for country, places in gazetteer["places"].items():
+        for place in places:
+            names.setdefault(place, country)
+    return names, codes, subdivision_codes
+
+
+NAMES, COUNTRY_CODES, SUBDIVISION_CODES = load_gazetteer()
+
+
+def _scan(segment):
+    """Longest known name inside a segment (its last occurrence wins)."""
+    words = _WORD.findall(segment)
+    for size in range(min(_MAX_WORDS, len(words)), 0, -1):
+        for start in range(len(words) - size, -1, -1):
+            name = " ".join(words[start:start + size])
+            if len(name) > 2 and name in NAMES:
+                return NAMES[name]
+    return None
+
+
+def _disambiguate(code, previous):
+    """
+    Country of a code that is both an ISO country code and a subdivision code:
+    the subdivision when the segments before it agree with it or resolve to
+    nothing ("Springfield, IL"), the country otherwise ("Tel Aviv, IL").
+    """
+    for segment in reversed(previous):
+        country = NAMES.get(segment) or _scan(segment)
+        if country:
+            return SUBDIVISION_CODES[code] if country == SUBDIVISION_CODES[code] else COUNTRY_CODES[code]
+    return SUBDIVISION_CODES[code]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _resolve(location):
+    segments = [s.strip(" .") for s in _SEPARATORS.split(_NOISE.sub(" ", location.lower()))]
+    segments = [" ".join(s.split()) for s in segments if s.strip(" .")]
+    if not segments:
+        return None
+    if len(segments) == 1 and segments[0] in COUNTRY_CODES:
+        return COUNTRY_CODES[segments[0]]
+    for i, segment in enumerate(reversed(segments)):
+        if segment in NAMES:
+            return NAMES[segment]
+        if i < len(segments) - 1 and segment in SUBDIVISION_CODES:   # "Austin, TX"
+            if segment in COUNTRY_CODES:   # "Munich, DE": Delaware or Germany, the earlier segments decide
+                return _disambiguate(segment, segments[:len(segments) - 1 - i])
+            return SUBDIVISION_CODES[segment]
+        if i < len(segments) - 1 and segment in COUNTRY_CODES:
+            return COUNTRY_CODES[segment]
+    for segment in reversed(segments):
+        country = _scan(segment)
+        if country:
+            return country
+    return None
+
+
+def resolve_country(location, default=UNKNOWN, missing=UNKNOWN):
+    """Canonical country of one location string (``default`` when unresolved, ``missing`` when empty)."""
+    if not isinstance(location, str) or not location.strip():
+        return missing
+    return _resolve(location.strip()) or default
+
+
+def resolve_countries(locations, default=UNKNOWN, missing=UNKNOWN):
+    """Vectorized ``resolve_country``: each distinct location of the Series is resolved once."""
+    locations = pd.Series(locations, dtype=object)
+    codes, uniques = pd.factorize(locations)   # missing values → -1 → last entry
+    resolved = np.array([resolve_country(loc, default, missing) for loc in uniques] + [missing], dtype=object)
+    return pd.Series(resolved[codes], index=locations.index, dtype=object)
+
+
+def cache_info():
+    return _resolve.cache_info()
+
+
+# -------------------- BACKFILL --------------------
+def _source_defaults():
+    """Country of the single-country Kaggle datasets, for locations such as 'Remote'."""
+    from skill_radar.etl.sources import SOURCES   # the ETL imports this module
+    return {name: source.country for name, source in SOURCES.items() if source.country}
+
+
+def backfill(rebuild=False, chunk_size=CHUNK_SIZE):
+    """Write the canonical ``Country`` (indexed) on the postings; returns the number of documents updated."""
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    collection.create_index(COUNTRY_FIELD)
+    defaults = _source_defaults()
+    query = {} if rebuild else {COUNTRY_FIELD: {"$in": [None, ""]}}
+    cursor = collection.find(query, {"Location": 1, "Source": 1, COUNTRY_FIELD: 1}, batch_size=chunk_size)
+
+    def write(batch):
+        frame = pd.DataFrame(batch, columns=["_id", "Location", "Source", COUNTRY_FIELD])
+        default = frame["Source"].map(defaults).fillna(UNKNOWN)
+        countries = resolve_countries(frame["Location"], default=None, missing=None).fillna(default)
+        changed = frame[countries.ne(frame[COUNTRY_FIELD])]
+        if changed.empty:
+            return 0
+        operations = [UpdateOne({"_id": _id}, {"$set": {COUNTRY_FIELD: country}})
+                      for _id, country in zip(changed["_id"], countries[changed.index])]
+        collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    batch, scanned, updated = [], 0, 0
+    with metrics.timer("countries_backfill"):
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= chunk_size:
+                updated += write(batch)
+                scanned += len(batch)
+                batch = []
+                print(f"   {scanned} postings scanned, {updated} updated")
+        if batch:
+            updated += write(batch)
+            scanned += len(batch)
+    if updated:
+        data_versions.bump(collection)
+    print(f"🎉 Country written on {updated} / {scanned} postings ({cache_info().currsize} distinct locations)")
+    metrics.flush()
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve the postings' locations to a canonical Country field.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute Country on every posting")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    backfill(args.rebuild, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Write counters of the collections that batch jobs rewrite in place.
+
+The dashboard's cached datasets are keyed on a cheap fingerprint of the
+postings (``skill_radar.skill_network.data_version``). Insertions change
+their count or their last ``_id``. Backfills that rewrite postings in place
+(``skill_aliases apply``, ``dedup`` re-clustering, ``countries --rebuild``,
+the ETL's upserts) change neither, so they call ``bump`` once they have
+written. The counter is part of the fingerprint:
+
+    data_versions   _id     collection name
+                    writes  number of batch rewrites
+
+    bump(collection)      # after a batch rewrite
+    writes(collection)    # 0 before the first one
+"""
+from skill_radar.config import VERSIONS_COLLECTION
+
+
+def bump(collection):
+    """Record one batch rewrite of ``collection``."""
+    collection.database[VERSIONS_COLLECTION].update_one({"_id": collection.name}, {"$inc": {"writes": 1}}, upsert=True)
+
+
+def writes(collection):
+    """Number of batch rewrites of ``collection``."""
+    doc = collection.database[VERSIONS_COLLECTION].find_one({"_id": collection.name})
+    return doc["writes"] if doc else 0
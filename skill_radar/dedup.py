@@ -0,0 +1,283 @@
+"""
+Near-duplicate detection of job postings (MinHash + LSH).
+
+The same offer is often collected several times (Indeed and LinkedIn, re-runs
+of the scrapers, Kaggle datasets overlapping the scraped ones), which inflates
+skill counts and forecasts. Each posting gets a MinHash signature of the word
+shingles of its description (title / company / location / date when there is
+no description) and its LSH band keys, stored on the document itself:
+
+    MinHash      128 x uint32 signature (binary)
+    LSH          16 band keys (multikey index → candidate lookup in MongoDB)
+    DuplicateOf  ``_id`` of the canonical posting, None for distinct postings
+
+Two postings are duplicates when their estimated Jaccard similarity is at
+least ``THRESHOLD``. Extraction and aggregations only read ``DISTINCT``
+postings, so each offer is counted once.
+
+    python -m skill_radar.dedup                 # sign new postings + re-cluster the collection
+    python -m skill_radar.dedup --rebuild       # recompute every signature
+
+At ingestion, ``annotate(job, collection)`` signs one posting and links it to
+an existing canonical posting before ``insert_one``.
+"""
+import argparse
+import re
+import zlib
+
+import numpy as np
+from pymongo import MongoClient, UpdateOne
+
+from skill_radar import data_versions, metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, DESCRIPTIONS_COLLECTION, MONGO_URI
+from skill_radar.description_store import HASH_FIELD, attach
+
+# -------------------- CONFIGURATION --------------------
+NUM_PERM = 128
+BANDS = 16            # 16 bands x 8 rows → candidates from ~0.7 similarity
+SHINGLE_SIZE = 3      # words
+THRESHOLD = 0.8       # estimated Jaccard similarity of two duplicates
+SEED = 42
+CHUNK_SIZE = 5_000
+
+SIGNATURE_FIELD = "MinHash"
+BANDS_FIELD = "LSH"
+DUPLICATE_FIELD = "DuplicateOf"
+DISTINCT = {DUPLICATE_FIELD: None}   # matches missing fields too
+
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r"\w+")
+
+
+# -------------------- SIGNATURES --------------------
+def posting_text(doc):
+    """Text compared between postings: the description, else the identifying fields."""
+    description = doc.get("Description")
+    if isinstance(description, str) and len(_WORD.findall(description)) >= SHINGLE_SIZE:
+        return description
+    fields = [doc.get(k) for k in ("Job Title", "Company", "Location", "Date")]
+    return " | ".join(str(v) for v in fields if v not in (None, ""))
+
+
+def shingle_hashes(text):
+    """CRC32 of the distinct word ``SHINGLE_SIZE``-grams of a text (lower-cased)."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))}
+    return np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """Universal hashes (a·x + b) mod p; the seed must stay fixed for stored signatures to be comparable."""
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, seed=SEED):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+
+    def signature(self, text):
+        """uint32 signature of a text, None when it has no words."""
+        hashes = shingle_hashes(text)
+        if not len(hashes):
+            return None
+        values = (np.outer(hashes % _PRIME, self.a) + self.b) % _PRIME
+        return values.min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature):
+        """One int64 key per band: band number in the high bits, CRC32 of its rows in the low bits."""
+        bands = signature.reshape(self.bands, self.rows)
+        return [(i << 32) | zlib.crc32(band.tobytes()) for i, band in enumerate(bands)]
+
+
+HASHER = MinHasher()
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures (or of a signature and a matrix of signatures)."""
+    return (np.asarray(b) == a).mean(axis=-1)
+
+
+def _signature(stored):
+    return np.frombuffer(stored, dtype=np.uint32)
+
+
+def sign(doc, hasher=HASHER):
+    """``{MinHash, LSH}`` fields of a posting (empty dict when it has no text)."""
+    signature = hasher.signature(posting_text(doc))
+    if signature is None:
+        return {}
+    return {SIGNATURE_FIELD: signature.tobytes(), BANDS_FIELD: hasher.band_keys(signature)}
+
+
+# -------------------- INGESTION --------------------
+def ensure_indexes(collection):
+    collection.create_index(BANDS_FIELD)
+    collection.create_index(DUPLICATE_FIELD)
+
+
+def annotate(doc, collection, threshold=THRESHOLD, hasher=HASHER, projection=("Skills",)):
+    """
+    Sign ``doc`` in place and look for its canonical posting among the LSH
+    candidates already stored. Returns the canonical document (with
+    ``projection`` fields) and sets ``DuplicateOf``, or returns None.
+    """
+    with metrics.timer("dedup_annotate"):
+        doc.update(sign(doc, hasher))
+        doc[DUPLICATE_FIELD] = None
+        if SIGNATURE_FIELD not in doc:
+            return None
+        signature = _signature(doc[SIGNATURE_FIELD])
+        fields = {SIGNATURE_FIELD: 1, **{f: 1 for f in projection}}
+        best, best_score = None, threshold
+        for candidate in collection.find({BANDS_FIELD: {"$in": doc[BANDS_FIELD]}, **DISTINCT}, fields):
+            score = similarity(signature, _signature(candidate[SIGNATURE_FIELD]))
+            if score >= best_score:
+                best, best_score = candidate, score
+    if best is not None:
+        best.pop(SIGNATURE_FIELD)
+        doc[DUPLICATE_FIELD] = best["_id"]
+        metrics.incr("dedup_duplicates")
+    return best
+
+
+# -------------------- BATCH --------------------
+def sign_collection(collection, rebuild=False, chunk_size=CHUNK_SIZE, hasher=HASHER):
+    """Write signatures on the postings that have none (all of them with ``rebuild``)."""
+    query = {} if rebuild else {SIGNATURE_FIELD: {"$exists": False}}
+    projection = {"Description": 1, HASH_FIELD: 1, "Job Title": 1, "Company": 1, "Location": 1, "Date": 1}
+    cursor = collection.find(query, projection, batch_size=chunk_size)
+    store = collection.database[DESCRIPTIONS_COLLECTION]
+    batch, total = [], 0
+
+    def write(batch):
+        operations = []
+        for doc in attach(batch, store):   # descriptions moved to the description store
+            fields = sign(doc, hasher)
+            update = {"$set": fields} if fields else {"$unset": {SIGNATURE_FIELD: "", BANDS_FIELD: ""}}
+            operations.append(UpdateOne({"_id": doc["_id"]}, update))
+        collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= chunk_size:
+            total += write(batch)
+            batch = []
+            print(f"   {total} postings signed")
+    if batch:
+        total += write(batch)
+    return total
+
+
+class _Clusters:
+    """Union-find over posting ids; the smallest id (as a string) represents its cluster."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, x, y):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            if str(ry) < str(rx):
+                rx, ry = ry, rx
+            self.parent[ry] = rx
+
+    def canonical(self):
+        return {x: self.find(x) for x in self.parent if self.find(x) != x}
+
+
+def _candidate_buckets(collection):
+    """Lists of ids sharing an LSH band key (only buckets of 2+ postings)."""
+    pipeline = [
+        {"$match": {BANDS_FIELD: {"$exists": True}}},
+        {"$project": {BANDS_FIELD: 1}},
+        {"$unwind": f"${BANDS_FIELD}"},
+        {"$group": {"_id": f"${BANDS_FIELD}", "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]
+    for bucket in collection.aggregate(pipeline, allowDiskUse=True):
+        yield bucket["ids"]
+
+
+def _cluster_buckets(collection, buckets, clusters, threshold):
+    ids = list({i for bucket in buckets for i in bucket})
+    signatures = {doc["_id"]: _signature(doc[SIGNATURE_FIELD])
+                  for doc in collection.find({"_id": {"$in": ids}}, {SIGNATURE_FIELD: 1})}
+    for bucket in buckets:
+        # greedy: each posting joins the first bucket representative it matches
+        representatives, matrix = [], []
+        for _id in bucket:
+            signature = signatures[_id]
+            if matrix:
+                scores = similarity(signature, matrix)
+                best = int(scores.argmax())
+                if scores[best] >= threshold:
+                    clusters.union(representatives[best], _id)
+                    continue
+            representatives.append(_id)
+            matrix.append(signature)
+
+
+def mark_duplicates(collection, threshold=THRESHOLD, chunk_size=CHUNK_SIZE):
+    """Cluster the signed postings and (re)write ``DuplicateOf``; returns the number of duplicates."""
+    clusters, batch, size = _Clusters(), [], 0
+    for bucket in _candidate_buckets(collection):
+        batch.append(bucket)
+        size += len(bucket)
+        if size >= chunk_size:
+            _cluster_buckets(collection, batch, clusters, threshold)
+            batch, size = [], 0
+    if batch:
+        _cluster_buckets(collection, batch, clusters, threshold)
+    canonical = clusters.canonical()
+
+    operations = [UpdateOne({"_id": _id}, {"$set": {DUPLICATE_FIELD: root}}) for _id, root in canonical.items()]
+    stale = collection.find({DUPLICATE_FIELD: {"$ne": None}}, {"_id": 1})
+    operations += [UpdateOne({"_id": doc["_id"]}, {"$set": {DUPLICATE_FIELD: None}})
+                   for doc in stale if doc["_id"] not in canonical]
+    for start in range(0, len(operations), chunk_size):
+        collection.bulk_write(operations[start:start + chunk_size], ordered=False)
+    if operations:
+        data_versions.bump(collection)
+    return len(canonical)
+
+
+def deduplicate(rebuild=False, threshold=THRESHOLD, chunk_size=CHUNK_SIZE):
+    """Batch job over the existing collection: sign what is missing, then re-cluster."""
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    ensure_indexes(collection)
+    with metrics.timer("dedup_sign"):
+        signed = sign_collection(collection, rebuild, chunk_size)
+    print(f"✅ {signed} postings signed")
+    with metrics.timer("dedup_cluster"):
+        duplicates = mark_duplicates(collection, threshold, chunk_size)
+    print(f"🎉 {duplicates} near-duplicates marked — "
+          f"{collection.count_documents(DISTINCT)} distinct postings")
+    metrics.flush()
+    return duplicates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mark near-duplicate job postings (MinHash + LSH).")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every signature")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    deduplicate(args.rebuild, args.threshold, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Posting descriptions stored out of ``job_offers``: content-addressed, de-duplicated, zstd-compressed.
+
+The description is most of the size of a posting, yet only skill extraction,
+signing (``skill_radar.dedup``), the CSV export and the Search page read it.
+Every other query of the dashboard, the forecasts and the recommenders paid
+for it in the working set. Descriptions therefore live in their own collection:
+
+    posting_descriptions   _id   SHA-256 of the text (identical descriptions stored once)
+                           data  zstd frame of the UTF-8 text
+                           size  length of the text (characters)
+                           terms distinct lower-case words of the text (text index: description search)
+    job_offers             DescriptionHash instead of Description
+
+``terms`` keeps the descriptions searchable although the text is compressed:
+the Search page looks the words up in this collection's text index and
+matches the postings by ``DescriptionHash`` (``skill_radar.posting_search``).
+
+A blob is written before the posting that references it, and never changes
+afterwards (same text → same ``_id``), so writers only need an upsert with
+``$setOnInsert``. Postings still holding an inline ``Description`` (not
+migrated yet) are read transparently.
+
+    store = descriptions_collection()
+    job[HASH_FIELD] = put(store, job.pop("Description"))   # scrapers, before insert_one
+    attach(docs, store)                                    # batched read: doc["Description"] for a list of postings
+
+    python -m skill_radar.description_store             # move the inline descriptions out (batched, resumable)
+    python -m skill_radar.description_store --compact   # ... then reclaim the space of job_offers
+    python -m skill_radar.description_store --prune     # delete descriptions no posting references
+    python -m skill_radar.description_store --terms     # index the words of descriptions stored without them
+"""
+import argparse
+import hashlib
+import re
+import threading
+
+import zstandard
+from bson import Binary
+from pymongo import MongoClient, TEXT, UpdateOne
+
+from skill_radar import metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, DESCRIPTIONS_COLLECTION, MONGO_URI
+
+# -------------------- CONFIGURATION --------------------
+HASH_FIELD = "DescriptionHash"
+LEVEL = 10                # zstd level: written once, read many times
+TERMS_INDEX = "description_terms"
+CHUNK_SIZE = 2_000        # postings per migration batch
+
+_local = threading.local()   # zstd (de)compressors are not thread-safe
+_WORD = re.compile(r"\w+")   # the text index splits on punctuation the same way
+
+
+def description_hash(text):
+    """SHA-256 of a description, None for missing or empty descriptions."""
+    if not isinstance(text, str) or not text.strip():
+        return None
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(text):
+    if not hasattr(_local, "compressor"):
+        _local.compressor = zstandard.ZstdCompressor(level=LEVEL)
+    return _local.compressor.compress(text.encode("utf-8"))
+
+
+def decompress(data):
+    if not hasattr(_local, "decompressor"):
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor.decompress(data).decode("utf-8")
+
+
+def description_terms(text):
+    """Distinct lower-case words of a description (first occurrence order), space-separated."""
+    return " ".join(dict.fromkeys(_WORD.findall(text.lower())))
+
+
+def ensure_indexes(store):
+    """Text index on ``terms`` (description search)."""
+    store.create_index([("terms", TEXT)], name=TERMS_INDEX)
+
+
+def descriptions_collection(client=None):
+    client = client or MongoClient(MONGO_URI)
+    return client[DB_NAME][DESCRIPTIONS_COLLECTION]
+
+
+# -------------------- WRITE --------------------
+def put_many(store, texts):
+    """Store descriptions (bulk upsert, known hashes are not rewritten); returns their hashes (None for empty ones)."""
+    hashes = [description_hash(text) for text in texts]
+    unique = {h: text for h, text in zip(hashes, texts) if h is not None}
+    if unique:
+        operations = [UpdateOne({"_id": h}, {"$setOnInsert": {"data": Binary(compress(text)), "size": len(text),
+                                                               "terms": description_terms(text)}},
+                                upsert=True)
+                      for h, text in unique.items()]
+        with metrics.timer("description_store_put"):
+            result = store.bulk_write(operations, ordered=False)
+        metrics.incr("description_store_new", result.upserted_count)
+    return hashes
+
+
+def put(store, text):
+    return put_many(store, [text])[0]
+
+
+# -------------------- READ --------------------
+def get_many(store, hashes):
+    """``{hash: description}`` of the given hashes (one query; unknown hashes are missing)."""
+    hashes = list({h for h in hashes if h})
+    if not hashes:
+        return {}
+    with metrics.timer("description_store_get"):
+        return {doc["_id"]: decompress(doc["data"]) for doc in store.find({"_id": {"$in": hashes}})}
+
+
+def get(store, description_hash):
+    return get_many(store, [description_hash]).get(description_hash)
+
+
+def attach(docs, store):
+    """Set ``Description`` on postings that only carry a ``DescriptionHash`` (one query per call)."""
+    texts = get_many(store, [doc.get(HASH_FIELD) for doc in docs if doc.get("Description") is None])
+    for doc in docs:
+        if doc.get("Description") is None and doc.get(HASH_FIELD):
+            doc["Description"] = texts.get(doc[HASH_FIELD])
+    return docs
+
+
+def description_of(doc, store):
+    """Description of one posting, inline or stored."""
+    return attach([dict(doc)], store)[0].get("Description")
+
+
+# -------------------- MIGRATION --------------------
+def migrate(client=None, chunk_size=CHUNK_SIZE):
+    """Move the inline descriptions of ``job_offers`` to the store, ``chunk_size`` postings at a time."""
+    client = client or MongoClient(MONGO_URI)
+    postings, store = client[DB_NAME][COLLECTION_NAME], descriptions_collection(client)
+    postings.create_index(HASH_FIELD)
+    ensure_indexes(store)
+    moved = 0
+    with metrics.timer("description_store_migrate"):
+        # Each batch removes its descriptions, so the same query returns the next batch (resumable)
+        while True:
+            batch = list(postings.find({"Description": {"$exists": True}}, {"Description": 1}).limit(chunk_size))
+            if not batch:
+                break
+            hashes = put_many(store, [doc.get("Description") for doc in batch])
+            postings.bulk_write([UpdateOne({"_id": doc["_id"]},
+                                           {"$set": {HASH_FIELD: h}, "$unset": {"Description": ""}})
+                                 for doc, h in zip(batch, hashes)], ordered=False)
+            moved += len(batch)
+            print(f"   {moved} descriptions moved")
+    print(f"✅ {moved} descriptions moved out of '{COLLECTION_NAME}'")
+    index_terms(client, chunk_size)
+    print_stats(client)
+    metrics.flush()
+    return moved
+
+
+def index_terms(client=None, chunk_size=CHUNK_SIZE):
+    """Write ``terms`` on the stored descriptions that have none (stored before description search)."""
+    store = descriptions_collection(client)
+    ensure_indexes(store)
+    indexed = 0
+    while True:
+        batch = list(store.find({"terms": {"$exists": False}}, {"data": 1}).limit(chunk_size))
+        if not batch:
+            break
+        store.bulk_write([UpdateOne({"_id": doc["_id"]}, {"$set": {"terms": description_terms(decompress(doc["data"]))}})
+                          for doc in batch], ordered=False)
+        indexed += len(batch)
+    if indexed:
+        print(f"🔤 Terms indexed on {indexed} stored descriptions")
+    return indexed
+
+
+def prune(client=None, chunk_size=CHUNK_SIZE):
+    """Delete the stored descriptions that no posting references any more; returns the number deleted."""
+    client = client or MongoClient(MONGO_URI)
+    postings, store = client[DB_NAME][COLLECTION_NAME], descriptions_collection(client)
+    postings.create_index(HASH_FIELD)
+    deleted, batch = 0, []
+
+    def flush(batch):
+        referenced = set(postings.distinct(HASH_FIELD, {HASH_FIELD: {"$in": batch}}))
+        orphans = [h for h in batch if h not in referenced]
+        return store.delete_many({"_id": {"$in": orphans}}).deleted_count if orphans else 0
+
+    for doc in store.find({}, {"_id": 1}, batch_size=chunk_size):
+        batch.append(doc["_id"])
+        if len(batch) >= chunk_size:
+            deleted += flush(batch)
+            batch = []
+    if batch:
+        deleted += flush(batch)
+    print(f"🧹 {deleted} unreferenced descriptions deleted")
+    return deleted
+
+
+def print_stats(client=None):
+    """Descriptions stored, raw vs compressed size, and the size of ``job_offers``."""
+    client = client or MongoClient(MONGO_URI)
+    db = client[DB_NAME]
+    totals = next(db[DESCRIPTIONS_COLLECTION].aggregate([{"$group": {
+        "_id": None, "count": {"$sum": 1}, "raw": {"$sum": "$size"}, "stored": {"$sum": {"$binarySize": "$data"}},
+    }}]), None) or {"count": 0, "raw": 0, "stored": 0}
+    print(f"📦 {totals['count']} distinct descriptions: {totals['raw'] / 1e6:.1f} MB of text "
+          f"→ {totals['stored'] / 1e6:.1f} MB compressed")
+    stats = db.command("collStats", COLLECTION_NAME)
+    print(f"📄 '{COLLECTION_NAME}': {stats['count']} postings, {stats['size'] / 1e6:.1f} MB")
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compressed, de-duplicated store of the posting descriptions.")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--compact", action="store_true", help="Run compact on job_offers after the migration")
+    parser.add_argument("--prune", action="store_true", help="Only delete the descriptions no posting references")
+    parser.add_argument("--stats", action="store_true", help="Only print the sizes")
+    parser.add_argument("--terms", action="store_true", help="Only index the words of the stored descriptions")
+    args = parser.parse_args(argv)
+
+    client = MongoClient(MONGO_URI)
+    if args.stats:
+        print_stats(client)
+    elif args.prune:
+        prune(client, args.chunk_size)
+    elif args.terms:
+        index_terms(client, args.chunk_size)
+    else:
+        migrate(client, args.chunk_size)
+        if args.compact:
+            # Removed fields leave free space in the data files until the collection is compacted
+            client[DB_NAME].command("compact", COLLECTION_NAME)
+            print_stats(client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+ETL of the Kaggle / scraped job datasets into MongoDB (replaces the cells of
+``DataCleaning&Preprocessing/data_preparation.ipynb``).
+
+    python -m skill_radar.etl                       # every source, in parallel (+ near-duplicate marking)
+    python -m skill_radar.etl --sources indeed_salaries job_postings_skills --chunk-size 20000
+    python -m skill_radar.etl --export-csv job_data_cleaned_final.csv   # training CSV of the notebooks (relational dataset)
+    python -m skill_radar.etl --export-csv all_postings.csv --export-sources all
+"""
+from skill_radar.etl.pipeline import (CHUNK_SIZE, EXPORT_SOURCES, SourceError, drop_notebook_copies, export_csv,
+                                     load_source, preview, run_sources)
+from skill_radar.etl.sources import SOURCES, STANDARD_COLUMNS, Source
+
+__all__ = [
+    "CHUNK_SIZE", "EXPORT_SOURCES", "SOURCES", "STANDARD_COLUMNS", "Source", "SourceError",
+    "drop_notebook_copies", "export_csv", "load_source", "preview", "run_sources",
+]
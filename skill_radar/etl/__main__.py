@@ -0,0 +1,47 @@
+import argparse
+import sys
+
+from skill_radar import dedup, salary_sketches, skill_trends
+from skill_radar.config import DATA_DIR
+from skill_radar.etl import (CHUNK_SIZE, EXPORT_SOURCES, SOURCES, SourceError, drop_notebook_copies, export_csv,
+                             run_sources)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the raw job datasets into MongoDB (chunked, parallel).")
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), help="Default: all sources")
+    parser.add_argument("--data-dir", default=str(DATA_DIR))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, help="Parallel processes (default: one per source, up to the CPU count)")
+    parser.add_argument("--skip-dedup", action="store_true", help="Do not re-cluster near-duplicates after loading")
+    parser.add_argument("--skip-trends", action="store_true", help="Do not rebuild the live skill trend statistics")
+    parser.add_argument("--skip-salaries", action="store_true", help="Do not rebuild the salary quantile sketches")
+    parser.add_argument("--export-csv", metavar="PATH", help="Only export the postings to a CSV")
+    parser.add_argument("--export-sources", nargs="+", choices=sorted(SOURCES) + ["all"], default=list(EXPORT_SOURCES),
+                        help="Sources exported by --export-csv (default: the relational dataset, as the notebook)")
+    args = parser.parse_args(argv)
+
+    if args.export_csv:
+        sources = None if "all" in args.export_sources else args.export_sources
+        export_csv(args.export_csv, sources=sources, chunk_size=args.chunk_size)
+        return
+    print(f"🚀 ETL from {args.data_dir}")
+    try:
+        results = run_sources(args.sources, args.data_dir, args.chunk_size, args.workers)
+    except SourceError as e:
+        # No dedup nor statistics rebuild over partial data
+        print(f"❌ {e}: dedup, trends and salary sketches not rebuilt")
+        sys.exit(1)
+    print(f"🎉 {sum(r['rows'] for r in results)} rows loaded from {len(results)} sources")
+    # Copies inserted by the notebook (ObjectId _id) before the ETL existed
+    drop_notebook_copies(chunk_size=args.chunk_size)
+    if not args.skip_dedup:
+        dedup.deduplicate(chunk_size=args.chunk_size)
+    if not args.skip_trends:
+        skill_trends.rebuild()
+    if not args.skip_salaries:
+        salary_sketches.rebuild()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Vectorized normalization helpers of the ETL (dates, salaries; countries are
+resolved by ``skill_radar.countries``).
+
+Each function takes a whole chunk column and returns a Series, reproducing
+the per-row helpers of ``data_preparation.ipynb`` (``format_date_to_iso``,
+``normalize_salary``) with pandas string operations instead of ``apply``.
+"""
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = "%d-%m-%Y"   # format stored in MongoDB
+
+# -------------------- DATES --------------------
+RELATIVE_TODAY = ["Hiring ongoing", "PostedJust posted", "PostedToday"]
+
+
+def format_dates(values):
+    """Any parseable date → 'dd-mm-YYYY' string (None when missing or invalid)."""
+    dates = pd.to_datetime(pd.Series(values), errors="coerce", format="mixed", utc=True)  # naive dates are kept as is
+    return dates.dt.strftime(DATE_FORMAT).astype(object).where(dates.notna(), None)
+
+
+def relative_dates(values, reference):
+    """Indeed 'PostedToday' / 'Posted 3 days ago' / '30+ days ago' labels → dates, relative to ``reference``."""
+    text = pd.Series(values, dtype=object).astype("string")
+    reference = pd.Timestamp(reference)
+    days = pd.to_numeric(text.str.extract(r"(\d+)\+? days? ago", expand=False), errors="coerce")
+    dates = pd.to_datetime(text.where(days.isna()), errors="coerce", format="mixed")
+    dates = dates.where(days.isna(), reference - pd.to_timedelta(days, unit="D"))
+    dates = dates.where(~text.isin(RELATIVE_TODAY).fillna(False), reference)
+    dates = dates.where(~text.eq("PostedYesterday").fillna(False), reference - pd.Timedelta(days=1))
+    return dates
+
+
+# -------------------- SALARIES --------------------
+SALARY_PATTERN = (r"(\d+\.?\d*)\s*[-–]?\s*(\d+\.?\d*)?\s*"
+                  r"(a year|yearly|a month|a week|an hour|a day|hr|mo|yr|hour|monthly|daily)?")
+
+
+def normalize_salary(values):
+    """
+    Yearly salary from Indeed strings ('$50,000 - $70,000 a year', '$25 an hour', ...):
+    average of the range, hours x 40 x 52, weeks x 52, months x 12, days x 5 x 52.
+    Plain numbers (already yearly) are kept.
+    """
+    text = pd.Series(values, dtype=object).astype("string")   # numbers go through the same pattern
+    text = (text.str.replace(",", "", regex=False).str.replace("CA$", "", regex=False)
+                .str.replace("USD", "", regex=False).str.replace("$", "", regex=False)
+                .str.strip().str.lower())
+    parts = text.str.extract(SALARY_PATTERN)
+    # float on both sides: '25.50' gives a Float64 part, '50000' an Int64 one, and fillna cannot mix them
+    low = pd.to_numeric(parts[0], errors="coerce").astype(float)
+    high = pd.to_numeric(parts[1], errors="coerce").astype(float).fillna(low)
+    period = parts[2].fillna("")
+    factor = np.select(
+        [period.str.contains("hour|hr").to_numpy(dtype=bool),
+         period.str.contains("week").to_numpy(dtype=bool),
+         period.str.contains("month|mo").to_numpy(dtype=bool),
+         period.str.contains("day|daily").to_numpy(dtype=bool)],
+        [40 * 52, 52, 12, 5 * 52],
+        default=1,
+    )
+    return ((low + high) / 2 * factor).astype(float)
@@ -0,0 +1,266 @@
+"""
+Chunked, parallel loading of the raw sources into MongoDB.
+
+Each source runs in its own process: its CSV is streamed ``chunk_size`` rows
+at a time, normalized by its adapter and written with one unordered
+``bulk_write`` of upserts per chunk, so peak memory depends on the chunk size
+and not on the file size. Skills stored in a separate table are pushed to the
+documents in a second pass and joined into the usual comma-separated string
+by MongoDB itself (no in-memory join). Every posting is MinHash-signed on the
+way in (``skill_radar.dedup``) so near-duplicates can be clustered afterwards.
+
+Postings inserted by the notebook have an ObjectId ``_id`` and no ``Source``:
+the ETL's ``"source:hash"`` ids would load them a second time.
+``drop_notebook_copies`` removes those copies, matched on the identifying
+fields, once the sources are loaded.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+from pymongo import MongoClient, UpdateOne
+
+from skill_radar import data_versions, dedup, description_store, metrics, posting_search
+from skill_radar.config import COLLECTION_NAME, DATA_DIR, DB_NAME, DESCRIPTIONS_COLLECTION, MONGO_URI
+from skill_radar.countries import COUNTRY_FIELD
+from skill_radar.etl.sources import SOURCES, STANDARD_COLUMNS
+from skill_radar.skill_aliases import canonicalize_series
+
+# -------------------- CONFIGURATION --------------------
+CHUNK_SIZE = 50_000
+SKILL_PARTS = "_skill_parts"   # temporary array used by the second pass
+EXPORT_SOURCES = ("relational_job_skills",)   # content of the notebook's job_data_cleaned_final.csv
+NOTEBOOK_COPIES = {"Source": None, "_id": {"$type": "objectId"}}   # inserted by data_preparation.ipynb
+IDENTITY_FIELDS = ["Job Title", "Company", "Location", "URL", description_store.HASH_FIELD]
+
+
+def _records(frame):
+    """DataFrame → list of dicts with None instead of NaN / NaT."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+def posting_operations(source, frame):
+    """
+    One upsert per posting (with its MinHash signature) and the descriptions to
+    store (``{hash: text}``): the postings only keep ``DescriptionHash``.
+    Sources without skills never overwrite extracted ``Skills``.
+    """
+    frame = frame.assign(Source=source.name)
+    if not source.has_skills or source.skills_in_parts:
+        frame = frame.drop(columns="Skills")
+    operations, descriptions = [], {}
+    for doc in _records(frame):
+        fields = posting_search.search_fields(doc)
+        if "Skills" not in doc:
+            fields.pop(posting_search.SKILLS_FIELD)
+        fields.update(dedup.sign(doc))
+        text = doc.pop("Description", None)
+        fields[description_store.HASH_FIELD] = description_store.description_hash(text)
+        if fields[description_store.HASH_FIELD]:
+            descriptions[fields[description_store.HASH_FIELD]] = text
+        update = {"$set": {**{k: v for k, v in doc.items() if k != "_id"}, **fields}}
+        if "Skills" not in doc:
+            update["$setOnInsert"] = {"Skills": None}
+        operations.append(UpdateOne({"_id": doc["_id"]}, update, upsert=True))
+    return operations, descriptions
+
+
+def skill_part_operations(frame):
+    """Group a chunk of (``_id``, skill) rows and push them to the postings (aliases applied)."""
+    frame = frame.assign(Skills=canonicalize_series(frame["Skills"]))
+    grouped = frame.groupby("_id", sort=False)["Skills"].agg(list)
+    return [UpdateOne({"_id": _id}, {"$push": {SKILL_PARTS: {"$each": parts}}})
+            for _id, parts in grouped.items()]
+
+
+def finalize_skills(collection, source_name):
+    """Join the pushed skill parts into ``Skills`` (sorted, de-duplicated, ', '-separated)."""
+    joined = {"$reduce": {
+        "input": {"$sortArray": {"input": {"$setUnion": [f"${SKILL_PARTS}", []]}, "sortBy": 1}},
+        "initialValue": "",
+        "in": {"$cond": [{"$eq": ["$$value", ""]}, "$$this", {"$concat": ["$$value", ", ", "$$this"]}]},
+    }}
+    result = collection.update_many(
+        {"Source": source_name, SKILL_PARTS: {"$exists": True}},
+        [{"$set": {"Skills": joined}},
+         {"$set": {posting_search.SKILLS_FIELD: posting_search.SKILL_TAGS_EXPRESSION}},
+         {"$unset": SKILL_PARTS}],
+    )
+    return result.modified_count
+
+
+def load_source(name, data_dir=DATA_DIR, chunk_size=CHUNK_SIZE):
+    """Stream one source into MongoDB (runs in a worker process)."""
+    source = SOURCES[name]
+    client = MongoClient(MONGO_URI)
+    collection, store = client[DB_NAME][COLLECTION_NAME], client[DB_NAME][DESCRIPTIONS_COLLECTION]
+    data_dir = Path(data_dir)
+    stats = {"source": name, "rows": 0, "upserted": 0, "modified": 0, "skills": 0}
+    start = time.perf_counter()
+
+    for frame in source.chunks(data_dir, chunk_size):
+        with metrics.timer("etl_chunk", source=name):
+            operations, descriptions = posting_operations(source, frame)
+            # Descriptions first: a posting never references a missing description
+            description_store.put_many(store, list(descriptions.values()))
+            if operations:
+                result = collection.bulk_write(operations, ordered=False)
+                stats["upserted"] += result.upserted_count
+                stats["modified"] += result.modified_count
+        stats["rows"] += len(frame)
+        metrics.incr("etl_rows", len(frame), source=name)
+
+    if source.skills_in_parts:
+        for frame in source.skill_chunks(data_dir, chunk_size):
+            operations = skill_part_operations(frame)
+            if operations:
+                collection.bulk_write(operations, ordered=False)
+        stats["skills"] = finalize_skills(collection, name)
+
+    stats["seconds"] = round(time.perf_counter() - start, 1)
+    metrics.flush()
+    return stats
+
+
+class SourceError(RuntimeError):
+    """Raised by ``run_sources`` once every source has run, when some of them failed."""
+
+    def __init__(self, failures, results):
+        super().__init__(f"{len(failures)} source(s) failed: " + "; ".join(f"{n}: {e}" for n, e in failures.items()))
+        self.failures = failures
+        self.results = results
+
+
+def run_sources(names=None, data_dir=DATA_DIR, chunk_size=CHUNK_SIZE, workers=None):
+    """
+    Load several sources in parallel processes; returns one stats dict per source.
+    A missing file only skips its source; any other failure raises ``SourceError``
+    after the other sources have finished.
+    """
+    names = list(names or SOURCES)
+    unknown = sorted(set(names) - set(SOURCES))
+    if unknown:
+        raise ValueError(f"Unknown sources: {unknown} (available: {sorted(SOURCES)})")
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    collection.create_index("Source")
+    collection.create_index(COUNTRY_FIELD)
+    collection.create_index(description_store.HASH_FIELD)
+    dedup.ensure_indexes(collection)
+    posting_search.ensure_indexes(collection)
+
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    results, failures = [], {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(load_source, name, data_dir, chunk_size): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                stats = future.result()
+            except FileNotFoundError as e:
+                print(f"⚠️ {name}: file not found ({e.filename}), skipped")
+                continue
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                failures[name] = e
+                continue
+            print(f"✅ {name}: {stats['rows']} rows, {stats['upserted']} new, "
+                  f"{stats['modified']} updated in {stats['seconds']} s")
+            results.append(stats)
+    if any(stats["modified"] or stats["skills"] for stats in results):
+        data_versions.bump(collection)   # upserts over existing postings
+    if failures:
+        raise SourceError(failures, results)
+    return results
+
+
+def _batches(cursor, size):
+    batch = []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _identities(docs):
+    """Hash of the identifying fields of each posting (missing, NaN and empty values are equal)."""
+    frame = pd.DataFrame(docs, columns=["_id", "Description", *IDENTITY_FIELDS])
+    hashes = frame[description_store.HASH_FIELD].fillna(frame["Description"].map(description_store.description_hash))
+    keys = frame[IDENTITY_FIELDS].assign(**{description_store.HASH_FIELD: hashes})
+    keys = keys.astype(object).where(keys.notna(), "").astype(str)
+    return pd.util.hash_pandas_object(keys, index=False).tolist()
+
+
+def drop_notebook_copies(client=None, chunk_size=CHUNK_SIZE):
+    """
+    Delete the postings the notebook inserted (ObjectId ``_id``, no ``Source``)
+    that the ETL loaded again; their ``Skills`` are kept when the ETL posting has
+    none. Postings of the scrapers that match no source are left alone.
+    Returns the number of postings deleted.
+    """
+    client = client or MongoClient(MONGO_URI)
+    collection = client[DB_NAME][COLLECTION_NAME]
+    fields = {field: 1 for field in ["Description", "Skills", *IDENTITY_FIELDS]}
+    copies = {}   # identity hash → [(_id, Skills)]: descriptions are only read one batch at a time
+    for docs in _batches(collection.find(NOTEBOOK_COPIES, fields, batch_size=chunk_size), chunk_size):
+        for doc, identity in zip(docs, _identities(docs)):
+            skills = doc.get("Skills") if isinstance(doc.get("Skills"), str) else None
+            copies.setdefault(identity, []).append((doc["_id"], skills))
+    if not copies:
+        return 0
+
+    deleted = 0
+    etl_fields = {field: 1 for field in ["Skills", *IDENTITY_FIELDS]}
+    for docs in _batches(collection.find({"Source": {"$ne": None}}, etl_fields, batch_size=chunk_size), chunk_size):
+        operations, stale = [], []
+        for doc, identity in zip(docs, _identities(docs)):
+            legacy = copies.pop(identity, None)
+            if not legacy:
+                continue
+            stale += [_id for _id, _ in legacy]
+            skills = next((skills for _, skills in legacy if skills), None)
+            if doc.get("Skills") is None and skills:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+                    "Skills": skills, posting_search.SKILLS_FIELD: posting_search.skill_tags(skills)}}))
+        if operations:
+            collection.bulk_write(operations, ordered=False)
+        if stale:
+            deleted += collection.delete_many({"_id": {"$in": stale}}).deleted_count
+    if deleted:
+        data_versions.bump(collection)
+    print(f"🧹 {deleted} postings of the notebook loaded again by the ETL deleted")
+    return deleted
+
+
+def export_csv(path, query=None, sources=EXPORT_SOURCES, chunk_size=CHUNK_SIZE):
+    """
+    Stream the distinct postings (``STANDARD_COLUMNS``) to a CSV. By default
+    only ``EXPORT_SOURCES``, i.e. the relational dataset of the notebook's
+    ``job_data_cleaned_final.csv``; ``sources=None`` exports every posting.
+    """
+    client = MongoClient(MONGO_URI)
+    collection, store = client[DB_NAME][COLLECTION_NAME], client[DB_NAME][DESCRIPTIONS_COLLECTION]
+    projection = {"_id": 0, description_store.HASH_FIELD: 1, **{col: 1 for col in STANDARD_COLUMNS}}
+    query = dict(dedup.DISTINCT if query is None else query)
+    if sources:
+        query["Source"] = {"$in": list(sources)}
+    cursor = collection.find(query, projection, batch_size=chunk_size)
+    total = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        pd.DataFrame(columns=STANDARD_COLUMNS).to_csv(f, index=False)
+        for batch in _batches(cursor, chunk_size):
+            batch = description_store.attach(batch, store)   # one query per chunk
+            pd.DataFrame(batch, columns=STANDARD_COLUMNS).to_csv(f, index=False, header=False)
+            total += len(batch)
+    print(f"✅ {total} postings exported to {path}")
+    return total
+
+
+def preview(name, data_dir=DATA_DIR, rows=5):
+    """First normalized rows of a source, without writing anything (notebook exploration)."""
+    return next(SOURCES[name].chunks(Path(data_dir), rows), pd.DataFrame())
@@ -0,0 +1,282 @@
+"""
+One adapter per raw source of ``data_preparation.ipynb``.
+
+An adapter streams its CSV(s) in chunks and turns every chunk into the common
+layout (``STANDARD_COLUMNS`` + ``_id``). ``_id`` is a stable hash of the
+columns identifying a posting, so re-running the ETL updates documents instead
+of duplicating them. Sources whose skills live in a separate table
+(``skill_chunks``) attach them in a second pass, keyed by the same ``_id``.
+``Location`` keeps the raw value; ``Country`` is resolved by
+``skill_radar.countries``, falling back to the dataset's country (``Source.country``)
+for the single-country datasets.
+"""
+import pandas as pd
+
+from skill_radar.countries import UNKNOWN, resolve_countries
+from skill_radar.etl.normalize import format_dates, normalize_salary, relative_dates
+from skill_radar.skill_aliases import canonicalize_series
+
+STANDARD_COLUMNS = ["Job Title", "Description", "Location", "Country", "Date", "Company", "Salary", "URL", "Skills"]
+
+
+def require(df, columns, source):
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"{source}: colonnes manquantes : {missing}")
+
+
+def document_ids(source, keys):
+    """Stable ``_id`` per row from the identifying columns ``keys`` (DataFrame)."""
+    hashes = pd.util.hash_pandas_object(keys.astype(str), index=False)
+    return f"{source}:" + hashes.map("{:016x}".format)
+
+
+def standardize(source, df, keys, country=None):
+    """Common layout + vectorized country / salary / date / skill alias normalization + ``_id``."""
+    out = pd.DataFrame({col: df.get(col) for col in STANDARD_COLUMNS}, index=df.index)
+    out["Country"] = resolve_countries(out["Location"], default=country or UNKNOWN, missing=country or UNKNOWN)
+    out["Salary"] = normalize_salary(out["Salary"])
+    out["Date"] = format_dates(out["Date"])
+    out["Skills"] = canonicalize_series(out["Skills"])
+    out["_id"] = document_ids(source, keys)
+    return out
+
+
+class Source:
+    """Base adapter: one CSV read in chunks, ``transform`` applied to each chunk."""
+
+    name = ""
+    files = ()
+    has_skills = False       # False: an existing ``Skills`` value is never overwritten
+    skills_in_parts = False  # True: ``skill_chunks`` provides the skills in a second pass
+    country = None           # country of the single-country datasets (unresolved / missing locations)
+    read_options = {}
+
+    def paths(self, data_dir):
+        return [data_dir / f for f in self.files]
+
+    def read(self, path, chunk_size, **options):
+        return pd.read_csv(path, chunksize=chunk_size, **{**self.read_options, **options})
+
+    def chunks(self, data_dir, chunk_size):
+        for chunk in self.read(self.paths(data_dir)[0], chunk_size):
+            yield self.transform(chunk)
+
+    def skill_chunks(self, data_dir, chunk_size):
+        return iter(())
+
+    def transform(self, chunk):
+        raise NotImplementedError
+
+
+# -------------------- INDEED (KAGGLE) --------------------
+class IndeedAIJobs(Source):
+    """Data-Science and AI Jobs – Indeed (dataset 1)."""
+
+    name = "indeed_ai_jobs"
+    files = ("Data-Science and AI Jobs - Indeed/DataScience and AI Jobs.csv",)
+    country = "India"
+
+    def transform(self, chunk):
+        require(chunk, ["title", "location", "summary", "salary"], self.name)
+        df = pd.DataFrame({
+            "Job Title": chunk["title"],
+            "Description": chunk["summary"],
+            "Location": chunk["location"],
+            "Company": "",
+            "URL": "",
+        })
+        return standardize(self.name, df, chunk[["title", "summary", "location"]], self.country)
+
+
+class IndeedDataJobs(Source):
+    """Data-Science, Data-Analyst & ML Jobs – Indeed (dataset 2), relative 'Posted ... ago' dates."""
+
+    name = "indeed_data_jobs"
+    files = ("Data-Science, Data-Analyst & ML Jobs – Indeed/job_dataset.csv",)
+    country = "India"
+
+    def transform(self, chunk):
+        chunk.columns = chunk.columns.str.lower()
+        require(chunk, ["job_title", "company", "job_location", "job_summary",
+                        "post_date", "today", "job_salary", "job_url"], self.name)
+        reference = pd.to_datetime(chunk["today"].iloc[0])
+        df = pd.DataFrame({
+            "Job Title": chunk["job_title"],
+            "Description": chunk["job_summary"],
+            "Location": chunk["job_location"],
+            "Date": relative_dates(chunk["post_date"], reference),
+            "Company": chunk["company"],
+            "URL": chunk["job_url"],
+        })
+        return standardize(self.name, df, chunk[["job_url", "job_title", "company"]], self.country)
+
+
+class IndeedSalaries(Source):
+    """Data-Science Jobs & Salaries – Indeed (dataset 3), the only one with salary strings."""
+
+    name = "indeed_salaries"
+    files = ("Data-Science Jobs & Salaries – Indeed/Indeed-Data Science Jobs List.csv",)
+    country = "United States"
+
+    def transform(self, chunk):
+        require(chunk, ["Job Title", "Company", "Location", "Salary",
+                        "Short Description", "Posted At", "Job link"], self.name)
+        df = pd.DataFrame({
+            "Job Title": chunk["Job Title"],
+            "Description": chunk["Short Description"],
+            "Location": chunk["Location"],
+            "Company": chunk["Company"],
+            "Salary": chunk["Salary"],
+            "URL": chunk["Job link"],
+        })
+        return standardize(self.name, df, chunk[["Job link", "Job Title", "Company"]], self.country)
+
+
+class MLEngineerJobs(Source):
+    """ML Engineer Jobs – Indeed (dataset 4_1), with a 'skills required' column."""
+
+    name = "ml_engineer_jobs"
+    files = ("ML Engineer Jobs – Indeed/ML Engineer jobs (Indeed).csv",)
+    has_skills = True
+    country = "India"
+
+    def transform(self, chunk):
+        chunk.columns = chunk.columns.str.lower().str.strip()
+        require(chunk, ["job title", "company", "region", "skills required"], self.name)
+        df = pd.DataFrame({
+            "Job Title": chunk["job title"],
+            "Description": "",
+            "Location": chunk["region"],
+            "Company": chunk["company"],
+            "URL": "",
+            "Skills": chunk["skills required"],
+        })
+        return standardize(self.name, df, chunk[["job title", "company", "region", "skills required"]], self.country)
+
+
+class DataAnalystJobs(Source):
+    """
+    Data Analyst jobs – Indeed (datasets 4_2 and 4_3 of the notebook, which read
+    the same file twice: it is loaded once here).
+    """
+
+    name = "data_analyst_jobs"
+    files = ("ML Engineer Jobs – Indeed/Data Analyst jobs (Indeed).csv",)
+    has_skills = True
+    country = "India"
+
+    def transform(self, chunk):
+        chunk.columns = chunk.columns.str.lower().str.strip()
+        require(chunk, ["job title", "company", "skills required"], self.name)
+        df = pd.DataFrame({
+            "Job Title": chunk["job title"],
+            "Description": "",
+            "Location": "India",
+            "Company": chunk["company"],
+            "URL": "",
+            "Skills": chunk["skills required"],
+        })
+        return standardize(self.name, df, chunk[["job title", "company", "skills required"]], self.country)
+
+
+# -------------------- LINKEDIN (KAGGLE) --------------------
+class JobPostingsSkills(Source):
+    """Data-Science Job Postings & Skills (dataset 5): postings + a separate job_link → skills table."""
+
+    name = "job_postings_skills"
+    files = ("Data-Science Job Postings & Skills/job_postings.csv",
+             "Data-Science Job Postings & Skills/job_skills.csv")
+    has_skills = True
+    skills_in_parts = True
+
+    def transform(self, chunk):
+        chunk.columns = chunk.columns.str.lower().str.strip()
+        require(chunk, ["job_title", "job_location", "last_processed_time", "company", "job_link"], self.name)
+        df = pd.DataFrame({
+            "Job Title": chunk["job_title"],
+            "Description": "",
+            "Location": chunk["job_location"],
+            "Date": chunk["last_processed_time"],
+            "Company": chunk["company"],
+            "URL": chunk["job_link"],
+        })
+        return standardize(self.name, df, chunk[["job_link"]])
+
+    def skill_chunks(self, data_dir, chunk_size):
+        for chunk in self.read(self.paths(data_dir)[1], chunk_size):
+            chunk = chunk.dropna(subset=["job_skills"])
+            yield pd.DataFrame({
+                "_id": document_ids(self.name, chunk[["job_link"]]),
+                "Skills": chunk["job_skills"].astype(str),
+            })
+
+
+# -------------------- SCRAPED (APIFY) --------------------
+class ScrapedJobsApi(Source):
+    """scrapped_jobs_api.csv (dataset 6), exported from the Apify scrapers."""
+
+    name = "scraped_jobs_api"
+    files = ("scrapped_jobs_api.csv",)
+
+    def transform(self, chunk):
+        require(chunk, ["Location"], self.name)
+        df = pd.DataFrame({
+            "Job Title": chunk.get("Title"),
+            "Description": "",
+            "Location": chunk["Location"],
+            "Date": chunk.get("DatePosted"),
+            "Company": chunk.get("Company"),
+            "URL": chunk.get("URL"),
+        }, index=chunk.index)
+        return standardize(self.name, df, df[["URL", "Job Title", "Company"]])
+
+
+# -------------------- RELATIONAL DATASET --------------------
+class RelationalJobSkills(Source):
+    """
+    'skill job dataset relationnel': job_postings_fact + company_dim + skills_dim + skills_job_dim.
+    The dimension tables are small and loaded once; facts and the job ↔ skill
+    table are streamed.
+    """
+
+    name = "relational_job_skills"
+    files = ("skill job dataset relationnel/job_postings_fact.csv",
+             "skill job dataset relationnel/company_dim.csv",
+             "skill job dataset relationnel/skills_dim.csv",
+             "skill job dataset relationnel/skills_job_dim.csv")
+    has_skills = True
+    skills_in_parts = True
+
+    def chunks(self, data_dir, chunk_size):
+        facts, companies_path = self.paths(data_dir)[:2]
+        companies = pd.read_csv(companies_path, usecols=["company_id", "name"]).set_index("company_id")["name"]
+        for chunk in self.read(facts, chunk_size):
+            require(chunk, ["job_id", "job_title_short", "job_posted_date", "job_country",
+                            "company_id", "salary_year_avg", "link"], self.name)
+            df = pd.DataFrame({
+                "Job Title": chunk["job_title_short"],
+                "Description": None,
+                "Location": chunk["job_country"],
+                "Date": chunk["job_posted_date"],
+                "Company": chunk["company_id"].map(companies),
+                "Salary": chunk["salary_year_avg"],
+                "URL": chunk["link"],
+            })
+            yield standardize(self.name, df, chunk[["job_id"]])
+
+    def skill_chunks(self, data_dir, chunk_size):
+        skills_path, links_path = self.paths(data_dir)[2:]
+        skills = pd.read_csv(skills_path, usecols=["skill_id", "skills"]).set_index("skill_id")["skills"]
+        for chunk in self.read(links_path, chunk_size):
+            chunk = chunk.assign(Skills=chunk["skill_id"].map(skills)).dropna(subset=["Skills"])
+            yield pd.DataFrame({
+                "_id": document_ids(self.name, chunk[["job_id"]]),
+                "Skills": chunk["Skills"].astype(str),
+            })
+
+
+SOURCES = {source.name: source for source in [
+    IndeedAIJobs(), IndeedDataJobs(), IndeedSalaries(), MLEngineerJobs(), DataAnalystJobs(),
+    JobPostingsSkills(), ScrapedJobsApi(), RelationalJobSkills(),
+]}
@@ -0,0 +1,76 @@
+"""
+"Fastest rising skills" ranking computed in bulk over all Prophet forecasts.
+
+The long ``forecast_all_skills.csv`` table is pivoted once into skills x months
+matrices (yhat / yhat_lower / yhat_upper); every metric is then a NumPy
+operation over the whole matrix instead of a loop over skills.
+"""
+import numpy as np
+import pandas as pd
+
+FORECAST_COLUMNS = ["yhat", "yhat_lower", "yhat_upper"]
+RANKING_METRICS = ["momentum", "growth_pct", "slope"]
+
+
+def forecast_matrices(df_forecasts):
+    """Pivot the forecasts into one skills x dates DataFrame per column (same index/columns)."""
+    wide = df_forecasts.pivot_table(index="Skill", columns="ds", values=FORECAST_COLUMNS, aggfunc="mean")
+    return {col: wide[col] for col in FORECAST_COLUMNS}
+
+
+def rank_skills(matrices, today, horizon=6):
+    """
+    Projected evolution of every skill between ``today`` and ``today + horizon`` months.
+
+    - ``growth_pct``: relative change of yhat over the horizon.
+    - ``slope``: least-squares slope of yhat over the horizon (occurrences / month).
+    - ``uncertainty``: half-width of the prediction interval at the horizon.
+    - ``momentum``: change divided by the uncertainty (a signal-to-noise score),
+      so a rise is only ranked high when the interval does not swallow it.
+    """
+    yhat = matrices["yhat"]
+    dates = yhat.columns
+    base_col = max(int(dates.searchsorted(pd.Timestamp(today), side="right")) - 1, 0)
+    target_col = min(base_col + horizon, len(dates) - 1)
+
+    window = yhat.iloc[:, base_col:target_col + 1].to_numpy(dtype=float)
+    lower = matrices["yhat_lower"].iloc[:, target_col].to_numpy(dtype=float)
+    upper = matrices["yhat_upper"].iloc[:, target_col].to_numpy(dtype=float)
+
+    base, target = window[:, 0], window[:, -1]
+    change = target - base
+    growth_pct = 100 * change / np.maximum(np.abs(base), 1.0)
+
+    t = np.arange(window.shape[1], dtype=float)
+    t -= t.mean()
+    denom = (t ** 2).sum()
+    slope = window @ t / denom if denom else np.zeros(len(window))
+
+    uncertainty = np.maximum((upper - lower) / 2, 1e-9)
+    momentum = change / uncertainty
+
+    ranking = pd.DataFrame({
+        "Skill": yhat.index,
+        "Current": base,
+        "Projected": target,
+        "growth_pct": growth_pct,
+        "slope": slope,
+        "uncertainty": uncertainty,
+        "momentum": momentum,
+    }).dropna(subset=["Current", "Projected", "slope"]).reset_index(drop=True)
+    ranking.attrs["from"] = dates[base_col]
+    ranking.attrs["to"] = dates[target_col]
+    return ranking
+
+
+def top_movers(ranking, n=10, by="momentum"):
+    """Return the ``n`` top risers and ``n`` top fallers according to ``by``."""
+    values = ranking[by].to_numpy()
+    n = min(n, len(values))
+    if n == 0:
+        return ranking.iloc[:0], ranking.iloc[:0]
+    top = np.argpartition(-values, n - 1)[:n]
+    bottom = np.argpartition(values, n - 1)[:n]
+    risers = ranking.iloc[top].sort_values(by, ascending=False)
+    fallers = ranking.iloc[bottom].sort_values(by)
+    return risers.reset_index(drop=True), fallers.reset_index(drop=True)
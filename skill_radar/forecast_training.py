@@ -0,0 +1,300 @@
+"""
+Batch Prophet retraining pipeline (replaces the training cells of model_skills_forcast.ipynb).
+
+    python -m skill_radar.forecast_training --since 2022-01 --workers 8
+
+1. One MongoDB aggregation computes the skill x month counts.
+2. Each skill's Prophet model is fitted in a process pool (one process per core).
+3. Models are warm-started from the parameters of the previous version.
+4. Artifacts are written to a fresh version folder, then published atomically
+   (``prophet_registry/`` / ``forecast_all_skills.csv`` next to the notebook).
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+from pymongo import MongoClient
+
+from skill_radar.config import COLLECTION_NAME, DB_NAME, FORECAST_DIR, MONGO_URI
+from skill_radar.dedup import DISTINCT
+from skill_radar.model_registry import REGISTRY_DIR, ModelRegistry, stan_init
+from skill_radar.posting_search import POSTED_AT_EXPRESSION
+
+# -------------------- CONFIGURATION --------------------
+PERIODS_FUTURE = 12        # Months to forecast
+MIN_MONTHS_DATA = 6        # Minimal series length to train Prophet
+MIN_MENTIONS = 500         # Same threshold as the notebook ("moyennement fréquents")
+
+REGISTRY_SUBDIR = REGISTRY_DIR.name
+FORECAST_FILE = "forecast_all_skills.csv"
+MANIFEST_FILE = "manifest.json"
+VERSIONS_DIR = FORECAST_DIR / "versions"
+LATEST_FILE = "LATEST"
+
+# Rare but strategic skills kept even below MIN_MENTIONS (from the notebook)
+STRATEGIC_SKILLS = [
+    "langchain", "llamaindex", "rag", "ollama", "openai", "llama", "gpt", "chatgpt",
+    "transformers", "huggingface", "peft", "bitsandbytes", "diffusers",
+    "nltk", "spacy", "bert", "t5", "word2vec", "glove", "elmo",
+    "pinecone", "weaviate", "chromadb", "faiss", "milvus", "vector database", "semantic search", "embedding",
+    "opencv", "cv2", "yolo", "detectron2", "segformer", "ultralytics",
+    "streamlit", "gradio", "fastapi", "flask",
+    "mlflow", "dvc"
+]
+
+
+# -------------------- DATA --------------------
+def monthly_skill_counts_pipeline(since=None):
+    """Aggregation returning one document per (skill, month) with its posting count."""
+    pipeline = [
+        {"$match": {**DISTINCT, "Date": {"$ne": None}, "Skills": {"$nin": [None, ""]}}},
+        {"$project": {
+            "_id": 0,
+            "month": {"$dateToString": {"format": "%Y-%m", "date": POSTED_AT_EXPRESSION}},   # dd-mm-yyyy or ISO
+            "skills": {"$split": ["$Skills", ","]},
+        }},
+        {"$match": {"month": {"$ne": None}}},
+    ]
+    if since:
+        pipeline.append({"$match": {"month": {"$gte": since}}})
+    pipeline += [
+        {"$unwind": "$skills"},
+        {"$project": {"month": 1, "skill": {"$toLower": {"$trim": {"input": "$skills"}}}}},
+        {"$match": {"skill": {"$ne": ""}}},
+        {"$group": {"_id": {"skill": "$skill", "month": "$month"}, "count": {"$sum": 1}}},
+    ]
+    return pipeline
+
+
+def load_skill_counts(collection, since=None):
+    """
+    Return a DataFrame [Date, Skill, Count] (Date = month end, like the notebook's
+    ``pd.Grouper(freq="M")``) computed in a single aggregation.
+    """
+    rows = [
+        (doc["_id"]["month"], doc["_id"]["skill"], doc["count"])
+        for doc in collection.aggregate(monthly_skill_counts_pipeline(since), allowDiskUse=True)
+    ]
+    df = pd.DataFrame(rows, columns=["Month", "Skill", "Count"])
+    df["Date"] = pd.PeriodIndex(df["Month"], freq="M").to_timestamp(how="end").normalize()
+    return df[["Date", "Skill", "Count"]]
+
+
+def select_skills(skill_counts, min_mentions=MIN_MENTIONS, strategic=STRATEGIC_SKILLS):
+    """Skills with at least ``min_mentions`` postings, plus the strategic ones."""
+    totals = skill_counts.groupby("Skill")["Count"].sum()
+    keep = totals[(totals >= min_mentions) | totals.index.isin(strategic)]
+    return sorted(keep.index)
+
+
+def month_ends(start, periods):
+    """``periods`` consecutive month-end timestamps starting at the month of ``start``."""
+    return pd.period_range(pd.Timestamp(start).to_period("M"), periods=periods, freq="M") \
+        .to_timestamp(how="end").normalize()
+
+
+# -------------------- WARM START --------------------
+def load_previous_init(path=REGISTRY_DIR):
+    """
+    Warm-start parameters per skill: read from the registry manifest (no model is
+    deserialized), or extracted from an old monolithic ``prophet_models.pkl``.
+    """
+    if not path or not Path(path).exists():
+        return {}
+    path = Path(path)
+    if path.is_dir():
+        registry = ModelRegistry(path)
+        return {skill: registry.init_params(skill) for skill in registry.skills() if registry.init_params(skill)}
+    with open(path, "rb") as f:
+        models = pickle.load(f)
+    inits = {}
+    for skill, model in models.items():
+        try:
+            inits[skill] = stan_init(model)
+        except Exception:
+            continue
+    return inits
+
+
+# -------------------- FITTING (worker process) --------------------
+def fit_skill(skill, dates, counts, periods=PERIODS_FUTURE, init=None):
+    """
+    Fit one Prophet model on a monthly series. Runs inside a pool worker, so it
+    only receives plain lists and returns the serialized model, its warm-start
+    parameters and the forecast.
+    """
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    logging.getLogger("prophet").setLevel(logging.WARNING)
+
+    history = pd.DataFrame({"ds": pd.to_datetime(dates), "y": counts})
+    warm = False
+    model = None
+    if init is not None:
+        try:
+            model = Prophet().fit(history, init=init)
+            warm = True
+        except Exception:
+            # Shapes change when the history grows (changepoints / seasonality) → cold fit
+            model = None
+    if model is None:
+        model = Prophet().fit(history)
+
+    future = pd.DataFrame({"ds": month_ends(history["ds"].iloc[0], len(history) + periods)})
+    forecast = model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+    forecast["Skill"] = skill
+    return skill, model_to_json(model), stan_init(model), forecast, warm
+
+
+def build_series(df_skill):
+    """Monthly series of one skill's [Date, Count] rows with missing months filled with 0."""
+    df_skill = df_skill.set_index("Date")["Count"]
+    months = pd.period_range(df_skill.index.min().to_period("M"), df_skill.index.max().to_period("M"), freq="M")
+    return df_skill.reindex(months.to_timestamp(how="end").normalize(), fill_value=0)
+
+
+def train_all(skill_counts, skills, registry, version, workers=None, periods=PERIODS_FUTURE, inits=None):
+    """
+    Fit every skill in a process pool; each model is written to ``registry`` as
+    soon as it is ready. Returns (forecasts DataFrame, stats).
+    """
+    inits = inits or {}
+    forecasts = []
+    stats = {"fitted": 0, "warm_started": 0, "skipped": 0, "failed": 0}
+
+    tasks = []
+    selected = skill_counts[skill_counts["Skill"].isin(skills)]
+    for skill, df_skill in selected.groupby("Skill"):
+        series = build_series(df_skill)
+        if len(series) < MIN_MONTHS_DATA:
+            stats["skipped"] += 1
+            continue
+        tasks.append((skill, series.index.strftime("%Y-%m-%d").tolist(), series.tolist()))
+
+    print(f"🚀 Training Prophet on {len(tasks)} skills with {workers or os.cpu_count()} workers...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fit_skill, skill, dates, counts, periods, inits.get(skill)): skill
+            for skill, dates, counts in tasks
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            skill = futures[future]
+            try:
+                skill, model_json, init, forecast, warm = future.result()
+            except Exception as e:
+                print(f"❌ Error for {skill}: {e}")
+                stats["failed"] += 1
+                continue
+            registry.add_serialized(skill, model_json, version, init)
+            forecasts.append(forecast)
+            stats["fitted"] += 1
+            stats["warm_started"] += int(warm)
+            if done % 50 == 0:
+                print(f"   {done}/{len(tasks)} skills done")
+
+    df_forecasts = pd.concat(forecasts, ignore_index=True) if forecasts else \
+        pd.DataFrame(columns=["ds", "yhat", "yhat_lower", "yhat_upper", "Skill"])
+    return df_forecasts, stats
+
+
+# -------------------- ARTIFACTS --------------------
+def atomic_copy(src, dst):
+    """Copy ``src`` over ``dst`` so readers never see a half-written file."""
+    dst = Path(dst)
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def start_version(version, versions_dir=VERSIONS_DIR):
+    """Staging folder of a new version and its (empty) model registry."""
+    staging = Path(versions_dir) / f".{version}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    return staging, ModelRegistry(staging / REGISTRY_SUBDIR)
+
+
+def finish_version(staging, registry, df_forecasts, manifest, versions_dir=VERSIONS_DIR):
+    """
+    Complete the staged version (registry manifest, forecasts, run manifest),
+    rename it to ``versions_dir/<version>/`` and point ``LATEST`` at it.
+    """
+    versions_dir = Path(versions_dir)
+    version = manifest["version"]
+    registry.save_manifest(version)
+    df_forecasts.to_csv(staging / FORECAST_FILE, index=False)
+    with open(staging / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    final = versions_dir / version
+    os.replace(staging, final)
+
+    latest_tmp = versions_dir / f".{LATEST_FILE}.tmp"
+    latest_tmp.write_text(version, encoding="utf-8")
+    os.replace(latest_tmp, versions_dir / LATEST_FILE)
+    return final
+
+
+def publish(version_dir, target_dir=FORECAST_DIR):
+    """Atomically replace the forecasts and the model registry read by the Streamlit pages."""
+    version_dir = Path(version_dir)
+    atomic_copy(version_dir / FORECAST_FILE, Path(target_dir) / FORECAST_FILE)
+    ModelRegistry(version_dir / REGISTRY_SUBDIR).publish_to(Path(target_dir) / REGISTRY_SUBDIR)
+
+
+# -------------------- CLI --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the per-skill Prophet models from MongoDB.")
+    parser.add_argument("--since", default="2022-01", help="First month kept (YYYY-MM), like the notebook filter.")
+    parser.add_argument("--skills", nargs="*", help="Explicit skills to train (default: frequent + strategic).")
+    parser.add_argument("--min-mentions", type=int, default=MIN_MENTIONS)
+    parser.add_argument("--periods", type=int, default=PERIODS_FUTURE, help="Months to forecast.")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores).")
+    parser.add_argument("--warm-start-from", default=str(REGISTRY_DIR),
+                        help="Model registry (or old prophet_models.pkl) used to warm-start the fits ('' to disable).")
+    parser.add_argument("--versions-dir", default=str(VERSIONS_DIR))
+    parser.add_argument("--no-publish", action="store_true",
+                        help="Only write the version folder, do not replace the files used by the app.")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+
+    print("📊 Aggregating skill x month counts...")
+    skill_counts = load_skill_counts(collection, since=args.since)
+    skills = args.skills or select_skills(skill_counts, args.min_mentions)
+    print(f"✅ {len(skill_counts)} (skill, month) rows, {len(skills)} skills selected.")
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    inits = load_previous_init(args.warm_start_from)
+    staging, registry = start_version(version, args.versions_dir)
+    df_forecasts, stats = train_all(skill_counts, skills, registry, version, args.workers, args.periods, inits)
+
+    manifest = {
+        "version": version,
+        "since": args.since,
+        "periods": args.periods,
+        "skills": registry.skills(),
+        "stats": stats,
+        "duration_s": round(time.time() - started, 1),
+    }
+    version_dir = finish_version(staging, registry, df_forecasts, manifest, args.versions_dir)
+    if not args.no_publish:
+        publish(version_dir)
+
+    print(f"🎉 Done in {manifest['duration_s']}s — version {version}: "
+          f"{stats['fitted']} fitted ({stats['warm_started']} warm-started), "
+          f"{stats['skipped']} skipped, {stats['failed']} failed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Lightweight latency / throughput instrumentation shared by the scrapers, the dashboard and the Prediction Center.
+
+    from skill_radar import metrics
+
+    with metrics.timer("scraper_ner", source="indeed"):
+        results = skill_ner(text)
+    metrics.incr("scraper_items", source="indeed")
+
+    @metrics.timed("dashboard_query", loader="get_top_skills")
+    def get_top_skills(): ...
+
+Environment variables:
+
+- ``SKILL_RADAR_METRICS``: ``prom`` (Prometheus text file, for node_exporter's
+  textfile collector) or ``jsonl`` (one JSON line per metric and flush). Unset = disabled.
+- ``SKILL_RADAR_METRICS_PATH``: output file (default ``metrics/skill_radar-{process}-{pid}.prom``
+  / ``metrics/skill_radar.jsonl``). ``{process}`` and ``{pid}`` are replaced, so concurrent
+  scrapers and dashboards each write their own Prometheus file.
+- ``SKILL_RADAR_METRICS_INTERVAL``: seconds between two flushes (default 10, plus one at exit).
+- ``SKILL_RADAR_PROFILE``: ``cprofile`` or ``pyinstrument`` to profile a single run
+  (see ``profile_from_env``); the report goes to ``metrics/profile-<name>-<time>-<pid>``.
+- ``SKILL_RADAR_PROCESS``: process name of the file names and of the ``process`` label
+  (default: the script name, e.g. ``streamlit`` or ``etl``).
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from skill_radar.config import REPO_ROOT
+
+# -------------------- CONFIGURATION --------------------
+EXPORT_FORMAT = os.getenv("SKILL_RADAR_METRICS", "").lower()
+EXPORT_PATH = os.getenv("SKILL_RADAR_METRICS_PATH") or str(
+    REPO_ROOT / "metrics" / ("skill_radar-{process}-{pid}.prom" if EXPORT_FORMAT == "prom" else "skill_radar.jsonl")
+)
+FLUSH_INTERVAL = float(os.getenv("SKILL_RADAR_METRICS_INTERVAL", "10"))
+PROFILE_MODE = os.getenv("SKILL_RADAR_PROFILE", "").lower()
+PREFIX = "skill_radar_"
+PROFILER_KEY = "_skill_radar_profiler"   # session state entry of the Streamlit pages
+
+_lock = threading.Lock()
+_timers = {}      # (name, labels) -> [count, sum, min, max]
+_counters = {}    # (name, labels) -> value
+_last_flush = time.monotonic()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _process_name():
+    if os.getenv("SKILL_RADAR_PROCESS"):
+        return os.getenv("SKILL_RADAR_PROCESS")
+    script = Path(sys.argv[0] if sys.argv and sys.argv[0] not in ("", "-c") else "python")
+    return script.parent.name if script.stem == "__main__" else script.stem   # python -m skill_radar.etl → etl
+
+
+PROCESS_NAME = _process_name()
+
+
+def export_path(path=None):
+    """Output file of this process (``{process}`` / ``{pid}`` replaced; the pid is read at each call, after forks)."""
+    return Path(str(path or EXPORT_PATH).format(process=PROCESS_NAME, pid=os.getpid()))
+
+
+# -------------------- RECORDING --------------------
+def observe(name, seconds, **labels):
+    """Record one duration for the timer ``name``."""
+    key = _key(name, labels)
+    with _lock:
+        stats = _timers.get(key)
+        if stats is None:
+            _timers[key] = [1, seconds, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = min(stats[2], seconds)
+            stats[3] = max(stats[3], seconds)
+    _maybe_flush()
+
+
+def incr(name, value=1, **labels):
+    """Increase the counter ``name``."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    _maybe_flush()
+
+
+@contextmanager
+def timer(name, **labels):
+    """Time the enclosed block (recorded even if it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def timed(name, **labels):
+    """Decorator version of ``timer``."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_iter(iterable, name, **labels):
+    """Yield from ``iterable``, timing only the time spent waiting for each item (e.g. paginated API reads)."""
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        observe(name, time.perf_counter() - start, **labels)
+        yield item
+
+
+def snapshot():
+    """Current values: {"timers": {...}, "counters": {...}} keyed by (name, labels)."""
+    with _lock:
+        return {"timers": {k: list(v) for k, v in _timers.items()}, "counters": dict(_counters)}
+
+
+# -------------------- EXPORT --------------------
+def _label_value(value):
+    """Backslash, double quote and line feed escaped, as the exposition format requires."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_label_value(v)}"' for k, v in labels) + "}"
+
+
+def to_prometheus(snap=None, **const_labels):
+    """
+    Prometheus text exposition format (summaries in seconds, counters as _total).
+    ``const_labels`` are added to every series (``flush`` adds ``process`` / ``pid``:
+    the textfile collector rejects the same series in two files).
+    """
+    snap = snap or snapshot()
+    if const_labels:
+        extra = tuple((k, str(v)) for k, v in const_labels.items())
+        snap = {kind: {(name, tuple(sorted(labels + extra))): value for (name, labels), value in values.items()}
+                for kind, values in snap.items()}
+    lines = []
+    for name in sorted({k[0] for k in snap["timers"]}):
+        metric = f"{PREFIX}{name}_seconds"
+        lines.append(f"# TYPE {metric} summary")
+        for (n, labels), (count, total, _, _) in sorted(snap["timers"].items()):
+            if n == name:
+                lines.append(f"{metric}_count{_labels_text(labels)} {count}")
+                lines.append(f"{metric}_sum{_labels_text(labels)} {total:.6f}")
+        lines.append(f"# TYPE {metric}_max gauge")
+        for (n, labels), (_, _, _, maximum) in sorted(snap["timers"].items()):
+            if n == name:
+                lines.append(f"{metric}_max{_labels_text(labels)} {maximum:.6f}")
+    for name in sorted({k[0] for k in snap["counters"]}):
+        metric = f"{PREFIX}{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for (n, labels), value in sorted(snap["counters"].items()):
+            if n == name:
+                lines.append(f"{metric}{_labels_text(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def to_json_lines(snap=None):
+    snap = snap or snapshot()
+    ts = time.time()
+    records = []
+    for (name, labels), (count, total, minimum, maximum) in snap["timers"].items():
+        records.append({"ts": ts, "type": "timer", "name": name, "labels": dict(labels), "count": count,
+                        "sum_s": round(total, 6), "min_s": round(minimum, 6), "max_s": round(maximum, 6),
+                        "avg_s": round(total / count, 6)})
+    for (name, labels), value in snap["counters"].items():
+        records.append({"ts": ts, "type": "counter", "name": name, "labels": dict(labels), "value": value})
+    return "".join(json.dumps(r) + "\n" for r in records)
+
+
+def flush(fmt=None, path=None):
+    """Write the metrics now (Prometheus file is replaced atomically, JSON lines are appended)."""
+    global _last_flush
+    fmt = fmt or EXPORT_FORMAT
+    if fmt not in ("prom", "jsonl"):
+        return
+    path = export_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _last_flush = time.monotonic()
+    if fmt == "prom":
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(to_prometheus(process=PROCESS_NAME, pid=os.getpid()), encoding="utf-8")
+        os.replace(tmp, path)
+    else:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(to_json_lines())
+
+
+def _maybe_flush():
+    if EXPORT_FORMAT and time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        try:
+            flush()
+        except OSError as e:
+            print(f"❌ Failed to write metrics: {e}")
+
+
+if EXPORT_FORMAT:
+    atexit.register(flush)
+
+
+# -------------------- PROFILING --------------------
+class _Profile:
+    """One cProfile / pyinstrument profiler that can be paused and resumed; each pause rewrites its report."""
+
+    def __init__(self, name):
+        self.name = name
+        out_dir = REPO_ROOT / "metrics"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        suffix = "prof" if PROFILE_MODE == "cprofile" else "html"
+        self.path = out_dir / f"profile-{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.{suffix}"
+        self.running = False
+        if PROFILE_MODE == "cprofile":
+            import cProfile
+            self.profiler = cProfile.Profile()
+        else:
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+        atexit.register(self.stop)
+        print(f"🧪 Profiling enabled ({PROFILE_MODE}) for {name}")
+
+    def resume(self):
+        if self.running:   # the previous rerun ended early (st.stop): close it first
+            self._pause()
+        if PROFILE_MODE == "cprofile":
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+        self.running = True
+
+    def _pause(self):
+        if PROFILE_MODE == "cprofile":
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+        self.running = False
+
+    def stop(self):
+        """Pause and write the report (the runs profiled so far); a no-op when paused."""
+        if not self.running:
+            return
+        self._pause()
+        if PROFILE_MODE == "cprofile":
+            self.profiler.dump_stats(self.path)
+        else:
+            self.path.write_text(self.profiler.output_html(), encoding="utf-8")
+        print(f"🧪 {PROFILE_MODE} report written to {self.path}")
+
+
+def profile_from_env(name, session=None):
+    """
+    Profile the rest of this run when ``SKILL_RADAR_PROFILE`` is set. Returns a
+    ``stop()`` function writing the report (also called at exit); a no-op otherwise.
+    Scripts call it once at the top. Streamlit pages pass ``st.session_state``:
+    the session keeps a single profiler per page, resumed on each rerun, and ``stop()`` at
+    the end of the script pauses it and rewrites the session's report. A rerun
+    cut short by ``st.stop()`` is closed when the next one starts, or at exit.
+    """
+    if PROFILE_MODE not in ("cprofile", "pyinstrument"):
+        return lambda: None
+    if session is None:
+        profile = _Profile(name)
+    else:
+        profile = session.get(PROFILER_KEY)
+        if profile is None or profile.name != name:   # first run, or another page of the session
+            if profile is not None:
+                profile.stop()
+            profile = session[PROFILER_KEY] = _Profile(name)
+    profile.resume()
+    return profile.stop
@@ -0,0 +1,221 @@
+"""
+Sharded, lazily loaded registry of the per-skill Prophet models.
+
+Layout of a registry folder::
+
+    manifest.json            {"version": ..., "models": {skill: {"file": ..., "init": {...}}}}
+    models/<skill>-<version>.json   one Prophet model (prophet.serialize.model_to_json)
+
+Opening a registry only reads the manifest. A model is deserialized the first
+time it is needed (on-demand re-forecasting) and kept in a small LRU, so memory
+and startup time do not grow with the number of tracked skills. Shard names
+contain the training version, so publishing a new version copies the new
+shards first and then swaps the manifest atomically. The shards of the
+previous version are kept, so a process still holding the previous manifest
+(a cached Streamlit resource) keeps working; one holding an older manifest
+reloads the current one when its shard is gone.
+
+    python -m skill_radar.model_registry migrate   # split an old prophet_models.pkl
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from skill_radar.config import FORECAST_DIR
+
+# -------------------- CONFIGURATION --------------------
+REGISTRY_DIR = FORECAST_DIR / "prophet_registry"
+LEGACY_MODELS_PATH = FORECAST_DIR / "prophet_models.pkl"
+MANIFEST_FILE = "manifest.json"
+MODELS_SUBDIR = "models"
+MAX_LOADED = 32
+
+
+def shard_name(skill, version):
+    """File-system safe and collision free shard name for a skill."""
+    slug = re.sub(r"[^a-z0-9]+", "_", skill.lower()).strip("_")[:40] or "skill"
+    digest = hashlib.sha1(skill.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}-{version}.json"
+
+
+def stan_init(model):
+    """Fitted parameters of a Prophet model, usable as ``init`` for the next fit."""
+    res = {}
+    for pname in ["k", "m", "sigma_obs"]:
+        res[pname] = float(model.params[pname][0][0])
+    for pname in ["delta", "beta"]:
+        res[pname] = model.params[pname][0].tolist()
+    return res
+
+
+def _read_manifest(root):
+    manifest_path = Path(root) / MANIFEST_FILE
+    if manifest_path.exists():
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    return {"version": None, "models": {}}
+
+
+def _write_atomic(path, text):
+    tmp = Path(path).with_name(f".{Path(path).name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    """Manifest + one serialized Prophet model per skill, loaded on demand."""
+
+    def __init__(self, root=REGISTRY_DIR, max_loaded=MAX_LOADED):
+        self.root = Path(root)
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self.manifest = _read_manifest(self.root)
+
+    def reload(self):
+        """Re-read the manifest (published by another process) and drop the loaded models."""
+        self.manifest = _read_manifest(self.root)
+        with self._lock:
+            self._loaded.clear()
+
+    # -------------------- READ --------------------
+    @property
+    def version(self):
+        return self.manifest["version"]
+
+    def skills(self):
+        return sorted(self.manifest["models"])
+
+    def __contains__(self, skill):
+        return skill in self.manifest["models"]
+
+    def __len__(self):
+        return len(self.manifest["models"])
+
+    def init_params(self, skill):
+        """Warm-start parameters stored in the manifest (no model deserialization)."""
+        entry = self.manifest["models"].get(skill)
+        return entry.get("init") if entry else None
+
+    def get(self, skill):
+        """Return the Prophet model of ``skill``, loading it lazily (LRU of ``max_loaded`` models)."""
+        with self._lock:
+            if skill in self._loaded:
+                self._loaded.move_to_end(skill)
+                return self._loaded[skill]
+        from prophet.serialize import model_from_json
+        try:
+            model = model_from_json(self._read_shard(skill))
+        except FileNotFoundError:
+            # Published twice since this manifest was read: its shards are gone, the current manifest is used
+            self.reload()
+            model = model_from_json(self._read_shard(skill))
+
+        with self._lock:
+            self._loaded[skill] = model
+            self._loaded.move_to_end(skill)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+        return model
+
+    def _read_shard(self, skill):
+        entry = self.manifest["models"].get(skill)
+        if entry is None:
+            raise KeyError(f"No Prophet model registered for '{skill}'")
+        return (self.root / MODELS_SUBDIR / entry["file"]).read_text(encoding="utf-8")
+
+    def forecast(self, skill, periods=12):
+        """Re-forecast ``skill`` with its model: history + ``periods`` future month ends."""
+        model = self.get(skill)
+        start = model.history["ds"].min()
+        months = pd.period_range(start.to_period("M"), periods=len(model.history) + periods, freq="M")
+        future = pd.DataFrame({"ds": months.to_timestamp(how="end").normalize()})
+        forecast = model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+        forecast["Skill"] = skill
+        return forecast
+
+    # -------------------- WRITE --------------------
+    def add_serialized(self, skill, model_json, version, init=None):
+        """Write one shard (model already serialized with ``model_to_json``)."""
+        models_dir = self.root / MODELS_SUBDIR
+        models_dir.mkdir(parents=True, exist_ok=True)
+        name = shard_name(skill, version)
+        _write_atomic(models_dir / name, model_json)
+        self.manifest["models"][skill] = {"file": name, "version": version, "init": init}
+        with self._lock:
+            self._loaded.pop(skill, None)
+
+    def add(self, skill, model, version):
+        from prophet.serialize import model_to_json
+        self.add_serialized(skill, model_to_json(model), version, stan_init(model))
+
+    def save_manifest(self, version=None):
+        self.root.mkdir(parents=True, exist_ok=True)
+        if version:
+            self.manifest["version"] = version
+        _write_atomic(self.root / MANIFEST_FILE, json.dumps(self.manifest, indent=1))
+
+    def publish_to(self, target=REGISTRY_DIR):
+        """
+        Copy this registry into ``target``: new shards first, then the manifest
+        (atomic swap), then the shards referenced neither by the new nor by the
+        previous manifest are removed.
+        """
+        target = Path(target)
+        previous = _read_manifest(target)
+        (target / MODELS_SUBDIR).mkdir(parents=True, exist_ok=True)
+        for entry in self.manifest["models"].values():
+            dst = target / MODELS_SUBDIR / entry["file"]
+            if not dst.exists():
+                tmp = dst.with_name(f".{dst.name}.tmp")
+                shutil.copyfile(self.root / MODELS_SUBDIR / entry["file"], tmp)
+                os.replace(tmp, dst)
+        _write_atomic(target / MANIFEST_FILE, json.dumps(self.manifest, indent=1))
+
+        referenced = {entry["file"] for manifest in (self.manifest, previous) for entry in manifest["models"].values()}
+        for shard in (target / MODELS_SUBDIR).glob("*.json"):
+            if shard.name not in referenced:
+                shard.unlink(missing_ok=True)
+
+
+# -------------------- MIGRATION --------------------
+def migrate_pickle(pkl_path=LEGACY_MODELS_PATH, root=REGISTRY_DIR, version="legacy"):
+    """Split a monolithic ``prophet_models.pkl`` into a sharded registry."""
+    with open(pkl_path, "rb") as f:
+        models = pickle.load(f)
+    registry = ModelRegistry(root)
+    for skill, model in models.items():
+        registry.add(skill, model, version)
+    registry.save_manifest(version)
+    print(f"✅ {len(models)} models migrated to {root}")
+    return registry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the sharded Prophet model registry.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Split prophet_models.pkl into one file per skill")
+    migrate.add_argument("--pickle", default=str(LEGACY_MODELS_PATH))
+    migrate.add_argument("--registry", default=str(REGISTRY_DIR))
+    sub.add_parser("list", help="List the registered skills").add_argument("--registry", default=str(REGISTRY_DIR))
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        migrate_pickle(args.pickle, args.registry)
+    else:
+        registry = ModelRegistry(args.registry)
+        print(f"📦 Version {registry.version}: {len(registry)} models")
+        for skill in registry.skills():
+            print(f"   {skill}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+TensorFlow-free inference for the skill recommender (skill_recommender.h5).
+
+The Keras model is a plain stack of Dense layers (Dropout is inactive at
+inference), so its weights are exported once to an ``.npz`` and the forward pass
+is reproduced with NumPy. The input is a sparse multi-hot row given as the
+indices of the known skills: the first layer is then a sum of a few weight rows
+instead of a full matrix product.
+
+    python -m skill_radar.numpy_recommender export
+    python -m skill_radar.numpy_recommender benchmark --skills python sql
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from skill_radar.config import RECOMMENDER_DIR
+from skill_radar.skill_featurizer import VOCABULARY_PATH, SkillFeaturizer
+
+# -------------------- PATHS --------------------
+KERAS_MODEL_PATH = RECOMMENDER_DIR / "skill_recommender.h5"
+MLB_PATH = RECOMMENDER_DIR / "skill_label_binarizer (1).pkl"
+WEIGHTS_PATH = RECOMMENDER_DIR / "skill_recommender_weights.npz"
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+    "tanh": np.tanh,
+    "softmax": _softmax,
+}
+
+
+# -------------------- EXPORT --------------------
+def export_weights(model_path=KERAS_MODEL_PATH, mlb_path=MLB_PATH, out_path=WEIGHTS_PATH):
+    """
+    Save the Dense kernels/biases/activations and the skill classes to an ``.npz``.
+    ``mlb_path`` is the pickled MultiLabelBinarizer or a ``skill_vocabulary.json``.
+    """
+    import joblib
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path)
+    if str(mlb_path).endswith(".json"):
+        classes = SkillFeaturizer.load(mlb_path).classes_
+    else:
+        classes = joblib.load(mlb_path).classes_
+
+    arrays, activations = {}, []
+    for layer in model.layers:
+        if not layer.get_weights():
+            continue  # Dropout / InputLayer
+        kernel, bias = layer.get_weights()
+        arrays[f"W{len(activations)}"] = kernel.astype(np.float32)
+        arrays[f"b{len(activations)}"] = bias.astype(np.float32)
+        activations.append(layer.get_config().get("activation", "linear"))
+
+    np.savez(out_path, activations=np.array(activations), classes=np.array(classes), **arrays)
+    print(f"✅ Exported {len(activations)} dense layers to {out_path}")
+    return out_path
+
+
+# -------------------- INFERENCE --------------------
+class NumpyRecommender:
+    """Pure-NumPy forward pass of the exported recommender."""
+
+    def __init__(self, weights_path=WEIGHTS_PATH):
+        data = np.load(weights_path, allow_pickle=False)
+        self.activations = [str(a) for a in data["activations"]]
+        self.weights = [(data[f"W{i}"], data[f"b{i}"]) for i in range(len(self.activations))]
+        self.classes_ = data["classes"].astype(str)
+        self.featurizer = SkillFeaturizer(self.classes_)
+
+    def indices(self, skills):
+        """Column indices of the known skills (unknown skills are ignored)."""
+        return self.featurizer.indices(skills)
+
+    def predict_indices(self, rows):
+        """Scores for a batch of sparse rows, each given as an array of active indices."""
+        W0, b0 = self.weights[0]
+        h = np.stack([W0[idx].sum(axis=0) for idx in rows]) + b0
+        h = ACTIVATIONS[self.activations[0]](h)
+        for (W, b), act in zip(self.weights[1:], self.activations[1:]):
+            h = ACTIVATIONS[act](h @ W + b)
+        return h
+
+    def predict_dense(self, X):
+        """Scores for a dense multi-hot matrix (same input as ``model.predict``)."""
+        h = np.asarray(X, dtype=np.float32)
+        for (W, b), act in zip(self.weights, self.activations):
+            h = ACTIVATIONS[act](h @ W + b)
+        return h
+
+    def recommend(self, input_skills, top_k=5):
+        """Same output as ``recommend_skills`` in the page: top_k unknown skills."""
+        return self.recommend_batch([input_skills], [top_k])[0]
+
+    def recommend_batch(self, skill_lists, top_ks):
+        """Recommendations for several profiles with a single forward pass."""
+        rows = self.featurizer.rows(skill_lists)
+        preds = self.predict_indices(rows)
+        results = []
+        for p, idx, top_k in zip(preds, rows, top_ks):
+            p[idx] = 0
+            top_indices = np.argpartition(-p, top_k)[:top_k] if top_k < len(p) else np.arange(len(p))
+            top_indices = top_indices[np.argsort(-p[top_indices])]
+            results.append(self.classes_[top_indices].tolist())
+        return results
+
+
+# -------------------- BENCHMARK --------------------
+def _timeit(fn, repeat):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def benchmark(skills, repeat=200, weights_path=WEIGHTS_PATH, model_path=KERAS_MODEL_PATH):
+    """Compare load time, per-call latency and memory of Keras vs NumPy on one row."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    reco = NumpyRecommender(weights_path)
+    numpy_load = time.perf_counter() - start
+    numpy_mem = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    idx = reco.indices(skills)
+    x = np.zeros((1, len(reco.classes_)), dtype=np.float32)
+    x[0, idx] = 1
+    numpy_ms = _timeit(lambda: reco.predict_indices([idx]), repeat)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    from tensorflow.keras.models import load_model
+    model = load_model(model_path)
+    keras_load = time.perf_counter() - start
+    keras_mem = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    keras_ms = _timeit(lambda: model.predict(x, verbose=0), max(repeat // 10, 10))
+
+    diff = np.abs(model.predict(x, verbose=0) - reco.predict_indices([idx])).max()
+    print(f"🧪 Max |keras - numpy| = {diff:.2e} ({'OK' if diff < 1e-4 else 'MISMATCH'})")
+    print(f"{'':10s}{'load (s)':>12s}{'predict (ms)':>15s}{'py alloc (MB)':>18s}")
+    print(f"{'keras':10s}{keras_load:12.2f}{keras_ms:15.3f}{keras_mem / 1e6:18.1f}")
+    print(f"{'numpy':10s}{numpy_load:12.2f}{numpy_ms:15.3f}{numpy_mem / 1e6:18.1f}")
+    return diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export / benchmark the NumPy skill recommender.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("export", help="Export skill_recommender.h5 weights to .npz")
+    bench = sub.add_parser("benchmark", help="Compare Keras and NumPy inference")
+    bench.add_argument("--skills", nargs="+", default=["python", "sql"])
+    bench.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export_weights(mlb_path=VOCABULARY_PATH if VOCABULARY_PATH.exists() else MLB_PATH)
+    else:
+        benchmark(args.skills, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Posting search (Search page of the dashboard): text + skill / country / date
+filters over ``job_offers``, with keyset pagination.
+
+Descriptions are kept compressed out of the collection
+(``skill_radar.description_store``). A text search therefore runs on two text
+indexes: the words of the stored descriptions give up to
+``MAX_DESCRIPTION_MATCHES`` description hashes (best text score first), and a
+posting matches when its title / skills / inline description (not migrated
+yet) match or its ``DescriptionHash`` is one of them.
+
+Two derived, indexed fields make the filters and the sort index-friendly:
+
+    PostedAt   BSON date parsed from ``Date`` ('dd-mm-yyyy' strings do not sort)
+    SkillTags  normalized skill list of ``Skills`` (multikey index, exact matches)
+
+They are written with the postings (scrapers, ``SkillEtraction.py``, ETL) and
+backfilled server-side by this module. Results are sorted newest first on
+``(PostedAt, _id)``; each page is requested with the key of the last row of the
+previous page instead of ``skip``, so page 1 000 costs the same index seek as
+page 1. Only the fields shown in the result table are projected; the
+description is fetched on demand, for one posting, from the description store.
+
+    python -m skill_radar.posting_search             # indexes + fields of the postings that miss them
+    python -m skill_radar.posting_search --rebuild   # recompute the fields everywhere
+
+    rows, key = search(collection, text="rag pipeline", skills=["langchain"], country="Germany")
+    rows, key = search(collection, ..., after=key)   # next page
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, MongoClient, TEXT
+
+from skill_radar import metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, DESCRIPTIONS_COLLECTION, MONGO_URI
+from skill_radar.countries import COUNTRY_FIELD
+from skill_radar.dedup import DISTINCT
+from skill_radar.description_store import HASH_FIELD, description_of
+from skill_radar.description_store import ensure_indexes as ensure_description_indexes
+from skill_radar.skill_featurizer import parse_skills
+
+# -------------------- CONFIGURATION --------------------
+POSTED_FIELD = "PostedAt"
+SKILLS_FIELD = "SkillTags"
+PAGE_SIZE = 25
+RESULT_FIELDS = ["Job Title", "Company", "Location", COUNTRY_FIELD, "Date", "Salary", "Skills", "URL", POSTED_FIELD]
+SORT = [(POSTED_FIELD, DESCENDING), ("_id", DESCENDING)]
+TEXT_INDEX = "posting_text"
+TEXT_WEIGHTS = {"Job Title": 10, SKILLS_FIELD: 5, "Description": 1}
+MAX_DESCRIPTION_MATCHES = 50_000   # description hashes of one text search (keeps the $in below 4 MB)
+
+# Server-side versions of ``posted_at`` / ``skill_tags`` (backfill, ETL pipelines)
+POSTED_AT_EXPRESSION = {"$ifNull": [
+    {"$dateFromString": {"dateString": "$Date", "format": "%d-%m-%Y", "onError": None, "onNull": None}},
+    {"$dateFromString": {"dateString": "$Date", "onError": None, "onNull": None}},   # ISO dates (LinkedIn)
+]}
+SKILL_TAGS_EXPRESSION = {"$filter": {
+    "input": {"$setUnion": [{"$map": {
+        "input": {"$split": [{"$ifNull": ["$Skills", ""]}, ","]},
+        "in": {"$toLower": {"$trim": {"input": "$$this"}}},
+    }}, []]},
+    "cond": {"$ne": ["$$this", ""]},
+}}
+
+
+# -------------------- FIELDS --------------------
+def posted_at(date):
+    """Posting date as a datetime ('dd-mm-yyyy' or ISO string), None when unparseable."""
+    if isinstance(date, datetime):
+        return date
+    if not isinstance(date, str) or not date.strip():
+        return None
+    for parse in (lambda d: datetime.strptime(d, "%d-%m-%Y"), datetime.fromisoformat):
+        try:
+            return parse(date.strip()).replace(tzinfo=None)
+        except ValueError:
+            continue
+    return None
+
+
+def skill_tags(skills):
+    """Normalized skills of a ``Skills`` value (comma split, strip, lower-case)."""
+    return sorted(parse_skills(skills))
+
+
+def search_fields(doc):
+    """``{PostedAt, SkillTags}`` of a posting, to ``$set`` with it."""
+    return {POSTED_FIELD: posted_at(doc.get("Date")), SKILLS_FIELD: skill_tags(doc.get("Skills"))}
+
+
+def ensure_indexes(collection):
+    """
+    Text indexes (title / skills / inline description, words of the stored
+    descriptions) and one (filter, PostedAt, _id) index per filter.
+    """
+    existing = collection.index_information().get(TEXT_INDEX)
+    if existing is not None and existing.get("weights") != TEXT_WEIGHTS:
+        collection.drop_index(TEXT_INDEX)   # older title / description index
+    collection.create_index([(field, TEXT) for field in TEXT_WEIGHTS], name=TEXT_INDEX, weights=TEXT_WEIGHTS)
+    collection.create_index(HASH_FIELD)   # the $text clause shares an $or with it: it must be indexed
+    ensure_description_indexes(collection.database[DESCRIPTIONS_COLLECTION])
+    collection.create_index(SORT)
+    collection.create_index([(SKILLS_FIELD, ASCENDING)] + SORT)
+    collection.create_index([(COUNTRY_FIELD, ASCENDING)] + SORT)
+
+
+def backfill(collection=None, rebuild=False):
+    """Compute ``PostedAt`` / ``SkillTags`` in MongoDB (one pipeline update); returns the number of postings updated."""
+    collection = collection if collection is not None else MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    ensure_indexes(collection)
+    query = {} if rebuild else {"$or": [{POSTED_FIELD: {"$exists": False}}, {SKILLS_FIELD: {"$exists": False}}]}
+    with metrics.timer("search_backfill"):
+        result = collection.update_many(query, [{"$set": {POSTED_FIELD: POSTED_AT_EXPRESSION,
+                                                          SKILLS_FIELD: SKILL_TAGS_EXPRESSION}}])
+    print(f"✅ Search fields written on {result.modified_count} postings")
+    metrics.flush()
+    return result.modified_count
+
+
+# -------------------- SEARCH --------------------
+def _after(key):
+    """Filter of the rows that come after ``key = (PostedAt, _id)`` in the ``SORT`` order."""
+    posted, _id = key
+    # _ids of the ETL are strings, the scrapers' are ObjectIds: strings sort below ObjectIds
+    before_id = {"_id": {"$lt": _id}}
+    if isinstance(_id, ObjectId):
+        before_id = {"$or": [before_id, {"_id": {"$type": "string"}}]}
+    if posted is None:   # undated postings come last
+        return {"$and": [{POSTED_FIELD: None}, before_id]}
+    return {"$or": [
+        {POSTED_FIELD: {"$lt": posted}},
+        {POSTED_FIELD: None},
+        {"$and": [{POSTED_FIELD: posted}, before_id]},
+    ]}
+
+
+def description_matches(store, text, limit=MAX_DESCRIPTION_MATCHES):
+    """Hashes of the stored descriptions matching ``text``, best text score first."""
+    score = {"score": {"$meta": "textScore"}}
+    with metrics.timer("search_descriptions"):
+        cursor = store.find({"$text": {"$search": text}}, {"_id": 1, **score}).sort([("score", {"$meta": "textScore"})])
+        return [doc["_id"] for doc in cursor.limit(limit)]
+
+
+def build_query(text=None, skills=(), country=None, start=None, end=None, include_duplicates=False,
+                description_hashes=()):
+    """
+    MongoDB filter of a search (every skill must be present; ``end`` is inclusive).
+    ``description_hashes``: stored descriptions matching ``text`` (``description_matches``).
+    """
+    clauses = [] if include_duplicates else [DISTINCT]
+    if text and text.strip():
+        text_clause = {"$text": {"$search": text.strip()}}
+        if description_hashes:
+            text_clause = {"$or": [text_clause, {HASH_FIELD: {"$in": list(description_hashes)}}]}
+        clauses.append(text_clause)
+    tags = skill_tags(list(skills))
+    if tags:
+        clauses.append({SKILLS_FIELD: {"$all": tags}})
+    if country:
+        clauses.append({COUNTRY_FIELD: country})
+    dates = {}
+    if start:
+        dates["$gte"] = datetime.combine(start, datetime.min.time())
+    if end:
+        dates["$lt"] = datetime.combine(end, datetime.min.time()) + timedelta(days=1)
+    if dates:
+        clauses.append({POSTED_FIELD: dates})
+    return {"$and": clauses} if clauses else {}
+
+
+def search(collection, text=None, skills=(), country=None, start=None, end=None, after=None,
+           page_size=PAGE_SIZE, include_duplicates=False, description_hashes=None):
+    """
+    One page of postings, newest first: ``(rows, next_key)``. ``next_key`` is
+    None on the last page, otherwise it is passed back as ``after``.
+    ``description_hashes`` (``description_matches`` of ``text``) can be kept
+    by the caller between the pages of the same search.
+    """
+    hashes = description_hashes or ()
+    if description_hashes is None and text and text.strip():
+        hashes = description_matches(collection.database[DESCRIPTIONS_COLLECTION], text.strip())
+    query = build_query(text, skills, country, start, end, include_duplicates, hashes)
+    if after is not None:
+        query = {"$and": [query, _after(after)]}
+    projection = {field: 1 for field in RESULT_FIELDS}
+    with metrics.timer("search_page", text=bool(text)):
+        rows = list(collection.find(query, projection).sort(SORT).limit(page_size + 1))
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, (rows[-1].get(POSTED_FIELD), rows[-1]["_id"])
+
+
+def description(collection, _id):
+    """Description of one posting (not part of the result pages)."""
+    doc = collection.find_one({"_id": _id}, {"Description": 1, HASH_FIELD: 1})
+    return description_of(doc, collection.database[DESCRIPTIONS_COLLECTION]) if doc else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indexes and derived fields of the posting search.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute PostedAt / SkillTags on every posting")
+    args = parser.parse_args(argv)
+    backfill(rebuild=args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
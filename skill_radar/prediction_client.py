@@ -0,0 +1,51 @@
+"""
+Client for the local prediction service (``skill_radar.prediction_service``).
+
+Exposes the same methods as ``Predictor`` so the Streamlit page and internal
+tools can switch between local models and the shared service.
+"""
+import json
+import os
+import urllib.request
+
+import pandas as pd
+
+SERVICE_URL_ENV = "PREDICTION_SERVICE_URL"
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+
+class PredictionClient:
+    def __init__(self, base_url=None, timeout=30):
+        self.base_url = (base_url or os.getenv(SERVICE_URL_ENV, "http://127.0.0.1:8765")).rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=data, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def metadata(self):
+        return self._call("/metadata")
+
+    def recommend_batch(self, requests):
+        return [self._call("/recommend", {"skills": list(skills), "top_k": top_k})["skills"]
+                for skills, top_k in requests]
+
+    def estimate_batch(self, profiles):
+        profiles = [[title, list(skills) if not isinstance(skills, str) else skills] for title, skills in profiles]
+        return self._call("/estimate", {"profiles": profiles})["salaries"]
+
+    def recommend(self, skills, top_k=5):
+        return self._call("/recommend", {"skills": list(skills), "top_k": top_k})["skills"]
+
+    def estimate(self, title, skills):
+        return self._call("/estimate", {"title": title, "skills": list(skills)})["salary"]
+
+    def forecast(self, skill, start=None, end=None):
+        result = self._call("/forecast", {"skill": skill, "start": start, "end": end})["forecast"]
+        df = pd.DataFrame(result, columns=FORECAST_COLUMNS)   # same columns when the window is empty
+        df["ds"] = pd.to_datetime(df["ds"])
+        return df
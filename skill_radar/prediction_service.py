@@ -0,0 +1,239 @@
+"""
+Local HTTP prediction service for the recommender, the salary model and the forecasts.
+
+The models are loaded once per host instead of once per Streamlit session.
+Concurrent requests are queued and grouped into micro-batches (up to
+``--max-batch`` items, waiting at most ``--max-wait-ms`` after the first one),
+so each model call scores many rows instead of one.
+
+    python -m skill_radar.prediction_service --port 8765
+
+Endpoints (JSON):
+    GET  /health
+    GET  /metadata                         → skills, job titles, salary skills, forecast skills
+    POST /recommend {"skills": [...], "top_k": 5}
+    POST /estimate  {"title": "...", "skills": [...]}  or  {"profiles": [[title, skills], ...]}
+    POST /forecast  {"skill": "python", "start": "2024-01", "end": "2025-06"}
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import pandas as pd
+
+from skill_radar import metrics
+from skill_radar.config import FORECAST_DIR, SALARY_DIR
+from skill_radar.numpy_recommender import WEIGHTS_PATH, NumpyRecommender
+from skill_radar.salary_features import SalaryFeaturizer, estimate_profiles
+
+# -------------------- CONFIGURATION --------------------
+DEFAULT_PORT = 8765
+MAX_BATCH = 256
+MAX_WAIT_MS = 5
+SALARY_MODEL_PATH = SALARY_DIR / "final_deep_learning_model.h5"
+SALARY_SCALER_PATH = SALARY_DIR / "feature_scaler (1).pkl"
+FORECAST_CSV_PATH = FORECAST_DIR / "forecast_all_skills.csv"
+
+
+# -------------------- MODELS --------------------
+class Predictor:
+    """
+    All prediction models, with batch-first methods. Used by the service and by
+    the page in local mode, which passes ``forecast_csv_path=None``: it slices
+    its shared forecast frame instead of holding a copy per process.
+    """
+
+    def __init__(self, recommender_weights=WEIGHTS_PATH, salary_model_path=SALARY_MODEL_PATH,
+                 salary_scaler_path=SALARY_SCALER_PATH, forecast_csv_path=FORECAST_CSV_PATH):
+        import tensorflow as tf
+
+        self.recommender = NumpyRecommender(recommender_weights)
+        self.salary_model = tf.keras.models.load_model(salary_model_path)
+        self.salary_featurizer = SalaryFeaturizer(joblib.load(salary_scaler_path))
+        self.forecasts = {}
+        if forecast_csv_path:
+            df = pd.read_csv(forecast_csv_path)
+            df["ds"] = pd.to_datetime(df["ds"])
+            self.forecasts = {skill: frame.drop(columns="Skill") for skill, frame in df.groupby("Skill")}
+
+    def metadata(self):
+        return {
+            "skills": sorted(self.recommender.classes_.tolist()),
+            "job_titles": self.salary_featurizer.job_titles,
+            "salary_skills": self.salary_featurizer.skill_names,
+            "forecast_skills": sorted(self.forecasts),
+        }
+
+    def recommend_batch(self, requests):
+        """``requests``: list of (skills, top_k)."""
+        skill_lists, top_ks = zip(*requests)
+        return self.recommender.recommend_batch(skill_lists, top_ks)
+
+    def estimate_batch(self, profiles):
+        """``profiles``: list of (title, skills)."""
+        return estimate_profiles(self.salary_model, self.salary_featurizer, profiles).tolist()
+
+    def recommend(self, skills, top_k=5):
+        return self.recommend_batch([(skills, top_k)])[0]
+
+    def estimate(self, title, skills):
+        return self.estimate_batch([(title, skills)])[0]
+
+    def forecast(self, skill, start=None, end=None):
+        df = self.forecasts.get(skill)
+        if df is None:
+            return None
+        if start:
+            df = df[df["ds"] >= pd.Timestamp(start)]
+        if end:
+            df = df[df["ds"] <= pd.Timestamp(end)]
+        return df
+
+
+# -------------------- MICRO-BATCHING --------------------
+class MicroBatcher:
+    """
+    Groups items submitted from many threads into batches for ``batch_fn``
+    (a function mapping a list of items to the list of their results).
+    """
+
+    def __init__(self, batch_fn, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.items = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, item):
+        future = Future()
+        self.queue.put((item, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            items, futures = zip(*batch)
+            name = getattr(self.batch_fn, "__name__", "batch")
+            metrics.incr("service_items", len(batch), fn=name)
+            try:
+                with metrics.timer("service_batch", fn=name):
+                    results = self.batch_fn(list(items))
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            self.batches += 1
+            self.items += len(batch)
+
+
+# -------------------- HTTP --------------------
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256   # the default (5) resets connections under concurrent load
+
+
+def make_handler(predictor, recommend_batcher, estimate_batcher):
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep the console quiet under load
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {
+                    "status": "ok",
+                    "recommend": {"batches": recommend_batcher.batches, "items": recommend_batcher.items},
+                    "estimate": {"batches": estimate_batcher.batches, "items": estimate_batcher.items},
+                })
+            elif self.path == "/metadata":
+                self._send(200, predictor.metadata())
+            else:
+                self._send(404, {"error": f"unknown endpoint {self.path}"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/recommend":
+                    skills = payload["skills"]
+                    top_k = int(payload.get("top_k", 5))
+                    result = recommend_batcher.submit((skills, top_k)).result()
+                    self._send(200, {"skills": result})
+                elif self.path == "/estimate":
+                    if "profiles" in payload:
+                        # Through the batcher too: its thread is the only one calling the salary model
+                        futures = [estimate_batcher.submit(tuple(p)) for p in payload["profiles"]]
+                        salaries = [future.result() for future in futures]
+                        self._send(200, {"salaries": salaries})
+                    else:
+                        salary = estimate_batcher.submit((payload["title"], payload["skills"])).result()
+                        self._send(200, {"salary": salary})
+                elif self.path == "/forecast":
+                    df = predictor.forecast(payload["skill"], payload.get("start"), payload.get("end"))
+                    if df is None:
+                        self._send(404, {"error": f"no forecast for {payload['skill']}"})
+                    else:
+                        df = df.assign(ds=df["ds"].dt.strftime("%Y-%m-%d"))
+                        self._send(200, {"forecast": df.to_dict(orient="records")})
+                else:
+                    self._send(404, {"error": f"unknown endpoint {self.path}"})
+            except (KeyError, ValueError) as e:
+                self._send(400, {"error": f"bad request: {e}"})
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+
+    return Handler
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, predictor=None):
+    print("🚀 Loading models...")
+    predictor = predictor or Predictor()
+    recommend_batcher = MicroBatcher(predictor.recommend_batch, max_batch, max_wait_ms)
+    estimate_batcher = MicroBatcher(predictor.estimate_batch, max_batch, max_wait_ms)
+    server = PredictionServer((host, port), make_handler(predictor, recommend_batcher, estimate_batcher))
+    print(f"✅ Prediction service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stopping prediction service.")
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Skill Radar prediction models over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.max_batch, args.max_wait_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Streaming training pipeline for the skill recommender (skill_recommender.h5).
+
+The training pairs are (posting with some skills hidden, full posting). The
+postings stay a sparse CSR matrix for the whole run; masking is vectorized
+over the non-zeros of a mini-batch (one random key per skill, the smallest
+``hide_fraction`` of each row are hidden) and only that mini-batch is made
+dense. Memory is bounded by the CSR matrix plus one batch, so the model can be
+retrained on the whole MongoDB collection. A new mask is drawn every epoch.
+
+    python -m skill_radar.recommender_training --epochs 100 --batch-size 512
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from pymongo import MongoClient
+
+from skill_radar.config import COLLECTION_NAME, DB_NAME, MONGO_URI
+from skill_radar.dedup import DISTINCT
+from skill_radar.numpy_recommender import KERAS_MODEL_PATH, WEIGHTS_PATH, export_weights
+from skill_radar.skill_featurizer import VOCABULARY_PATH, SkillFeaturizer, skill_frequencies
+
+# -------------------- CONFIGURATION --------------------
+HIDE_FRACTION = 0.3
+BATCH_SIZE = 512
+EPOCHS = 100
+VALIDATION_SPLIT = 0.1
+CHUNK_SIZE = 100_000
+
+
+# -------------------- MASKING --------------------
+def mask_skills(X, hide_fraction=HIDE_FRACTION, rng=None):
+    """
+    Copy of the binary CSR ``X`` with ``int(n * hide_fraction)`` random skills
+    removed from each row of ``n`` skills (same rule as ``generate_input_output``).
+    """
+    rng = rng or np.random.default_rng()
+    X = sp.csr_matrix(X)
+    counts = np.diff(X.indptr)
+    row_of = np.repeat(np.arange(X.shape[0]), counts)
+    order = np.lexsort((rng.random(X.nnz), row_of))           # shuffle inside each row
+    rank = np.empty(X.nnz, dtype=np.int64)
+    rank[order] = np.arange(X.nnz) - X.indptr[row_of[order]]  # position after shuffling
+    keep = rank >= (counts * hide_fraction).astype(np.int64)[row_of]
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(row_of[keep], minlength=X.shape[0]))])
+    return sp.csr_matrix((X.data[keep], X.indices[keep], indptr), shape=X.shape)
+
+
+# -------------------- STREAMING --------------------
+def batch_generator(X, batch_size=BATCH_SIZE, hide_fraction=HIDE_FRACTION, shuffle=True, seed=42, epochs=None):
+    """
+    Yield dense float32 ``(masked, full)`` mini-batches from the CSR ``X``.
+    ``epochs=None`` loops forever (Keras stops after ``steps_per_epoch``).
+    """
+    rng = np.random.default_rng(seed)
+    X = sp.csr_matrix(X, dtype=np.float32)
+    epoch = 0
+    while epochs is None or epoch < epochs:
+        rows = rng.permutation(X.shape[0]) if shuffle else np.arange(X.shape[0])
+        for start in range(0, len(rows), batch_size):
+            y = X[rows[start:start + batch_size]]
+            x = mask_skills(y, hide_fraction, rng)
+            yield x.toarray(), y.toarray()
+        epoch += 1
+
+
+def make_dataset(X, batch_size=BATCH_SIZE, hide_fraction=HIDE_FRACTION, shuffle=True, seed=42):
+    """``tf.data.Dataset`` over ``batch_generator`` (prefetched, repeated)."""
+    import tensorflow as tf
+
+    n_skills = X.shape[1]
+    spec = tf.TensorSpec(shape=(None, n_skills), dtype=tf.float32)
+    dataset = tf.data.Dataset.from_generator(
+        lambda: batch_generator(X, batch_size, hide_fraction, shuffle, seed),
+        output_signature=(spec, spec),
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def steps_for(X, batch_size=BATCH_SIZE):
+    return int(np.ceil(X.shape[0] / batch_size))
+
+
+def train_val_split(X, validation_split=VALIDATION_SPLIT, seed=42):
+    """Random row split of a CSR matrix."""
+    rows = np.random.default_rng(seed).permutation(X.shape[0])
+    n_val = int(len(rows) * validation_split)
+    return X[np.sort(rows[n_val:])], X[np.sort(rows[:n_val])]
+
+
+# -------------------- DATA --------------------
+def load_postings_matrix(featurizer=None, min_count=1, chunk_size=CHUNK_SIZE):
+    """
+    Postings x skills CSR matrix of the whole collection, encoded chunk by chunk.
+    Without ``featurizer`` a vocabulary is fitted on the collection first.
+    """
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    query = {**DISTINCT, "Skills": {"$nin": [None, ""]}}
+
+    def chunks():
+        cursor = collection.find(query, {"_id": 0, "Skills": 1}, batch_size=chunk_size)
+        batch = []
+        for doc in cursor:
+            batch.append(doc["Skills"])
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    if featurizer is None:
+        # Vocabulary = skills seen in at least ``min_count`` postings (first pass, counts only)
+        counts = pd.Series(dtype=np.int64)
+        for batch in chunks():
+            counts = counts.add(skill_frequencies(batch), fill_value=0)
+        featurizer = SkillFeaturizer(sorted(counts.index[counts >= min_count]))
+        print(f"📚 Vocabulary: {len(featurizer)} skills")
+
+    blocks = [featurizer.transform(batch) for batch in chunks()]
+    X = sp.vstack(blocks, format="csr") if blocks else sp.csr_matrix((0, len(featurizer)), dtype=np.float32)
+    X = X[X.getnnz(axis=1) > 0]
+    print(f"✅ {X.shape[0]} postings x {X.shape[1]} skills ({X.nnz} non-zeros)")
+    return featurizer, X
+
+
+# -------------------- TRAINING --------------------
+def build_model(n_skills):
+    """Same architecture as the notebook."""
+    from tensorflow.keras.layers import Dense, Dropout
+    from tensorflow.keras.models import Sequential
+
+    model = Sequential([
+        Dense(512, input_shape=(n_skills,), activation="relu"),
+        Dropout(0.3),
+        Dense(256, activation="relu"),
+        Dropout(0.3),
+        Dense(n_skills, activation="sigmoid"),
+    ])
+    model.compile(loss="binary_crossentropy", optimizer="adam", metrics=["accuracy"])
+    return model
+
+
+def train(X, epochs=EPOCHS, batch_size=BATCH_SIZE, hide_fraction=HIDE_FRACTION,
+          validation_split=VALIDATION_SPLIT, seed=42):
+    X_train, X_val = train_val_split(X, validation_split, seed)
+    model = build_model(X.shape[1])
+    fit_kwargs = {}
+    if X_val.shape[0]:
+        fit_kwargs = {
+            "validation_data": make_dataset(X_val, batch_size, hide_fraction, shuffle=False, seed=seed + 1),
+            "validation_steps": steps_for(X_val, batch_size),
+        }
+    model.fit(
+        make_dataset(X_train, batch_size, hide_fraction, seed=seed),
+        steps_per_epoch=steps_for(X_train, batch_size),
+        epochs=epochs,
+        **fit_kwargs,
+    )
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the skill recommender on the whole collection.")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--hide-fraction", type=float, default=HIDE_FRACTION)
+    parser.add_argument("--min-count", type=int, default=1, help="Minimum postings per skill in a new vocabulary")
+    parser.add_argument("--keep-vocabulary", action="store_true",
+                        help="Reuse skill_vocabulary.json instead of fitting a new one")
+    parser.add_argument("--output", default=str(KERAS_MODEL_PATH))
+    args = parser.parse_args(argv)
+
+    featurizer = SkillFeaturizer.load(VOCABULARY_PATH) if args.keep_vocabulary else None
+    featurizer, X = load_postings_matrix(featurizer, args.min_count)
+    model = train(X, args.epochs, args.batch_size, args.hide_fraction)
+
+    model.save(args.output)
+    featurizer.save(VOCABULARY_PATH)
+    export_weights(args.output, VOCABULARY_PATH, WEIGHTS_PATH)
+    print(f"🎉 Recommender saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Sparse feature builder for the salary model and vectorized batch estimation.
+
+The scaler was fitted on one-hot ``jobtitle_*`` / ``skill_*`` columns, so a
+profile is just a handful of active column indices. Because the features are
+binary, ``StandardScaler.transform`` reduces to a constant row (``-mean/scale``)
+plus ``1/scale`` at the active columns: a profile costs a few index writes
+instead of a full-width DataFrame.
+
+Skills are encoded by ``SkillFeaturizer`` (the same tokenization as the
+recommenders), then shifted to the scaler's ``skill_*`` columns.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from skill_radar.skill_featurizer import SkillFeaturizer
+
+TITLE_PREFIX = "jobtitle_"
+SKILL_PREFIX = "skill_"
+CHUNK_SIZE = 4096
+
+
+class SalaryFeaturizer:
+    """Maps (job title, skills) to the scaler's column indices."""
+
+    def __init__(self, scaler):
+        self.feature_names = list(scaler.feature_names_in_)
+        self.n_features = len(self.feature_names)
+        self.titles, self.skills = {}, {}
+        for i, name in enumerate(self.feature_names):
+            if name.startswith(TITLE_PREFIX):
+                self.titles[name[len(TITLE_PREFIX):]] = i
+            elif name.startswith(SKILL_PREFIX):
+                self.skills[name[len(SKILL_PREFIX):]] = i
+        self._titles_lower = {t.lower().strip(): i for t, i in self.titles.items()}
+        # Skill vocabulary column j → scaler column skill_columns[j]
+        self.skill_featurizer = SkillFeaturizer(self.skills)
+        self.skill_columns = np.array([self.skills[s] for s in self.skill_featurizer.classes_], dtype=np.int64)
+
+        mean = getattr(scaler, "mean_", None)
+        scale = getattr(scaler, "scale_", None)
+        mean = np.zeros(self.n_features) if mean is None else mean
+        scale = np.ones(self.n_features) if scale is None else scale
+        self.inv_scale = (1 / scale).astype(np.float32)
+        self.base = (-mean / scale).astype(np.float32)
+
+    @property
+    def job_titles(self):
+        return sorted(self.titles)
+
+    @property
+    def skill_names(self):
+        return sorted(self.skills)
+
+    def title_column(self, title):
+        """Scaler column of a job title (-1 if unknown)."""
+        col = self.titles.get(title)
+        if col is None and isinstance(title, str):
+            col = self._titles_lower.get(title.lower().strip())
+        return -1 if col is None else col
+
+    def indices(self, title, skills):
+        """Active column indices of one profile (unknown title / skills are ignored)."""
+        return self.transform([(title, skills)]).indices.tolist()
+
+    def transform(self, profiles):
+        """Sparse one-hot CSR matrix for an iterable of (title, skills)."""
+        profiles = list(profiles)
+        titles = [title for title, _ in profiles]
+        X_skills = self.skill_featurizer.transform([skills for _, skills in profiles]).tocoo()
+        title_cols = np.fromiter((self.title_column(t) for t in titles), dtype=np.int64, count=len(titles))
+        has_title = title_cols >= 0
+        rows = np.concatenate([X_skills.row, np.flatnonzero(has_title)])
+        cols = np.concatenate([self.skill_columns[X_skills.col], title_cols[has_title]])
+        X = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                          shape=(len(profiles), self.n_features))
+        X.sort_indices()
+        return X
+
+    def scaled(self, X):
+        """Dense equivalent of ``scaler.transform(X.toarray())`` for a binary CSR matrix."""
+        out = np.tile(self.base, (X.shape[0], 1))
+        row_ids = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+        out[row_ids, X.indices] += self.inv_scale[X.indices]
+        return out
+
+
+def estimate_one(model, featurizer, title, skills):
+    X = featurizer.transform([(title, skills)])
+    return float(model.predict(featurizer.scaled(X), verbose=0)[0][0])
+
+
+def estimate_profiles(model, featurizer, profiles, chunk_size=CHUNK_SIZE):
+    """Salary estimates for a list of (title, skills), scored in vectorized chunks."""
+    profiles = list(profiles)
+    preds = np.empty(len(profiles), dtype=np.float32)
+    for start in range(0, len(profiles), chunk_size):
+        X = featurizer.transform(profiles[start:start + chunk_size])
+        preds[start:start + X.shape[0]] = model.predict(featurizer.scaled(X), batch_size=chunk_size, verbose=0).ravel()
+    return preds
+
+
+def estimate_batch(model, featurizer, df, title_col="Job Title", skills_col="Skills", chunk_size=CHUNK_SIZE):
+    """Salary estimates for every row of ``df``."""
+    preds = estimate_profiles(model, featurizer, zip(df[title_col], df[skills_col]), chunk_size)
+    return pd.Series(preds, index=df.index, name="Estimated Salary")
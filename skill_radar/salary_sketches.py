@@ -0,0 +1,305 @@
+"""
+Salary distributions per job title, skill and country, kept as mergeable t-digest sketches.
+
+A t-digest summarizes any number of salaries in at most ~``COMPRESSION``
+weighted centroids (small ones at the tails, where p10 / p90 are read, large
+ones around the median). Two digests merge by pooling their centroids and
+compressing again, so the sketches are updated incrementally: the scrapers
+buffer the salaries of the postings they insert and merge them into the
+stored documents in batches, and reading a quantile never scans the postings.
+
+One document per group in the ``salary_sketches`` collection (~1 KB each):
+
+    _id         "title|Data Scientist", "skill|python", "title_country|Data Engineer|Germany", ...
+    dimension   all, title, skill, country, title_country
+    count, min, max
+    centroids   binary float64 (mean, weight) pairs
+
+Titles are grouped with ``skill_radar.titles.normalize_title``; salaries are
+the normalized yearly ``Salary`` of the distinct postings, between
+``MIN_SALARY`` and ``MAX_SALARY``.
+
+    salaries = SalarySketcher(collection)   # in the scrapers / SkillEtraction.py
+    salaries.add(job)                       # after insert_one
+    salaries.flush()                        # every BATCH_SIZE postings and at the end
+
+    python -m skill_radar.salary_sketches --rebuild          # from scratch (run by the ETL after loading)
+    python -m skill_radar.salary_sketches --dimension skill  # p10 / p50 / p90 of the most common skills
+"""
+import argparse
+import math
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from bson import Binary
+from pymongo import DESCENDING, MongoClient, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from skill_radar import metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, MONGO_URI, SALARY_SKETCH_COLLECTION
+from skill_radar.countries import COUNTRY_FIELD, UNKNOWN
+from skill_radar.dedup import DISTINCT, DUPLICATE_FIELD
+from skill_radar.skill_trends import skill_names
+from skill_radar.titles import normalize_title
+
+# -------------------- CONFIGURATION --------------------
+COMPRESSION = 100         # t-digest δ: at most ~δ centroids per sketch
+BUFFER_SIZE = 5_000       # raw salaries buffered by a digest before it compresses
+MIN_SALARY = 1_000        # yearly salaries outside this range are parsing errors
+MAX_SALARY = 1_000_000
+QUANTILES = (0.1, 0.5, 0.9)
+MIN_COUNT = 20            # groups with fewer salaries are not shown
+DIMENSIONS = ("all", "title", "skill", "country", "title_country")
+LABELS = {"all": [], "title": ["title"], "skill": ["skill"], "country": ["country"],
+          "title_country": ["title", "country"]}
+BATCH_SIZE = 200          # postings buffered by SalarySketcher before a flush
+MAX_RETRIES = 5           # concurrent writers (two scrapers) → re-read and re-merge
+CHUNK_SIZE = 50_000
+
+
+# -------------------- T-DIGEST --------------------
+class TDigest:
+    """Merging t-digest (k1 scale function) over float values."""
+
+    def __init__(self, means=(), weights=(), minimum=math.inf, maximum=-math.inf, compression=COMPRESSION):
+        self.means = np.asarray(means, dtype=float)
+        self.weights = np.asarray(weights, dtype=float)
+        self.min, self.max = minimum, maximum
+        self.compression = compression
+        self.buffer = []
+
+    @property
+    def count(self):
+        return float(self.weights.sum()) + len(self.buffer)
+
+    def add(self, values):
+        """Add an iterable of values (compressed every ``BUFFER_SIZE`` values)."""
+        self.buffer.extend(float(v) for v in values)
+        if len(self.buffer) >= BUFFER_SIZE:
+            self.compress()
+        return self
+
+    def merge(self, other):
+        """Pool the centroids of another digest into this one."""
+        other.compress()
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        return self
+
+    def compress(self):
+        if self.buffer:
+            values = np.asarray(self.buffer)
+            self.buffer = []
+            self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+            self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def _compress(self, means, weights):
+        """Group the sorted centroids into buckets of one unit of k = δ/2π · asin(2q − 1)."""
+        if not len(means):
+            return
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+        bucket = np.floor(k - k.min()).astype(np.int64)
+        _, bucket = np.unique(bucket, return_inverse=True)
+        self.weights = np.bincount(bucket, weights=weights)
+        self.means = np.bincount(bucket, weights=means * weights) / self.weights
+
+    def quantile(self, q):
+        """Quantile(s) ``q`` in [0, 1], interpolated between the centroid centers (NaN when empty)."""
+        self.compress()
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else math.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        x = np.concatenate([[0.0], centers, [total]])
+        y = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q) * total, x, y)
+
+    # -------------------- STORAGE --------------------
+    def to_document(self):
+        self.compress()
+        pairs = np.column_stack([self.means, self.weights]).astype("<f8")
+        return {"count": int(round(self.weights.sum())), "min": self.min, "max": self.max,
+                "centroids": Binary(pairs.tobytes())}
+
+    @classmethod
+    def from_document(cls, doc):
+        pairs = np.frombuffer(doc["centroids"], dtype="<f8").reshape(-1, 2)
+        return cls(pairs[:, 0], pairs[:, 1], doc["min"], doc["max"])
+
+
+# -------------------- GROUPS --------------------
+def salary_value(salary):
+    """Normalized yearly salary of a posting as a float, None when missing or implausible."""
+    if isinstance(salary, bool) or not isinstance(salary, (int, float)) or math.isnan(salary):
+        return None
+    return float(salary) if MIN_SALARY <= salary <= MAX_SALARY else None
+
+
+def sketch_groups(job, dimensions=DIMENSIONS):
+    """``(_id, labels)`` of every group a posting's salary belongs to."""
+    title = normalize_title(job.get("Job Title"))
+    country = job.get(COUNTRY_FIELD)
+    country = country if country and country != UNKNOWN else None
+    values = {"title": [title], "country": [country] if country else [], "skill": skill_names(job.get("Skills"))}
+    for dimension in dimensions:
+        combinations = [{}]
+        for label in LABELS[dimension]:
+            combinations = [{**c, label: v} for c in combinations for v in values[label]]
+        for labels in combinations:
+            yield "|".join([dimension, *labels.values()]), {"dimension": dimension, **labels}
+
+
+# -------------------- INGESTION --------------------
+class SalarySketcher:
+    """Buffers the salaries of an ingest loop and merges them into the stored sketches in bulk."""
+
+    def __init__(self, collection=None, batch_size=BATCH_SIZE):
+        self.collection = collection if collection is not None else sketches_collection()
+        self.batch_size = batch_size
+        self.pending = {}   # _id -> (labels, TDigest)
+        self.postings = 0
+
+    def add(self, job, dimensions=DIMENSIONS):
+        """
+        Add one posting's salary; near-duplicates and postings without a salary
+        are ignored. ``dimensions=("skill",)`` when only its skills are new
+        (``SkillEtraction.py``: the other groups already counted it).
+        """
+        salary = salary_value(job.get("Salary"))
+        if salary is None or job.get(DUPLICATE_FIELD) is not None:
+            return
+        for _id, labels in sketch_groups(job, dimensions):
+            if _id not in self.pending:
+                self.pending[_id] = (labels, TDigest())
+            self.pending[_id][1].add([salary])
+        self.postings += 1
+        if self.postings >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Merge the buffered salaries into the stored sketches; returns the number of sketches updated."""
+        if not self.pending:
+            return 0
+        pending, self.pending, self.postings = self.pending, {}, 0
+        with metrics.timer("salary_sketches_flush"):
+            updated = _write(self.collection, pending)
+        metrics.incr("salary_sketches_updated", updated)
+        return updated
+
+
+def _document(_id, labels, digest):
+    return {"_id": _id, **labels, **digest.to_document(),
+            "revision": uuid.uuid4().hex, "updated": datetime.now(timezone.utc)}
+
+
+def _write(collection, pending):
+    """Read-merge-replace with optimistic concurrency on ``revision`` (same scheme as ``skill_trends``)."""
+    ids = list(pending)
+    for _ in range(MAX_RETRIES):
+        stored = {doc["_id"]: doc for doc in collection.find({"_id": {"$in": ids}})}
+        operations, revisions = [], {}
+        for _id in ids:
+            labels, digest = pending[_id]
+            merged = TDigest().merge(digest)
+            if _id in stored:
+                merged.merge(TDigest.from_document(stored[_id]))
+            doc = _document(_id, labels, merged)
+            revisions[_id] = doc["revision"]
+            previous = stored[_id]["revision"] if _id in stored else None
+            operations.append(ReplaceOne({"_id": _id, "revision": previous}, doc, upsert=True))
+        try:
+            collection.bulk_write(operations, ordered=False)
+        except BulkWriteError:
+            pass   # duplicate key: another writer changed the sketch in between
+        written = {doc["_id"]: doc["revision"] for doc in collection.find({"_id": {"$in": ids}}, {"revision": 1})}
+        ids = [_id for _id in ids if written.get(_id) != revisions[_id]]
+        if not ids:
+            return len(pending)
+        metrics.incr("salary_sketches_conflicts", len(ids))
+    raise RuntimeError(f"salary sketches: {len(ids)} sketches still conflicting after {MAX_RETRIES} attempts")
+
+
+# -------------------- BATCH --------------------
+def sketches_collection(client=None):
+    client = client or MongoClient(MONGO_URI)
+    collection = client[DB_NAME][SALARY_SKETCH_COLLECTION]
+    collection.create_index([("dimension", 1), ("count", DESCENDING)])
+    return collection
+
+
+def rebuild(client=None, chunk_size=CHUNK_SIZE):
+    """Recompute every sketch from the salaried postings (one scan); returns the number of sketches."""
+    client = client or MongoClient(MONGO_URI)
+    postings = client[DB_NAME][COLLECTION_NAME]
+    query = {**DISTINCT, "Salary": {"$gte": MIN_SALARY, "$lte": MAX_SALARY}}
+    projection = {"_id": 0, "Job Title": 1, "Skills": 1, COUNTRY_FIELD: 1, "Salary": 1}
+    groups = {}
+    with metrics.timer("salary_sketches_rebuild"):
+        values = defaultdict(list)
+        for n, job in enumerate(postings.find(query, projection, batch_size=chunk_size), 1):
+            salary = salary_value(job.get("Salary"))
+            for _id, labels in sketch_groups(job):
+                if _id not in groups:
+                    groups[_id] = (labels, TDigest())
+                values[_id].append(salary)
+            if n % chunk_size == 0:   # bounded memory: raw values → centroids every chunk
+                for _id, chunk in values.items():
+                    groups[_id][1].add(chunk)
+                values = defaultdict(list)
+        for _id, chunk in values.items():
+            groups[_id][1].add(chunk)
+        documents = [_document(_id, labels, digest) for _id, (labels, digest) in groups.items()]
+        collection = sketches_collection(client)
+        collection.delete_many({})
+        if documents:
+            collection.insert_many(documents, ordered=False)
+    print(f"✅ Salary sketches rebuilt: {len(documents)} groups")
+    metrics.flush()
+    return len(documents)
+
+
+def load_quantiles(dimension="title", country=None, collection=None, min_count=MIN_COUNT,
+                   quantiles=QUANTILES, limit=None):
+    """
+    DataFrame [labels..., count, p10, p50, p90] of one dimension, largest groups
+    first (``country`` selects the title_country sketches of one country).
+    """
+    collection = collection if collection is not None else sketches_collection()
+    query = {"dimension": dimension, "count": {"$gte": min_count}}
+    if country is not None:
+        query["country"] = country
+    cursor = collection.find(query).sort("count", DESCENDING)
+    if limit:
+        cursor = cursor.limit(limit)
+    columns = LABELS[dimension] + ["count"] + [f"p{round(q * 100)}" for q in quantiles]
+    rows = []
+    for doc in cursor:
+        values = TDigest.from_document(doc).quantile(list(quantiles))
+        rows.append([doc[label] for label in LABELS[dimension]] + [doc["count"]] + list(values))
+    return pd.DataFrame(rows, columns=columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Salary quantile sketches per job title, skill and country.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every sketch from the postings")
+    parser.add_argument("--dimension", choices=DIMENSIONS, default="title")
+    parser.add_argument("--country", help="Country of the title_country sketches")
+    parser.add_argument("--top", type=int, default=20, help="Groups shown")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        rebuild()
+    quantiles = load_quantiles(args.dimension, args.country, limit=args.top)
+    print(quantiles.round(0).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Host-wide cache of the dashboard datasets as immutable, memory-mapped Arrow files.
+
+``st.cache_data`` pickles its result and hands every call a copy, and each
+Streamlit process (several behind a load balancer) builds its own. Here a
+dataset is published once per version as an Arrow IPC file in a shared
+directory (``/dev/shm`` when available, i.e. RAM):
+
+    <SHARED_DIR>/<name>/<version hash>.arrow
+
+Every session and process maps the same file read-only: string and list
+columns stay Arrow-backed (``pd.ArrowDtype``) and numeric columns without
+missing values are views of the mapping, so the pages of the dataset are
+shared by the OS instead of being copied per session / worker.
+
+A refresh publishes a new version next to the old one (written to a temporary
+file, then renamed: readers never see a partial file); readers move to it when
+their version check changes, and old versions are deleted (a mapping that is
+still open keeps its pages until it is closed).
+
+    df = shared_frame("forecasts", version=file_version(path), build=lambda: pd.read_csv(path))
+
+Environment variables:
+
+- ``SKILL_RADAR_SHARED_DIR``: cache directory (default ``/dev/shm/skill_radar``, else the temp directory).
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from skill_radar import metrics
+
+# -------------------- CONFIGURATION --------------------
+_DEFAULT_ROOT = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+SHARED_DIR = Path(os.getenv("SKILL_RADAR_SHARED_DIR", _DEFAULT_ROOT / "skill_radar"))
+KEEP_VERSIONS = 2      # published versions kept per dataset (the current one + the previous one)
+SUFFIX = ".arrow"
+
+_lock = threading.Lock()
+_attached = {}         # (name, version) -> DataFrame, per process
+
+
+def file_version(path):
+    """Version of a dataset read from a file: its size and modification time."""
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _path(name, version, root=None):
+    digest = hashlib.sha1(str(version).encode()).hexdigest()[:16]
+    return Path(root or SHARED_DIR) / name / f"{digest}{SUFFIX}"
+
+
+# -------------------- PUBLISH --------------------
+def publish(name, df, version, root=None):
+    """Write ``df`` as the ``version`` of dataset ``name`` (atomic rename); returns the file path."""
+    path = _path(name, version, root)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = path.with_suffix(f".tmp-{os.getpid()}-{threading.get_ident()}")
+    with metrics.timer("shared_dataset_publish", dataset=name):
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        try:
+            os.replace(tmp, path)
+        except OSError:   # Windows: another process published and mapped it first
+            tmp.unlink(missing_ok=True)
+    metrics.incr("shared_dataset_bytes", table.nbytes, dataset=name)
+    cleanup(name, keep=path, root=root)
+    return path
+
+
+def cleanup(name, keep=None, root=None, keep_versions=KEEP_VERSIONS):
+    """Delete the oldest versions of a dataset (and the leftovers of interrupted publishes)."""
+    directory = Path(root or SHARED_DIR) / name
+    if not directory.is_dir():
+        return
+    files = sorted(directory.glob(f"*{SUFFIX}"), key=lambda p: p.stat().st_mtime, reverse=True)
+    stale = [p for p in files[keep_versions:] if p != keep]
+    stale += [p for p in directory.glob("*.tmp-*")
+              if time.time() - p.stat().st_mtime > 3600]
+    for p in stale:
+        try:
+            p.unlink()
+        except OSError:   # still mapped (Windows) → next cleanup
+            pass
+
+
+# -------------------- ATTACH --------------------
+def _arrow_backed(arrow_type):
+    """Strings and lists stay in the Arrow buffers; numbers / dates use NumPy dtypes."""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) \
+            or pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def attach(name, version, root=None):
+    """Memory-map a published version as a DataFrame (zero-copy where possible), None when not published."""
+    path = _path(name, version, root)
+    if not path.exists():
+        return None
+    with metrics.timer("shared_dataset_attach", dataset=name):
+        source = pa.memory_map(str(path), "r")
+        table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(types_mapper=_arrow_backed, split_blocks=True)
+
+
+def shared_frame(name, version, build, root=None):
+    """
+    DataFrame of dataset ``name`` at ``version``: attached if some process
+    already published it, otherwise built with ``build()``, published, then
+    attached. The same object is returned for the same version in a process.
+    """
+    key = (name, str(version), str(root or SHARED_DIR))
+    with _lock:
+        df = _attached.get(key)
+    if df is not None:
+        return df
+    df = attach(name, version, root)
+    if df is None:
+        metrics.incr("shared_dataset_builds", dataset=name)
+        publish(name, build(), version, root)
+        df = attach(name, version, root)
+    with _lock:
+        for old in [k for k in _attached if k[0] == name and k[2] == key[2]]:
+            del _attached[old]   # version swap: the old mapping is released with its last reference
+        _attached[key] = df
+    return df
@@ -0,0 +1,305 @@
+"""
+Skill vocabulary canonicalization: variants of a skill mapped to one name.
+
+JobBERT and the Kaggle datasets spell the same skill in many ways
+("scikit-learn", "sklearn", "scikit learn", "Python3", "asp.net core" /
+"asp.netcore", plurals), and every variant becomes its own column of the
+binarizer / salary features and its own Prophet model. ``skill_aliases.json``
+(next to this module) is the reviewed alias map ``variant → canonical``; it is
+applied at ingestion (scrapers, ``SkillEtraction.py``, ETL) and to the stored
+postings by ``apply``.
+
+Proposals are computed from the skill frequencies of the collection:
+
+1. every skill gets a variant key (lower-case, accents / spaces / punctuation
+   removed, plural 's' dropped), equal keys are proposed directly;
+2. character 3-grams of the keys block the candidates: only pairs sharing
+   enough n-grams (one sparse ``S Sᵀ`` product) are compared;
+3. pairs within ``MAX_DISTANCE`` normalized edit distance are clustered
+   (union-find) and the most frequent variant of a cluster is its canonical name.
+
+    python -m skill_radar.skill_aliases propose            # → skill_aliases_review.csv
+    # review the CSV: keep "yes" in the accept column only for true variants
+    python -m skill_radar.skill_aliases accept skill_aliases_review.csv
+    python -m skill_radar.skill_aliases apply              # rewrite Skills of the stored postings
+"""
+import argparse
+import json
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from pymongo import MongoClient, UpdateOne
+
+from skill_radar import data_versions, metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, MONGO_URI
+from skill_radar.dedup import _Clusters
+from skill_radar.posting_search import SKILLS_FIELD, skill_tags
+from skill_radar.skill_featurizer import skill_frequencies
+
+# -------------------- CONFIGURATION --------------------
+ALIASES_PATH = Path(__file__).resolve().parent / "skill_aliases.json"
+REVIEW_PATH = Path("skill_aliases_review.csv")
+MAX_DISTANCE = 0.15        # normalized edit distance of two variants (python / python3: 0.14)
+MIN_NGRAM_SIMILARITY = 0.5 # Jaccard similarity of the 3-gram sets before the edit distance is computed
+MAX_SKILLS = 50_000        # most frequent skills considered by ``propose``
+BLOCK_ROWS = 5_000         # rows of S Sᵀ computed at a time
+CHUNK_SIZE = 10_000
+
+_PUNCTUATION = re.compile(r"[\s\-_./,:;'\"()]+")   # '+' and '#' are kept: c / c++ / c#
+
+
+# -------------------- ALIAS MAP --------------------
+def load_aliases(path=ALIASES_PATH):
+    """Reviewed ``{variant: canonical}`` map (lower-case keys), chains resolved."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        aliases = {k.strip().lower(): v.strip().lower() for k, v in json.load(f)["aliases"].items()}
+    for variant in aliases:   # a → b, b → c  ⇒  a → c
+        seen = {variant}
+        while aliases[variant] in aliases and aliases[variant] not in seen:
+            seen.add(aliases[variant])
+            aliases[variant] = aliases[aliases[variant]]
+    return {k: v for k, v in aliases.items() if k != v}
+
+
+def save_aliases(aliases, path=ALIASES_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"aliases": dict(sorted(aliases.items()))}, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    return path
+
+
+ALIASES = load_aliases()
+
+
+def canonical_skill(skill, aliases=None):
+    """Canonical name of one skill (the skill itself, stripped, when it has no alias)."""
+    aliases = ALIASES if aliases is None else aliases
+    skill = skill.strip()
+    return aliases.get(skill.lower(), skill)
+
+
+def canonicalize(skills, aliases=None):
+    """Skill list with the aliases replaced, de-duplicated case-insensitively (order kept)."""
+    out = {}
+    for skill in skills:
+        canonical = canonical_skill(skill, aliases)
+        if canonical:
+            out.setdefault(canonical.lower(), canonical)
+    return list(out.values())
+
+
+@lru_cache(maxsize=65_536)
+def _canonical_string(skills):
+    return ", ".join(canonicalize(skills.split(",")))
+
+
+def canonicalize_string(skills):
+    """Comma-separated ``Skills`` value with the aliases applied (missing values unchanged)."""
+    if not isinstance(skills, str):
+        return skills
+    return _canonical_string(skills)
+
+
+def canonicalize_series(skills):
+    """Vectorized ``canonicalize_string``: each distinct value of the Series is rewritten once."""
+    if not ALIASES:
+        return skills
+    codes, uniques = pd.factorize(skills)
+    rewritten = np.array([canonicalize_string(s) for s in uniques] + [None], dtype=object)
+    return pd.Series(rewritten[codes], index=skills.index, dtype=object)
+
+
+# -------------------- PROPOSALS --------------------
+def variant_key(skill):
+    """Spelling-insensitive key: 'Scikit Learn', 'scikit-learn' → 'scikitlearn'; 'Dashboards' → 'dashboard'."""
+    skill = unicodedata.normalize("NFKD", skill.lower())
+    skill = "".join(c for c in skill if not unicodedata.combining(c))
+    key = _PUNCTUATION.sub("", skill)
+    if len(key) >= 5 and key.endswith("s") and not key.endswith("ss"):
+        key = key[:-1]
+    return key
+
+
+def edit_distance(a, b, limit=None):
+    """Levenshtein distance (stops early, returning ``limit + 1``, once ``limit`` is exceeded)."""
+    if len(a) < len(b):
+        a, b = b, a
+    limit = len(a) if limit is None else limit
+    if len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _ngram_matrix(keys, n=3):
+    """Binary key x character n-gram CSR matrix (keys padded with '^' / '$')."""
+    vocabulary, rows, cols = {}, [], []
+    for row, key in enumerate(keys):
+        padded = f"^{key}$"
+        for gram in {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(gram, len(vocabulary)))
+    return sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(keys), len(vocabulary)))
+
+
+def candidate_pairs(keys, min_similarity=MIN_NGRAM_SIMILARITY, block_rows=BLOCK_ROWS):
+    """(i, j) pairs of keys whose 3-gram Jaccard similarity is at least ``min_similarity`` (i < j)."""
+    S = _ngram_matrix(keys)
+    sizes = np.asarray(S.sum(axis=1)).ravel()
+    pairs = []
+    for start in range(0, S.shape[0], block_rows):
+        shared = (S[start:start + block_rows] @ S.T).tocoo()
+        i, j = shared.row + start, shared.col
+        union = sizes[i] + sizes[j] - shared.data
+        keep = (i < j) & (shared.data >= min_similarity * union)
+        pairs.append(np.stack([i[keep], j[keep]], axis=1))
+    return np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=int)
+
+
+def propose(frequencies, aliases=None, max_distance=MAX_DISTANCE):
+    """
+    DataFrame of proposed aliases [alias, canonical, distance, alias_count,
+    canonical_count, accept] from skill frequencies (Series skill → postings).
+    ``distance`` is the normalized edit distance between the variant keys of
+    the alias and of its canonical name (clusters chain pairs, so it can exceed
+    ``max_distance``). ``accept`` is pre-filled with "yes" for identical variant keys only.
+    """
+    aliases = ALIASES if aliases is None else aliases
+    frequencies = frequencies[[s not in aliases for s in frequencies.index]]
+    frequencies = frequencies.sort_values(ascending=False).head(MAX_SKILLS)
+    skills = frequencies.index.to_numpy(dtype=object)
+    keys = [variant_key(s) for s in skills]
+
+    clusters, by_key = _Clusters(), {}
+    for i, key in enumerate(keys):
+        if key in by_key:
+            clusters.union(by_key[key], i)
+        else:
+            by_key[key] = i
+    unique = sorted(by_key.values())
+    for a, b in candidate_pairs([keys[i] for i in unique]):
+        i, j = unique[a], unique[b]
+        longest = max(len(keys[i]), len(keys[j]))
+        limit = int(max_distance * longest)
+        if limit and edit_distance(keys[i], keys[j], limit) <= limit:
+            clusters.union(i, j)
+
+    members = {}
+    for i, root in clusters.canonical().items():
+        members.setdefault(root, [root]).append(i)
+    rows = []
+    for group in members.values():
+        canonical = min(group)   # skills are sorted by frequency: the most frequent variant
+        for i in sorted(group):
+            if i == canonical:
+                continue
+            longest = max(len(keys[i]), len(keys[canonical]), 1)
+            rows.append({
+                "alias": skills[i], "canonical": skills[canonical],
+                "distance": round(edit_distance(keys[i], keys[canonical]) / longest, 3),
+                "alias_count": int(frequencies.iloc[i]), "canonical_count": int(frequencies.iloc[canonical]),
+                "accept": "yes" if keys[i] == keys[canonical] else "",
+            })
+    columns = ["alias", "canonical", "distance", "alias_count", "canonical_count", "accept"]
+    return pd.DataFrame(rows, columns=columns).sort_values(["canonical", "distance"], ignore_index=True)
+
+
+def collection_frequencies(collection, chunk_size=CHUNK_SIZE):
+    """Postings per normalized skill over the whole collection (chunked)."""
+    total = pd.Series(dtype=float)
+    chunk = []
+    for doc in collection.find({"Skills": {"$nin": [None, ""]}}, {"_id": 0, "Skills": 1}, batch_size=chunk_size):
+        chunk.append(doc["Skills"])
+        if len(chunk) >= chunk_size:
+            total = total.add(skill_frequencies(chunk), fill_value=0)
+            chunk = []
+    if chunk:
+        total = total.add(skill_frequencies(chunk), fill_value=0)
+    return total.astype(int)
+
+
+def accept(review_path, aliases_path=ALIASES_PATH):
+    """Merge the reviewed proposals (accept = yes) into the alias map; returns the number added."""
+    review = pd.read_csv(review_path, dtype=str, keep_default_na=False)
+    accepted = review[review["accept"].str.strip().str.lower().isin({"yes", "y", "1", "true", "x"})]
+    aliases = load_aliases(aliases_path)
+    before = len(aliases)
+    for alias, canonical in zip(accepted["alias"], accepted["canonical"]):
+        aliases[alias.strip().lower()] = canonical.strip().lower()
+    save_aliases(aliases, aliases_path)
+    aliases = load_aliases(aliases_path)
+    print(f"✅ {len(aliases) - before} aliases added ({len(aliases)} in {aliases_path})")
+    return len(aliases) - before
+
+
+# -------------------- BACKFILL --------------------
+def apply(chunk_size=CHUNK_SIZE):
+    """Rewrite ``Skills`` (and ``SkillTags``) of the stored postings with the alias map; returns the number updated."""
+    collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+    cursor = collection.find({"Skills": {"$nin": [None, ""]}}, {"Skills": 1}, batch_size=chunk_size)
+    operations, scanned, updated = [], 0, 0
+    with metrics.timer("skill_aliases_apply"):
+        for doc in cursor:
+            scanned += 1
+            skills = canonicalize_string(doc["Skills"])
+            if skills != doc["Skills"]:
+                operations.append(UpdateOne({"_id": doc["_id"]},
+                                            {"$set": {"Skills": skills, SKILLS_FIELD: skill_tags(skills)}}))
+            if len(operations) >= chunk_size:
+                collection.bulk_write(operations, ordered=False)
+                updated += len(operations)
+                operations = []
+                print(f"   {scanned} postings scanned, {updated} updated")
+        if operations:
+            collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+    if updated:
+        data_versions.bump(collection)
+    print(f"🎉 Skills canonicalized on {updated} / {scanned} postings "
+          f"(then: python -m skill_radar.skill_trends --rebuild, and retrain the models)")
+    metrics.flush()
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Canonical skill names: propose, review and apply aliases.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("propose", help="Write alias proposals from the collection's skills to a CSV")
+    p.add_argument("--output", default=str(REVIEW_PATH))
+    p.add_argument("--max-distance", type=float, default=MAX_DISTANCE)
+    p = commands.add_parser("accept", help="Merge the reviewed proposals into skill_aliases.json")
+    p.add_argument("review")
+    p = commands.add_parser("apply", help="Rewrite the Skills of the stored postings")
+    p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.command == "propose":
+        collection = MongoClient(MONGO_URI)[DB_NAME][COLLECTION_NAME]
+        frequencies = collection_frequencies(collection)
+        proposals = propose(frequencies, max_distance=args.max_distance)
+        proposals.to_csv(args.output, index=False)
+        print(f"✅ {len(proposals)} aliases proposed for {len(frequencies)} skills → {args.output} "
+              f"({(proposals['accept'] == 'yes').sum()} pre-accepted, the others need a review)")
+    elif args.command == "accept":
+        accept(args.review)
+    else:
+        apply(args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
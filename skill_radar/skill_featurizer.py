@@ -0,0 +1,143 @@
+"""
+Single-pass sparse skill featurizer shared by training (notebooks) and serving.
+
+Every posting's ``Skills`` field is tokenized once (comma split, strip,
+lower-case — the dashboard's normalisation) and mapped against a frozen
+vocabulary into a binary scipy CSR matrix. The whole column is split at once,
+the raw tokens are factorized so only the distinct ones are normalized, and a
+single ``Index.get_indexer`` lookup gives the columns — instead of one regex scan per skill (salary notebook) or a Python loop per row
+(``MultiLabelBinarizer``).
+
+    featurizer = SkillFeaturizer.fit(df["Skills"], min_count=5)
+    featurizer.save(VOCABULARY_PATH)
+    X = featurizer.transform(df["Skills"])          # postings x skills CSR
+
+    featurizer = SkillFeaturizer.load(VOCABULARY_PATH)   # serving: same columns
+
+The salary featurizer, the NumPy / co-occurrence recommenders and the
+Prediction Center all encode skills through this class, so training and
+serving features cannot drift apart.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from skill_radar.config import RECOMMENDER_DIR
+
+# -------------------- CONFIGURATION --------------------
+VOCABULARY_PATH = RECOMMENDER_DIR / "skill_vocabulary.json"
+
+
+def parse_skills(skills):
+    """One posting's skills: list, comma-separated string or missing value → normalized, de-duplicated list."""
+    if skills is None or (isinstance(skills, float) and np.isnan(skills)):
+        return []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    return list(dict.fromkeys(s.strip().lower() for s in skills if s and s.strip()))
+
+
+def _as_text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return ",".join(str(v) for v in value)
+    return ""  # None / NaN
+
+
+def _factorized_tokens(postings):
+    """
+    (number of postings, row of each raw token, code of each raw token, normalized unique tokens).
+    The whole column is split in one ``str.split`` and only the distinct raw
+    tokens are stripped / lower-cased, which keeps 1M postings in a few seconds.
+    """
+    texts = [_as_text(v) for v in postings]
+    counts = np.fromiter((t.count(",") + 1 for t in texts), dtype=np.int64, count=len(texts))
+    rows = np.repeat(np.arange(len(texts)), counts)
+    codes, uniques = pd.factorize(np.array(",".join(texts).split(","), dtype=object))
+    normalized = pd.Index(uniques).str.strip().str.lower()
+    return len(texts), rows, codes, normalized
+
+
+def tokenize(postings):
+    """
+    Long Series of normalized skills, indexed by the posting's position.
+    ``postings`` is any iterable mixing comma-separated strings, lists and missing values.
+    """
+    _, rows, codes, normalized = _factorized_tokens(postings)
+    tokens = pd.Series(normalized.to_numpy()[codes], index=rows, dtype=object)
+    return tokens[tokens != ""]
+
+
+def skill_frequencies(postings):
+    """Number of postings mentioning each skill (sorted by skill; add chunks with ``Series.add``)."""
+    n_rows, rows, codes, normalized = _factorized_tokens(postings)
+    candidates = pd.Index(sorted(set(normalized) - {""}), dtype=object)
+    cols = candidates.get_indexer(normalized)[codes]
+    known = cols >= 0
+    X = sp.csr_matrix((np.ones(known.sum(), dtype=np.float32), (rows[known], cols[known])),
+                      shape=(n_rows, len(candidates)))
+    return pd.Series(X.getnnz(axis=0), index=candidates, name="postings")  # repeated skills merged
+
+
+class SkillFeaturizer:
+    """Frozen skill vocabulary → column index, with a vectorized CSR ``transform``."""
+
+    def __init__(self, vocabulary):
+        self.vocabulary = pd.Index(list(dict.fromkeys(vocabulary)), dtype=object)
+        self.classes_ = self.vocabulary.to_numpy(dtype=str)
+
+    # -------------------- VOCABULARY --------------------
+    @classmethod
+    def fit(cls, postings, min_count=1):
+        """Vocabulary of the skills seen in at least ``min_count`` postings (sorted, like MultiLabelBinarizer)."""
+        counts = skill_frequencies(postings)
+        return cls(counts.index[counts >= min_count])
+
+    @classmethod
+    def from_binarizer(cls, mlb):
+        """Reuse the classes of an existing ``MultiLabelBinarizer`` (same column order)."""
+        return cls(mlb.classes_)
+
+    @classmethod
+    def load(cls, path=VOCABULARY_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["vocabulary"])
+
+    def save(self, path=VOCABULARY_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"vocabulary": self.classes_.tolist()}, f, indent=1)
+        return path
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def __contains__(self, skill):
+        return skill in self.vocabulary
+
+    # -------------------- ENCODING --------------------
+    def transform(self, postings):
+        """Binary postings x skills CSR matrix (unknown skills are ignored)."""
+        n_rows, rows, codes, normalized = _factorized_tokens(postings)
+        cols = self.vocabulary.get_indexer(normalized)[codes]
+        known = cols >= 0
+        X = sp.csr_matrix((np.ones(known.sum(), dtype=np.float32), (rows[known], cols[known])),
+                          shape=(n_rows, len(self.vocabulary)))
+        X.data[:] = 1  # duplicates within a posting were summed
+        return X
+
+    def indices(self, skills):
+        """Sorted column indices of one posting."""
+        return self.transform([skills]).indices.astype(np.int64)
+
+    def rows(self, postings):
+        """Column indices of each posting (list of arrays), from one ``transform``."""
+        X = self.transform(postings)
+        return np.split(X.indices.astype(np.int64), X.indptr[1:-1])
+
+    def inverse_transform(self, X):
+        """Skill lists of the rows of a CSR matrix."""
+        X = sp.csr_matrix(X)
+        return [self.classes_[idx].tolist() for idx in np.split(X.indices, X.indptr[1:-1])]
@@ -0,0 +1,225 @@
+"""
+Skill co-occurrence network of the dashboard, computed with sparse matrix products.
+
+The postings are encoded once per data version into a binary posting x skill
+CSR matrix ``X`` (chunked: the vocabulary grows as the chunks are read), with
+the normalized title and the month of each posting kept as integer codes. A
+graph is then a few array operations, whatever the number of postings:
+
+    rows      boolean mask over the postings (title, date range)
+    top-N     skills with the largest column sums of ``X[rows]``
+    C         ``Xᵀ X`` restricted to the top-N columns (co-occurrence counts)
+    lift      C · n / (count_i · count_j), PMI = log(lift)
+    clusters  average-linkage clustering of the positive-PMI profiles
+
+    network = load_network(collection, normalize_title)
+    nodes, edges = network.graph(title="Data Scientist", start="2024-01", end="2024-12", top_n=30)
+
+``data_version(collection)`` is a cheap fingerprint of the postings (count,
+last ``_id`` and the write counter of ``skill_radar.data_versions``): the
+dashboard rebuilds the matrix only when it changes.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.cluster.hierarchy import fcluster, linkage
+
+from skill_radar import data_versions, metrics
+from skill_radar.dedup import DISTINCT
+from skill_radar.skill_featurizer import tokenize
+
+# -------------------- CONFIGURATION --------------------
+QUERY = {**DISTINCT, "Skills": {"$nin": [None, ""]}}
+PROJECTION = {"_id": 0, "Job Title": 1, "Date": 1, "Skills": 1}
+CHUNK_SIZE = 100_000
+TOP_N = 30
+MIN_COOCCURRENCE = 5      # edges seen in fewer postings are dropped
+EDGE_METRICS = ["lift", "pmi", "count"]
+NO_MONTH = -1
+
+
+def data_version(collection):
+    """
+    Fingerprint of the postings the network is built from: their number, the
+    last ``_id`` and the number of batch rewrites (in-place backfills).
+    """
+    last = collection.find_one(QUERY, {"_id": 1}, sort=[("_id", -1)])
+    return f"{collection.count_documents(QUERY)}-{last['_id'] if last else 0}-{data_versions.writes(collection)}"
+
+
+def load_network(collection, normalize_title=None, chunk_size=CHUNK_SIZE):
+    """``SkillNetwork`` of the distinct postings with skills, read ``chunk_size`` documents at a time."""
+    cursor = collection.find(QUERY, PROJECTION, batch_size=chunk_size)
+    return SkillNetwork.from_postings(cursor, normalize_title, chunk_size)
+
+
+def _month_codes(dates):
+    """'dd-mm-yyyy' strings → months since year 0 (``NO_MONTH`` when missing or invalid)."""
+    parsed = pd.to_datetime(pd.Series(dates, dtype=object), format="%d-%m-%Y", errors="coerce")
+    codes = parsed.dt.year * 12 + parsed.dt.month - 1
+    return codes.fillna(NO_MONTH).to_numpy(dtype=np.int32)
+
+
+def month_code(month):
+    """'YYYY-MM' (or anything ``pd.Timestamp`` reads) → month code."""
+    month = pd.Timestamp(month)
+    return month.year * 12 + month.month - 1
+
+
+def month_label(code):
+    return f"{code // 12:04d}-{code % 12 + 1:02d}"
+
+
+class SkillNetwork:
+    """Binary posting x skill matrix with the normalized title and the month of each posting."""
+
+    def __init__(self, X, skills, titles, title_codes, months):
+        self.X = X.tocsr()
+        self.skills = np.asarray(skills, dtype=object)
+        self.titles = list(titles)
+        self.title_codes = np.asarray(title_codes, dtype=np.int32)
+        self.months = np.asarray(months, dtype=np.int32)
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    @classmethod
+    def from_postings(cls, postings, normalize_title=None, chunk_size=CHUNK_SIZE):
+        """Encode an iterable of ``{Job Title, Date, Skills}`` documents, ``chunk_size`` at a time."""
+        vocabulary = pd.Index([], dtype=object)
+        title_index = {}
+        rows, cols, title_codes, months = [], [], [], []
+        n_rows = 0
+
+        def encode(chunk):
+            nonlocal vocabulary, n_rows
+            frame = pd.DataFrame(chunk, columns=["Job Title", "Date", "Skills"])
+            tokens = tokenize(frame["Skills"])
+            vocabulary = vocabulary.append(pd.Index(tokens.unique()).difference(vocabulary))
+            rows.append(tokens.index.to_numpy() + n_rows)
+            cols.append(vocabulary.get_indexer(tokens.to_numpy()))
+            # normalize_title is called once per distinct raw title of the chunk
+            raw_codes, raw_titles = pd.factorize(frame["Job Title"].fillna("").astype(str).str.strip())
+            normalized = [normalize_title(t) if normalize_title else t for t in raw_titles]
+            codes = np.array([title_index.setdefault(t, len(title_index)) for t in normalized], dtype=np.int32)
+            title_codes.append(codes[raw_codes])
+            months.append(_month_codes(frame["Date"]))
+            n_rows += len(frame)
+
+        chunk = []
+        with metrics.timer("skill_network_build"):
+            for doc in postings:
+                chunk.append(doc)
+                if len(chunk) >= chunk_size:
+                    encode(chunk)
+                    chunk = []
+            if chunk or not n_rows:
+                encode(chunk)
+            rows, cols = np.concatenate(rows), np.concatenate(cols)
+            X = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                              shape=(n_rows, len(vocabulary)))
+            X.data[:] = 1   # a skill repeated in one posting counts once
+        return cls(X, vocabulary.to_numpy(), sorted(title_index, key=title_index.get),
+                   np.concatenate(title_codes), np.concatenate(months))
+
+    # -------------------- FILTERS --------------------
+    def title_counts(self):
+        """Postings per normalized title, most frequent first."""
+        counts = np.bincount(self.title_codes, minlength=len(self.titles))
+        return pd.Series(counts, index=self.titles).sort_values(ascending=False)
+
+    def month_range(self):
+        """First and last month ('YYYY-MM') of the dated postings, None when there is none."""
+        dated = self.months[self.months != NO_MONTH]
+        if not len(dated):
+            return None
+        return month_label(int(dated.min())), month_label(int(dated.max()))
+
+    def rows(self, title=None, start=None, end=None):
+        """Indices of the postings of a normalized title and month range (undated postings only without range)."""
+        mask = np.ones(len(self), dtype=bool)
+        if title is not None:
+            mask &= self.title_codes == (self.titles.index(title) if title in self.titles else -1)
+        if start is not None:
+            mask &= self.months >= month_code(start)
+        if end is not None:
+            mask &= (self.months <= month_code(end)) & (self.months != NO_MONTH)
+        return np.flatnonzero(mask)
+
+    # -------------------- GRAPH --------------------
+    def graph(self, title=None, start=None, end=None, top_n=TOP_N, min_count=MIN_COOCCURRENCE, n_clusters=None):
+        """
+        (nodes, edges) of the co-occurrence graph of the ``top_n`` skills of the selection:
+
+        - nodes: Skill, Count, Share (of the selected postings), Cluster
+        - edges: source, target, count, lift, pmi (pairs seen in at least ``min_count`` postings)
+        """
+        with metrics.timer("skill_network_graph"):
+            X = self.X[self.rows(title, start, end)]
+            n = X.shape[0]
+            counts = np.asarray(X.sum(axis=0)).ravel()
+            top = np.argsort(-counts, kind="stable")[:top_n]
+            top = top[counts[top] > 0]
+            Xt = X.tocsc()[:, top]
+            C = (Xt.T @ Xt).toarray()
+            c = counts[top]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                lift = C * n / np.outer(c, c)
+                pmi = np.log(lift)
+
+            i, j = np.triu_indices(len(top), k=1)
+            keep = C[i, j] >= max(min_count, 1)
+            i, j = i[keep], j[keep]
+            edges = pd.DataFrame({
+                "source": self.skills[top][i], "target": self.skills[top][j],
+                "count": C[i, j].astype(int), "lift": lift[i, j], "pmi": pmi[i, j],
+            }).sort_values("lift", ascending=False, ignore_index=True)
+
+            weights = np.where(C >= max(min_count, 1), np.maximum(np.nan_to_num(pmi, neginf=0.0), 0.0), 0.0)
+            np.fill_diagonal(weights, 0.0)
+            nodes = pd.DataFrame({
+                "Skill": self.skills[top],
+                "Count": c.astype(int),
+                "Share": c / max(n, 1),
+                "Cluster": cluster(weights, n_clusters),
+            })
+        return nodes, edges
+
+
+def cluster(weights, n_clusters=None):
+    """Cluster labels (1..k) from average-linkage clustering of the rows of a skill x skill weight matrix."""
+    size = len(weights)
+    if size < 3:
+        return np.ones(size, dtype=int)
+    n_clusters = n_clusters or max(2, size // 6)
+    # self-loops keep isolated skills at a finite cosine distance
+    profiles = weights + np.eye(size) * max(weights.max(), 1.0)
+    return fcluster(linkage(profiles, method="average", metric="cosine"), n_clusters, criterion="maxclust")
+
+
+def layout(weights, seed=42):
+    """
+    2-D node positions: classical MDS of the cosine similarity of the weight
+    profiles (strongly associated skills end up close), with a little jitter.
+    """
+    size = len(weights)
+    if size == 0:
+        return np.zeros((0, 2))
+    profiles = weights + np.eye(size) * max(weights.max(), 1.0)
+    profiles /= np.linalg.norm(profiles, axis=1, keepdims=True)
+    similarity = profiles @ profiles.T
+    centering = np.eye(size) - 1.0 / size
+    values, vectors = np.linalg.eigh(centering @ similarity @ centering)
+    positions = vectors[:, -2:] * np.sqrt(np.maximum(values[-2:], 0.0))
+    positions = np.pad(positions, ((0, 0), (2 - positions.shape[1], 0)))   # a single node has one eigenvector
+    return positions + np.random.default_rng(seed).normal(scale=0.02, size=positions.shape)
+
+
+def edge_weights(nodes, edges, metric="lift"):
+    """Symmetric node x node matrix of an edge metric (for ``layout``), in the order of ``nodes``."""
+    index = pd.Index(nodes["Skill"])
+    weights = np.zeros((len(index), len(index)))
+    i, j = index.get_indexer(edges["source"]), index.get_indexer(edges["target"])
+    values = np.maximum(edges[metric].to_numpy(dtype=float), 0.0)
+    weights[i, j] = weights[j, i] = values
+    return weights
@@ -0,0 +1,304 @@
+"""
+Live skill trend statistics, updated as postings are ingested.
+
+The Prophet forecasts (``forecast_all_skills.csv``) are only refreshed when the
+models are retrained. This module keeps, per skill, a small document in the
+``skill_trends`` collection (O(#skills) state, not O(#postings)):
+
+    counts        postings per month ("2025-03": 41) of the last ``KEEP_MONTHS`` months
+    folded        last month folded into the statistics below (older than the counts)
+    level, slope  Holt's double exponential smoothing (EWMA level + EWMA trend, per month)
+    variance      EWMA of the squared one-step-ahead errors
+    cusum_up/down CUSUM of the standardized errors: the change-point score
+    last_change   month (and direction) of the last change point (score > ``CHANGE_THRESHOLD``)
+
+Months leaving the window are folded into the stored statistics; the months of
+the window are folded at read time (``summary``), the current month excluded
+since it is still being collected. Postings may therefore arrive in any order
+(historical extraction, late scrapes) as long as they fall in the window;
+older ones are only counted in ``skill_trends_late``. Months without postings
+count as zero. ``--rebuild`` recomputes everything from the collection.
+
+    trends = TrendTracker(collection)       # in the scrapers / SkillEtraction.py
+    trends.add(job)                         # after insert_one
+    trends.flush()                          # every BATCH_SIZE postings and at the end
+
+    python -m skill_radar.skill_trends --rebuild   # from scratch (run by the ETL after loading)
+    python -m skill_radar.skill_trends --top 20    # current risers / fallers
+"""
+import argparse
+import math
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import pandas as pd
+from pymongo import MongoClient, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from skill_radar import metrics
+from skill_radar.config import COLLECTION_NAME, DB_NAME, MONGO_URI, TRENDS_COLLECTION
+from skill_radar.dedup import DUPLICATE_FIELD
+from skill_radar.forecast_training import monthly_skill_counts_pipeline
+from skill_radar.posting_search import posted_at
+
+# -------------------- CONFIGURATION --------------------
+ALPHA = 0.3               # level smoothing
+BETA = 0.1                # slope smoothing
+CUSUM_DRIFT = 0.5         # standardized error tolerated before the score grows
+CHANGE_THRESHOLD = 5.0    # score of a change point
+KEEP_MONTHS = 24          # monthly counts kept per skill
+BATCH_SIZE = 200          # postings buffered by TrendTracker before a flush
+MAX_RETRIES = 5           # concurrent writers (two scrapers) → re-read and re-apply
+
+
+# -------------------- MONTHS --------------------
+def month_of(date):
+    """'YYYY-MM' of a posting date ('dd-mm-yyyy' or ISO string, or datetime), None when unparseable."""
+    date = posted_at(date)   # ISO: the LinkedIn scraper stores publishedAt as is
+    return date.strftime("%Y-%m") if date else None
+
+
+def current_month(now=None):
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m")
+
+
+def _shift(month, n):
+    year, m = divmod(int(month[:4]) * 12 + int(month[5:7]) - 1 + n, 12)
+    return f"{year:04d}-{m + 1:02d}"
+
+
+def skill_names(skills):
+    """Normalized skills of a ``Skills`` string (same rule as the forecast aggregation)."""
+    if not isinstance(skills, str):
+        return []
+    return list(dict.fromkeys(s.strip().lower() for s in skills.split(",") if s.strip()))
+
+
+# -------------------- STATISTICS --------------------
+def new_state(skill):
+    return {"_id": skill, "counts": {}, "folded": None, "months": 0, "level": 0.0, "slope": 0.0,
+            "variance": 0.0, "cusum_up": 0.0, "cusum_down": 0.0, "last_change": None, "change_direction": None}
+
+
+def fold(state, month, count):
+    """One Holt + CUSUM step with the (closed) month ``month``."""
+    if state["months"] == 0:
+        state.update(level=float(count), slope=0.0, variance=0.0)
+    else:
+        expected = state["level"] + state["slope"]
+        error = count - expected
+        # Poisson floor: a skill seen a handful of times a month is noisy by nature
+        sigma = math.sqrt(max(state["variance"], expected, 1.0))
+        z = error / sigma
+        level = max(ALPHA * count + (1 - ALPHA) * expected, 0.0)   # counts are never negative
+        state["slope"] = BETA * (level - state["level"]) + (1 - BETA) * state["slope"]
+        state["level"] = level
+        state["variance"] = (1 - ALPHA) * (state["variance"] + ALPHA * error ** 2)
+        state["cusum_up"] = max(0.0, state["cusum_up"] + z - CUSUM_DRIFT)
+        state["cusum_down"] = max(0.0, state["cusum_down"] - z - CUSUM_DRIFT)
+        if max(state["cusum_up"], state["cusum_down"]) > CHANGE_THRESHOLD:
+            state["last_change"] = month
+            state["change_direction"] = "up" if state["cusum_up"] > state["cusum_down"] else "down"
+            state["cusum_up"] = state["cusum_down"] = 0.0
+    state["folded"] = month
+    state["months"] += 1
+    return state
+
+
+def _fold_until(state, until):
+    """Fold every month before ``until`` that is not folded yet (zero when no posting)."""
+    month = _shift(state["folded"], 1) if state["folded"] else min(state["counts"], default=until)
+    while month < until:
+        fold(state, month, state["counts"].get(month, 0))
+        month = _shift(month, 1)
+    return state
+
+
+def advance(state, until):
+    """Fold the months that left the ``KEEP_MONTHS`` window ending at ``until`` and drop their counts."""
+    oldest = _shift(until, -KEEP_MONTHS)
+    _fold_until(state, oldest)
+    state["counts"] = {m: c for m, c in state["counts"].items() if m >= oldest}
+    return state
+
+
+def apply_counts(state, month_counts, until):
+    """Add ``{month: postings}`` to a skill state (months already folded are only reported)."""
+    late = 0
+    for month, count in month_counts.items():
+        if state["folded"] and month <= state["folded"]:
+            late += count
+        else:
+            state["counts"][month] = state["counts"].get(month, 0) + count
+    if late:
+        metrics.incr("skill_trends_late", late)
+    return advance(state, until)
+
+
+def summary(state, until=None):
+    """Live statistics of a skill state: every closed month before ``until`` (default: the current month) folded."""
+    until = until or current_month()
+    state = _fold_until({**state, "counts": dict(state["counts"])}, until)
+    level = state["level"]
+    return {
+        "Skill": state["_id"],
+        "level": level,
+        "slope": state["slope"],
+        "momentum_pct": 100 * state["slope"] / max(level, 1.0),
+        "change_score": state["cusum_up"] - state["cusum_down"],
+        "last_change": state["last_change"],
+        "change_direction": state["change_direction"],
+        "months": state["months"],
+        "current_count": state["counts"].get(until, 0),
+    }
+
+
+def history(state, until=None):
+    """
+    DataFrame [ds, count, level, slope] over the window of a skill state (ds = month
+    end, like the Prophet forecasts); the current month has its partial count only.
+    """
+    until = until or current_month()
+    state = {**state, "counts": dict(state["counts"])}
+    rows = []
+    month = _shift(state["folded"], 1) if state["folded"] else min(state["counts"], default=until)
+    while month < until:
+        fold(state, month, state["counts"].get(month, 0))
+        rows.append((month, state["counts"].get(month, 0), state["level"], state["slope"]))
+        month = _shift(month, 1)
+    rows.append((until, state["counts"].get(until, 0), None, None))
+    df = pd.DataFrame(rows, columns=["month", "count", "level", "slope"])
+    df["ds"] = pd.PeriodIndex(df.pop("month"), freq="M").to_timestamp(how="end").normalize()
+    return df[["ds", "count", "level", "slope"]]
+
+
+# -------------------- INGESTION --------------------
+class TrendTracker:
+    """Buffers the (distinct) postings of an ingest loop and updates their skills' states in bulk."""
+
+    def __init__(self, collection=None, batch_size=BATCH_SIZE):
+        self.collection = collection if collection is not None else trends_collection()
+        self.batch_size = batch_size
+        self.pending = defaultdict(Counter)   # skill -> {month: postings}
+        self.postings = 0
+
+    def add(self, job):
+        """Count one posting; near-duplicates and postings without date or skills are ignored."""
+        if job.get(DUPLICATE_FIELD) is not None:
+            return
+        month = month_of(job.get("Date"))
+        skills = skill_names(job.get("Skills"))
+        if month is None or not skills:
+            return
+        for skill in skills:
+            self.pending[skill][month] += 1
+        self.postings += 1
+        if self.postings >= self.batch_size:
+            self.flush()
+
+    def flush(self, until=None):
+        """Write the buffered counts; returns the number of skills updated."""
+        if not self.pending:
+            return 0
+        until = until or current_month()
+        pending, self.pending, self.postings = self.pending, defaultdict(Counter), 0
+        with metrics.timer("skill_trends_flush"):
+            updated = _write(self.collection, pending, until)
+        metrics.incr("skill_trends_skills", updated)
+        return updated
+
+
+def _write(collection, pending, until):
+    """
+    Read-modify-write of the states with optimistic concurrency: each document
+    carries a random ``revision`` and is only replaced if it did not change
+    since it was read; the skills that lost the race are re-read and re-applied.
+    """
+    skills = list(pending)
+    for _ in range(MAX_RETRIES):
+        stored = {doc["_id"]: doc for doc in collection.find({"_id": {"$in": skills}})}
+        operations, revisions = [], {}
+        for skill in skills:
+            state = stored.get(skill) or new_state(skill)
+            previous = state.pop("revision", None)
+            state = apply_counts(state, pending[skill], until)
+            state["revision"] = revisions[skill] = uuid.uuid4().hex
+            state["updated"] = datetime.now(timezone.utc)
+            operations.append(ReplaceOne({"_id": skill, "revision": previous}, state, upsert=True))
+        try:
+            collection.bulk_write(operations, ordered=False)
+        except BulkWriteError:
+            pass   # duplicate key: another writer changed the skill in between
+        written = {doc["_id"]: doc["revision"] for doc in collection.find({"_id": {"$in": skills}}, {"revision": 1})}
+        skills = [skill for skill in skills if written.get(skill) != revisions[skill]]
+        if not skills:
+            return len(pending)
+        metrics.incr("skill_trends_conflicts", len(skills))
+    raise RuntimeError(f"skill trends: {len(skills)} skills still conflicting after {MAX_RETRIES} attempts")
+
+
+# -------------------- BATCH --------------------
+def trends_collection(client=None):
+    client = client or MongoClient(MONGO_URI)
+    return client[DB_NAME][TRENDS_COLLECTION]
+
+
+def rebuild(since=None, until=None, client=None):
+    """Recompute every skill state from the postings (one aggregation); returns the number of skills."""
+    client = client or MongoClient(MONGO_URI)
+    postings = client[DB_NAME][COLLECTION_NAME]
+    until = until or current_month()
+    counts = defaultdict(dict)
+    with metrics.timer("skill_trends_rebuild"):
+        for doc in postings.aggregate(monthly_skill_counts_pipeline(since), allowDiskUse=True):
+            counts[doc["_id"]["skill"]][doc["_id"]["month"]] = doc["count"]
+        states = []
+        for skill, month_counts in counts.items():
+            state = apply_counts(new_state(skill), month_counts, until)
+            state["revision"] = uuid.uuid4().hex
+            state["updated"] = datetime.now(timezone.utc)
+            states.append(state)
+        collection = trends_collection(client)
+        collection.delete_many({})
+        if states:
+            collection.insert_many(states, ordered=False)
+    print(f"✅ Trend statistics rebuilt for {len(states)} skills")
+    metrics.flush()
+    return len(states)
+
+
+def load_trends(skills=None, collection=None, until=None):
+    """DataFrame of the live statistics (``summary``), for all skills or the given ones."""
+    collection = collection if collection is not None else trends_collection()
+    query = {"_id": {"$in": list(skills)}} if skills is not None else {}
+    rows = [summary(state, until) for state in collection.find(query)]
+    columns = ["Skill", "level", "slope", "momentum_pct", "change_score", "last_change",
+               "change_direction", "months", "current_count"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def load_state(skill, collection=None):
+    collection = collection if collection is not None else trends_collection()
+    return collection.find_one({"_id": skill})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live per-skill trend statistics (EWMA level / slope, change points).")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every skill from the postings")
+    parser.add_argument("--since", help="First month of the rebuild (YYYY-MM)")
+    parser.add_argument("--top", type=int, default=10, help="Skills shown per direction")
+    parser.add_argument("--min-level", type=float, default=5.0, help="Ignore skills below this monthly level")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        rebuild(args.since)
+    trends = load_trends()
+    trends = trends[trends["level"] >= args.min_level].sort_values("momentum_pct", ascending=False)
+    columns = ["Skill", "level", "slope", "momentum_pct", "change_score", "last_change"]
+    print("🚀 Rising\n" + trends.head(args.top)[columns].round(2).to_string(index=False))
+    print("📉 Falling\n" + trends.tail(args.top).iloc[::-1][columns].round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Word lists of the synthetic job postings.
+
+Shared by the benchmark corpora (``skill_radar.benchmarks``) and the synthetic
+Apify items of the fake backend (``skill_radar.apify_replay``), so both
+generate postings with the same skills, titles, locations and companies.
+"""
+
+SKILLS = ["python", "sql", "machine learning", "deep learning", "pandas", "numpy", "spark", "aws", "azure",
+          "docker", "kubernetes", "tensorflow", "pytorch", "power bi", "tableau", "excel", "statistics",
+          "scikit-learn", "airflow", "kafka", "git", "linux", "nlp", "computer vision", "r", "scala", "java",
+          "c++", "mlops", "data visualization", "etl", "snowflake", "databricks", "hadoop", "gcp", "llm"]
+TITLES = ["Data Scientist", "Senior Data Scientist", "Data Engineer", "Senior Data Engineer", "Lead Data Engineer",
+          "Data Analyst", "Senior Data Analyst", "Lead Data Analyst", "Machine Learning Engineer", "ML Engineer",
+          "Business Analyst", "Cloud Engineer", "Software Engineer", "Database Administrator", "AI Researcher"]
+LOCATIONS = ["Austin, TX", "New York, NY", "Remote", "London, England, United Kingdom", "Bengaluru, Karnataka",
+             "Toronto, ON", "San Francisco Bay Area", "Hybrid work in Pune, Maharashtra", "Paris", None]
+COMPANIES = [f"Company {i}" for i in range(200)]
+FILLER = ("we are looking for a motivated team player to join our growing data platform team and build "
+          "reliable pipelines models and dashboards with strong communication skills and ownership").split()
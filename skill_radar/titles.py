@@ -0,0 +1,40 @@
+"""Job title normalization shared by the dashboard panels and the salary sketches."""
+
+
+def normalize_title(title):
+    """Raw job title → one of the dashboard's title groups ("Other" when none matches)."""
+    if not isinstance(title, str):
+        return "Other"
+    title = title.lower().strip()
+
+    if "senior" in title and "data analyst" in title:
+        return "Senior Data Analyst"
+    elif "lead" in title and "data analyst" in title:
+        return "Lead Data Analyst"
+    elif "data analyst" in title:
+        return "Data Analyst"
+
+    elif "senior" in title and "data engineer" in title:
+        return "Senior Data Engineer"
+    elif "lead" in title and "data engineer" in title:
+        return "Lead Data Engineer"
+    elif "data engineer" in title:
+        return "Data Engineer"
+
+    elif "machine learning" in title or "ml engineer" in title:
+        return "Machine Learning Engineer"
+    elif "data scientist" in title and "senior" in title:
+        return "Senior Data Scientist"
+    elif "data scientist" in title:
+        return "Data Scientist"
+
+    elif "business analyst" in title:
+        return "Business Analyst"
+    elif "cloud engineer" in title:
+        return "Cloud Engineer"
+    elif "software engineer" in title:
+        return "Software Engineer"
+    elif "database administrator" in title:
+        return "Database Administrator"
+    else:
+        return "Other"
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the shared ``skill_radar`` package (repository root) importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
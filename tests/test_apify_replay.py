@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from skill_radar.apify_replay import SHARED_ITEMS, FakeApifyClient, replayed_items
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "indeed.jsonl"
+    path.write_text("".join(json.dumps({"positionName": "Data Engineer", "url": f"https://indeed/{i}"}) + "\n"
+                            for i in range(50)))
+    return path
+
+
+def run_urls(client):
+    run = client.actor("actor").call()
+    return [item["url"] for item in client.dataset(run["defaultDatasetId"]).iterate_items()]
+
+
+def test_replay_laps_are_distinct(recording):
+    urls = run_urls(FakeApifyClient("indeed", recording=recording, items=120))
+    assert len(set(urls)) == 120
+    assert urls[:50] == [f"https://indeed/{i}" for i in range(50)]     # the first lap is replayed as recorded
+
+
+def test_replayed_runs_survive_url_dedup(recording):
+    client = FakeApifyClient("indeed", recording=recording, items=100)
+    first, second = run_urls(client), run_urls(client)
+    shared = len(set(first) & set(second))
+    assert 0 < shared < 100 * 3 * SHARED_ITEMS
+    assert len(set(second)) == 100
+
+
+def test_replayed_items_keep_other_fields():
+    items = list(replayed_items([{"title": "ML Engineer", "jobUrl": "https://linkedin/1"}], 3, run=1))
+    assert [item["title"] for item in items] == ["ML Engineer"] * 3
+    assert len({item["jobUrl"] for item in items}) == 3
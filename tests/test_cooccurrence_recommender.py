@@ -0,0 +1,37 @@
+import numpy as np
+
+from skill_radar.cooccurrence_recommender import CooccurrenceRecommender
+
+POSTINGS = [
+    ["python", "sql", "pandas"], ["python", "pandas", "numpy"], ["python", "sql"],
+    ["java", "spring"], ["java", "spring", "sql"], ["python", "numpy"], "Python, Pandas",
+] * 5
+
+
+def test_batches_match_one_build():
+    one = CooccurrenceRecommender()
+    one.add_postings(POSTINGS)
+    batched = CooccurrenceRecommender()
+    for start in range(0, len(POSTINGS), 4):
+        batched.add_postings(POSTINGS[start:start + 4])
+    assert batched.n_postings == one.n_postings == len(POSTINGS)
+    assert batched.classes_ == one.classes_
+    assert (batched.X != one.X).nnz == 0
+    assert (batched.C != (batched.X.T @ batched.X)).nnz == 0
+    assert np.array_equal(batched.counts, np.asarray(batched.X.sum(axis=0)).ravel())
+
+
+def test_vocabulary_growth_after_read():
+    engine = CooccurrenceRecommender()
+    engine.add_postings([["python", "sql"]] * 3)
+    assert engine.X.shape == (3, 2)
+    engine.add_postings([["python", "airflow"]])
+    assert engine.X.shape == (4, 3)
+
+
+def test_recommend():
+    engine = CooccurrenceRecommender()
+    engine.add_postings(POSTINGS)
+    assert engine.recommend(["java"], top_k=1) == ["spring"]
+    assert "python" not in engine.recommend(["python"], top_k=3, method="ann")
+    assert engine.recommend(["unknown skill"]) == []
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from skill_radar.countries import UNKNOWN, resolve_countries, resolve_country
+
+
+@pytest.mark.parametrize("location, country", [
+    ("Remote in Austin, TX 78701", "United States"),
+    ("London, England, United Kingdom", "United Kingdom"),
+    ("Bengaluru, Karnataka", "India"),
+    ("Hybrid work in Pune", "India"),
+    ("San Jose, CA", "United States"),
+    ("CA", "Canada"),
+    ("Toronto, ON", "Canada"),
+])
+def test_resolve_country(location, country):
+    assert resolve_country(location) == country
+
+
+@pytest.mark.parametrize("location, country", [
+    # ISO country codes that are also subdivision codes of the gazetteer
+    ("Munich, DE", "Germany"),
+    ("Amsterdam, NL", "Netherlands"),
+    ("Tel Aviv, IL", "Israel"),
+    ("Bogotá, CO", "Colombia"),
+    ("Riyadh, SA", "Saudi Arabia"),
+    ("Mumbai, IN", "India"),
+    # ... still subdivisions when the city agrees or is unknown
+    ("Chicago, IL", "United States"),
+    ("Springfield, IL", "United States"),
+    ("Los Angeles, CA", "United States"),
+])
+def test_ambiguous_codes(location, country):
+    assert resolve_country(location) == country
+
+
+def test_missing_and_unresolved():
+    assert resolve_country(None) == UNKNOWN
+    assert resolve_country("   ", missing="missing") == "missing"
+    assert resolve_country("Atlantis", default=None) is None
+
+
+def test_resolve_countries_series():
+    locations = pd.Series(["Munich, DE", None, "Munich, DE", "Atlantis"], index=[3, 1, 2, 0])
+    resolved = resolve_countries(locations, default="?", missing="-")
+    assert resolved.tolist() == ["Germany", "-", "Germany", "?"]
+    assert resolved.index.tolist() == [3, 1, 2, 0]
@@ -0,0 +1,115 @@
+import random
+
+import mongomock
+import numpy as np
+import pytest
+from bson import ObjectId
+
+from skill_radar.dedup import (BANDS, DISTINCT, DUPLICATE_FIELD, NUM_PERM, SIGNATURE_FIELD, MinHasher, _Clusters,
+                               _signature, annotate, mark_duplicates, posting_text, shingle_hashes, sign, similarity)
+
+WORDS = [f"word{i}" for i in range(500)]
+
+
+def description(seed, n_words=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def edited(text, share, seed=0):
+    """``text`` with a ``share`` of its words replaced."""
+    rng = random.Random(seed)
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(len(words) * share)):
+        words[i] = f"new{i}"
+    return " ".join(words)
+
+
+def jaccard(a, b):
+    a, b = set(shingle_hashes(a)), set(shingle_hashes(b))
+    return len(a & b) / len(a | b)
+
+
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher(num_perm=512, bands=16)
+    text = description(1)
+    for share in (0.0, 0.02, 0.1, 0.3):
+        other = edited(text, share)
+        estimate = similarity(hasher.signature(text), hasher.signature(other))
+        assert estimate == pytest.approx(jaccard(text, other), abs=0.08)
+
+
+def test_signature_and_bands():
+    text = description(2)
+    fields = sign({"Description": text})
+    signature = _signature(fields[SIGNATURE_FIELD])
+    assert signature.dtype == np.uint32 and len(signature) == NUM_PERM
+    assert len(fields["LSH"]) == BANDS and len(set(fields["LSH"])) == BANDS
+    assert sign({"Description": text}) == fields                 # fixed seed: stored signatures stay comparable
+    assert sign({}) == {}
+    with pytest.raises(ValueError):
+        MinHasher(num_perm=100, bands=16)
+
+
+def test_similarity_against_a_matrix():
+    signature = np.array([1, 2, 3, 4], dtype=np.uint32)
+    matrix = np.array([[1, 2, 3, 4], [1, 2, 0, 0], [0, 0, 0, 0]], dtype=np.uint32)
+    np.testing.assert_array_equal(similarity(signature, matrix), [1.0, 0.5, 0.0])
+
+
+def test_posting_text_without_description():
+    doc = {"Description": "Remote", "Job Title": "Data Engineer", "Company": "Acme", "Location": None, "Date": ""}
+    assert posting_text(doc) == "Data Engineer | Acme"
+
+
+def test_clusters():
+    clusters = _Clusters()
+    clusters.union("c", "d")
+    clusters.union("e", "d")
+    clusters.union("b", "e")
+    clusters.union("x", "y")
+    assert clusters.find("e") == "b"
+    assert clusters.canonical() == {"c": "b", "d": "b", "e": "b", "y": "x"}
+    clusters.union("a", "y")
+    assert clusters.find("x") == "a" and clusters.find("b") == "b"
+
+
+def test_clusters_of_object_ids():
+    first, second, third = ObjectId(), ObjectId(), ObjectId()
+    clusters = _Clusters()
+    clusters.union(third, first)
+    clusters.union(second, third)
+    assert clusters.canonical() == {second: first, third: first}
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.job_offers
+
+
+def test_annotate_links_near_duplicates(collection):
+    text = description(3)
+    original = {"_id": "a", "Description": text, "Skills": "python"}
+    assert annotate(original, collection) is None and original[DUPLICATE_FIELD] is None
+    collection.insert_one(original)
+
+    duplicate = {"_id": "b", "Description": edited(text, 0.01)}
+    assert annotate(duplicate, collection) == {"_id": "a", "Skills": "python"}
+    assert duplicate[DUPLICATE_FIELD] == "a"
+
+    distinct = {"_id": "c", "Description": description(4)}
+    assert annotate(distinct, collection) is None
+
+
+def test_mark_duplicates(collection):
+    texts = [description(i) for i in range(5)]
+    docs = [{"_id": f"p{i}", "Description": text} for i, text in enumerate(texts)]
+    docs += [{"_id": "q0", "Description": edited(texts[0], 0.01, seed=1)},
+             {"_id": "q1", "Description": edited(texts[0], 0.01, seed=2)},
+             {"_id": "a3", "Description": edited(texts[3], 0.01)},
+             {"_id": "p4-stale", "Description": description(5), DUPLICATE_FIELD: "p4"}]   # no longer a duplicate
+    collection.insert_many([{**doc, **sign(doc)} for doc in docs])
+    assert mark_duplicates(collection) == 3
+    duplicates = {doc["_id"]: doc[DUPLICATE_FIELD] for doc in collection.find({DUPLICATE_FIELD: {"$ne": None}})}
+    assert duplicates == {"q0": "p0", "q1": "p0", "p3": "a3"}
+    assert collection.count_documents(DISTINCT) == 6
@@ -0,0 +1,62 @@
+import mongomock
+import pytest
+
+from skill_radar.config import COLLECTION_NAME, DB_NAME, DESCRIPTIONS_COLLECTION
+from skill_radar.description_store import (HASH_FIELD, attach, compress, decompress, description_hash,
+                                           description_of, description_terms, get, get_many, prune, put, put_many)
+
+TEXT = "Build ETL pipelines in Python & SQL. Python, Spark; Café au lait ☕ " * 20
+
+
+@pytest.fixture
+def client():
+    return mongomock.MongoClient()
+
+
+@pytest.fixture
+def store(client):
+    return client[DB_NAME][DESCRIPTIONS_COLLECTION]
+
+
+def test_compress_round_trip():
+    data = compress(TEXT)
+    assert len(data) < len(TEXT.encode("utf-8")) / 5
+    assert decompress(data) == TEXT
+
+
+def test_description_hash():
+    assert description_hash(TEXT) != description_hash(TEXT + " ")
+    assert len(description_hash(TEXT)) == 64
+    assert description_hash("  ") is None and description_hash(None) is None
+
+
+def test_description_terms():
+    assert description_terms("Python, SQL and python; Café") == "python sql and café"
+
+
+def test_put_and_get(store):
+    other = "Data analyst, Power BI dashboards."
+    hashes = put_many(store, [TEXT, other, TEXT, "", None])
+    assert hashes[0] == hashes[2] and hashes[3:] == [None, None]
+    assert store.count_documents({}) == 2                      # identical descriptions stored once
+    assert get_many(store, hashes) == {hashes[0]: TEXT, hashes[1]: other}
+    doc = store.find_one({"_id": hashes[1]})
+    assert doc["size"] == len(other) and doc["terms"] == "data analyst power bi dashboards"
+
+    assert put(store, other) == hashes[1] and store.count_documents({}) == 2
+    assert get(store, hashes[1]) == other
+    assert get(store, "unknown") is None and get_many(store, [None]) == {}
+
+
+def test_attach_inline_and_stored(store):
+    stored = put(store, TEXT)
+    docs = [{"_id": 1, HASH_FIELD: stored}, {"_id": 2, "Description": "inline text"}, {"_id": 3}]
+    assert [doc.get("Description") for doc in attach(docs, store)] == [TEXT, "inline text", None]
+    assert description_of({HASH_FIELD: stored}, store) == TEXT
+
+
+def test_prune(client, store):
+    kept, orphan = put_many(store, [TEXT, "orphan description"])
+    client[DB_NAME][COLLECTION_NAME].insert_one({HASH_FIELD: kept})
+    assert prune(client, chunk_size=1) == 1
+    assert get_many(store, [kept, orphan]) == {kept: TEXT}
@@ -0,0 +1,42 @@
+import math
+
+import pandas as pd
+import pytest
+
+from skill_radar.etl.normalize import format_dates, normalize_salary, relative_dates
+
+
+@pytest.mark.parametrize("salary, yearly", [
+    ("$50,000 - $70,000 a year", 60_000.0),
+    ("$25 an hour", 25 * 40 * 52),
+    ("$25.50 an hour", 25.5 * 40 * 52),
+    ("$1,000 a week", 52_000.0),
+    ("$4,000 - $5,000 a month", 54_000.0),
+    ("$200 a day", 200 * 5 * 52),
+    ("CA$80,000 yearly", 80_000.0),
+    (65000, 65_000.0),                               # already yearly
+])
+def test_normalize_salary(salary, yearly):
+    assert normalize_salary([salary]).tolist() == [pytest.approx(yearly)]
+
+
+def test_normalize_salary_mixed_chunk():
+    # a fractional hourly rate next to integer ranges: Float64 and Int64 parts in one chunk
+    salaries = normalize_salary(["$25.50 an hour", "$50,000 - $70,000 a year", None, "Competitive"])
+    assert salaries.dtype == float
+    assert salaries.tolist()[:2] == [25.5 * 40 * 52, 60_000.0]
+    assert math.isnan(salaries[2]) and math.isnan(salaries[3])
+
+
+def test_format_dates():
+    dates = format_dates(["2024-03-05T10:00:00.000Z", "2024-03-05", None, "not a date"])
+    assert dates.tolist() == ["05-03-2024", "05-03-2024", None, None]
+
+
+def test_relative_dates():
+    reference = pd.Timestamp("2024-03-10")
+    dates = relative_dates(["PostedToday", "PostedYesterday", "Posted 3 days ago", "30+ days ago", "2024-01-02", None],
+                           reference)
+    assert dates[:5].tolist() == [reference, pd.Timestamp("2024-03-09"), pd.Timestamp("2024-03-07"),
+                                  pd.Timestamp("2024-02-09"), pd.Timestamp("2024-01-02")]
+    assert pd.isna(dates[5])
@@ -0,0 +1,26 @@
+from skill_radar import metrics
+
+
+def snap(timers=None, counters=None):
+    return {"timers": timers or {}, "counters": counters or {}}
+
+
+def test_prometheus_escapes_label_values():
+    labels = (("path", 'C:\\data\\"raw"\nfile'),)
+    text = metrics.to_prometheus(snap(counters={("rows", labels): 3}))
+    assert 'skill_radar_rows_total{path="C:\\\\data\\\\\\"raw\\"\\nfile"} 3' in text.splitlines()
+
+
+def test_prometheus_summary_and_const_labels():
+    text = metrics.to_prometheus(snap(timers={("load", (("source", "indeed"),)): [2, 0.5, 0.1, 0.4]}), pid=7)
+    assert text.splitlines() == [
+        "# TYPE skill_radar_load_seconds summary",
+        'skill_radar_load_seconds_count{pid="7",source="indeed"} 2',
+        'skill_radar_load_seconds_sum{pid="7",source="indeed"} 0.500000',
+        "# TYPE skill_radar_load_seconds_max gauge",
+        'skill_radar_load_seconds_max{pid="7",source="indeed"} 0.400000',
+    ]
+
+
+def test_prometheus_without_labels():
+    assert metrics.to_prometheus(snap(counters={("rows", ()): 1})).splitlines()[1] == "skill_radar_rows_total 1"
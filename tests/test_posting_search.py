@@ -0,0 +1,68 @@
+from datetime import date, datetime
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from skill_radar.posting_search import (POSTED_FIELD, SKILLS_FIELD, SORT, _after, build_query, posted_at, search,
+                                        search_fields)
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock.MongoClient().db.job_offers
+    collection.insert_many([
+        {"_id": ObjectId() if i % 2 else f"etl-{i:03d}",   # scrapers' ObjectIds next to the ETL's string _ids
+         POSTED_FIELD: None if i % 7 == 0 else datetime(2024, 1, 1 + i % 5),
+         "Job Title": f"posting {i}", SKILLS_FIELD: ["python"] if i % 3 else ["sql"]}
+        for i in range(40)
+    ])
+    return collection
+
+
+def all_pages(collection, page_size, **filters):
+    rows, key = search(collection, page_size=page_size, include_duplicates=True, **filters)
+    pages = [rows]
+    while key is not None:
+        rows, key = search(collection, page_size=page_size, include_duplicates=True, after=key, **filters)
+        pages.append(rows)
+    return pages
+
+
+@pytest.mark.parametrize("page_size", [1, 3, 7, 40, 100])
+def test_pages_follow_the_sort_order(collection, page_size):
+    pages = all_pages(collection, page_size)
+    ids = [row["_id"] for page in pages for row in page]
+    assert ids == [doc["_id"] for doc in collection.find().sort(SORT)]
+    assert all(len(page) == page_size for page in pages[:-1])
+
+
+def test_pages_with_a_filter(collection):
+    ids = [row["_id"] for page in all_pages(collection, 4, skills=["SQL"]) for row in page]
+    assert ids == [doc["_id"] for doc in collection.find({SKILLS_FIELD: "sql"}).sort(SORT)]
+
+
+def test_after_an_undated_posting(collection):
+    undated = [doc for doc in collection.find().sort(SORT) if doc[POSTED_FIELD] is None]
+    rest = collection.find(_after((None, undated[0]["_id"]))).sort(SORT)
+    assert [doc["_id"] for doc in rest] == [doc["_id"] for doc in undated[1:]]
+
+
+@pytest.mark.parametrize("value, parsed", [
+    ("05-03-2024", datetime(2024, 3, 5)),
+    ("2024-03-05T10:00:00.000Z", datetime(2024, 3, 5, 10)),
+    (datetime(2024, 3, 5), datetime(2024, 3, 5)),
+    ("", None), (None, None), ("soon", None),
+])
+def test_posted_at(value, parsed):
+    assert posted_at(value) == parsed
+
+
+def test_search_fields():
+    assert search_fields({"Date": "05-03-2024", "Skills": "SQL, Python ,sql"}) == {
+        POSTED_FIELD: datetime(2024, 3, 5), SKILLS_FIELD: ["python", "sql"]}
+
+
+def test_build_query_end_is_inclusive():
+    query = build_query(start=date(2024, 3, 1), end=date(2024, 3, 31), include_duplicates=True)
+    assert query == {"$and": [{POSTED_FIELD: {"$gte": datetime(2024, 3, 1), "$lt": datetime(2024, 4, 1)}}]}
@@ -0,0 +1,21 @@
+from skill_radar.prediction_client import FORECAST_COLUMNS, PredictionClient
+
+
+def client_returning(payload):
+    client = PredictionClient("http://prediction-service.invalid")
+    client._call = lambda path, body=None: payload
+    return client
+
+
+def test_forecast_parses_dates():
+    client = client_returning({"forecast": [{"ds": "2025-01-31", "yhat": 2.0, "yhat_lower": 1.0, "yhat_upper": 3.0}]})
+    df = client.forecast("python", "2025-01-01", "2025-06-30")
+    assert df.columns.tolist() == FORECAST_COLUMNS
+    assert str(df["ds"].dt.strftime("%Y-%m").iloc[0]) == "2025-01"
+
+
+def test_empty_forecast_keeps_columns():
+    df = client_returning({"forecast": []}).forecast("python", "2030-01-01", "2030-12-31")
+    assert df.empty
+    assert df.columns.tolist() == FORECAST_COLUMNS
+    assert df[df["ds"] >= "2030-01-01"].empty   # the page filters on ds
@@ -0,0 +1,41 @@
+import numpy as np
+import scipy.sparse as sp
+
+from skill_radar.recommender_training import batch_generator, mask_skills
+
+
+def postings(n_rows=200, n_skills=40, seed=0):
+    rng = np.random.default_rng(seed)
+    return sp.csr_matrix((rng.random((n_rows, n_skills)) < 0.25).astype(np.float32))
+
+
+def test_mask_skills_hides_a_fraction_of_each_row():
+    X = postings()
+    masked = mask_skills(X, hide_fraction=0.3, rng=np.random.default_rng(1))
+    counts = np.diff(X.indptr)
+    np.testing.assert_array_equal(np.diff(masked.indptr), counts - (counts * 0.3).astype(int))
+    assert (masked - masked.multiply(X)).nnz == 0       # only skills of the posting are kept
+    assert X.nnz == postings().nnz                      # X is not modified
+
+
+def test_mask_skills_is_random_and_seeded():
+    X = postings()
+    a = mask_skills(X, rng=np.random.default_rng(1))
+    b = mask_skills(X, rng=np.random.default_rng(1))
+    c = mask_skills(X, rng=np.random.default_rng(2))
+    assert (a != b).nnz == 0 and (a != c).nnz > 0
+
+
+def test_mask_skills_edge_cases():
+    X = sp.csr_matrix(np.array([[0, 0, 0], [1, 0, 0], [1, 1, 1]], dtype=np.float32))
+    np.testing.assert_array_equal(mask_skills(X, hide_fraction=0.0).toarray(), X.toarray())
+    np.testing.assert_array_equal(np.diff(mask_skills(X, hide_fraction=1.0).indptr), [0, 0, 0])
+    np.testing.assert_array_equal(np.diff(mask_skills(X, hide_fraction=0.5).indptr), [0, 1, 2])
+
+
+def test_batch_generator_shapes():
+    X = postings(n_rows=100)
+    batches = list(batch_generator(X, batch_size=32, epochs=1))
+    assert [len(full) for _, full in batches] == [32, 32, 32, 4]
+    for masked, full in batches:
+        assert masked.dtype == np.float32 and (masked <= full).all()
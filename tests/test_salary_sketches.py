@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+from skill_radar.countries import COUNTRY_FIELD
+from skill_radar.salary_sketches import COMPRESSION, TDigest, salary_value, sketch_groups
+
+
+@pytest.fixture
+def salaries():
+    return np.random.default_rng(0).lognormal(math.log(90_000), 0.4, 50_000)
+
+
+def test_quantiles_match_exact(salaries):
+    digest = TDigest().add(salaries)
+    for q in (0.1, 0.5, 0.9):
+        assert digest.quantile(q) == pytest.approx(np.quantile(salaries, q), rel=0.01)
+    assert digest.quantile(0.0) == salaries.min() and digest.quantile(1.0) == salaries.max()
+    assert len(digest.means) <= COMPRESSION
+    assert digest.count == len(salaries)
+
+
+def test_merge_matches_single_digest(salaries):
+    parts = [TDigest().add(part) for part in np.array_split(salaries, 7)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    single = TDigest().add(salaries)
+    assert merged.count == pytest.approx(len(salaries))
+    assert (merged.min, merged.max) == (salaries.min(), salaries.max())
+    np.testing.assert_allclose(merged.quantile([0.1, 0.5, 0.9]), single.quantile([0.1, 0.5, 0.9]), rtol=0.01)
+
+
+def test_document_round_trip(salaries):
+    digest = TDigest().add(salaries[:1000])
+    restored = TDigest.from_document(digest.to_document())
+    np.testing.assert_array_equal(restored.quantile([0.1, 0.5, 0.9]), digest.quantile([0.1, 0.5, 0.9]))
+    assert restored.merge(TDigest().add(salaries[1000:2000])).count == pytest.approx(2000)
+
+
+def test_empty_and_single_value():
+    assert math.isnan(TDigest().quantile(0.5))
+    assert np.isnan(TDigest().quantile([0.1, 0.9])).all()
+    assert TDigest().add([50_000]).quantile(0.9) == 50_000
+
+
+@pytest.mark.parametrize("salary, value", [
+    (60_000, 60_000.0), (999, None), (2_000_000, None), (math.nan, None), (None, None), ("60000", None), (True, None),
+])
+def test_salary_value(salary, value):
+    assert salary_value(salary) == value
+
+
+def test_sketch_groups():
+    job = {"Job Title": "Data Scientist", COUNTRY_FIELD: "Germany", "Skills": "Python, SQL"}
+    ids = [_id for _id, _ in sketch_groups(job)]
+    assert "all" in ids and "country|Germany" in ids
+    assert {"skill|python", "skill|sql"} <= set(ids)
+    assert sum(i.startswith("title_country|") for i in ids) == 1
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from skill_radar.skill_aliases import (canonicalize, candidate_pairs, edit_distance, load_aliases, propose,
+                                       save_aliases, variant_key)
+
+
+@pytest.mark.parametrize("skill, key", [
+    ("Scikit Learn", "scikitlearn"), ("scikit-learn", "scikitlearn"), ("Dashboards", "dashboard"),
+    ("Business", "business"), ("C++", "c++"), ("C#", "c#"), ("Modélisation", "modelisation"), ("aws", "aws"),
+])
+def test_variant_key(skill, key):
+    assert variant_key(skill) == key
+
+
+@pytest.mark.parametrize("a, b, limit, distance", [
+    ("python", "python3", None, 1), ("kitten", "sitting", None, 3), ("", "sql", None, 3),
+    ("kitten", "sitting", 1, 2), ("a", "abcdef", 2, 3),
+])
+def test_edit_distance(a, b, limit, distance):
+    assert edit_distance(a, b, limit) == distance
+
+
+def test_candidate_pairs():
+    keys = ["tensorflow", "tensorflows", "tableau", "power bi", "powerbi"]
+    assert {tuple(p) for p in candidate_pairs(keys, block_rows=2)} == {(0, 1), (3, 4)}
+    assert candidate_pairs([]).shape == (0, 2)
+
+
+def test_propose():
+    frequencies = pd.Series({"scikit-learn": 90, "Scikit Learn": 10, "pytorch": 80, "pytorchh": 5,
+                             "java": 70, "javascript": 60, "sql": 50, "dashboards": 3, "dashboard": 4})
+    proposals = propose(frequencies, aliases={})
+    pairs = {(row.alias, row.canonical): row for row in proposals.itertuples()}
+    assert set(pairs) == {("Scikit Learn", "scikit-learn"), ("pytorchh", "pytorch"), ("dashboards", "dashboard")}
+    assert pairs["Scikit Learn", "scikit-learn"].accept == "yes"    # same variant key
+    assert pairs["pytorchh", "pytorch"].accept == ""                # edit distance: reviewed by hand
+    assert pairs["pytorchh", "pytorch"].alias_count == 5
+
+
+def test_propose_skips_known_aliases():
+    frequencies = pd.Series({"python": 100, "python3": 20})
+    assert propose(frequencies, aliases={}).alias.tolist() == ["python3"]
+    assert propose(frequencies, aliases={"python3": "python"}).empty
+
+
+def test_aliases_round_trip(tmp_path):
+    path = save_aliases({"sklearn": "scikit learn", "scikit learn": "scikit-learn"}, tmp_path / "aliases.json")
+    aliases = load_aliases(path)
+    assert aliases == {"sklearn": "scikit-learn", "scikit learn": "scikit-learn"}     # chains resolved
+    assert canonicalize(["Sklearn", " scikit-learn", "SQL"], aliases) == ["scikit-learn", "SQL"]
+    assert load_aliases(tmp_path / "missing.json") == {}
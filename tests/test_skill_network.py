@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from skill_radar.skill_network import cluster, layout
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 8])
+def test_layout_has_two_columns(size):
+    rng = np.random.default_rng(0)
+    weights = rng.random((size, size))
+    weights = (weights + weights.T) / 2
+    np.fill_diagonal(weights, 0)
+    positions = layout(weights)
+    assert positions.shape == (size, 2)
+    assert np.isfinite(positions).all()
+
+
+def test_layout_places_associated_skills_close():
+    # two groups of three strongly associated skills, weakly linked to each other
+    weights = np.full((6, 6), 0.1)
+    weights[:3, :3] = weights[3:, 3:] = 5.0
+    np.fill_diagonal(weights, 0)
+    positions = layout(weights)
+    distances = np.linalg.norm(positions[:, None] - positions[None], axis=-1)
+    assert distances[0, 1] < distances[0, 4]
+    assert distances[3, 5] < distances[2, 5]
+
+
+def test_cluster_small_and_grouped():
+    assert cluster(np.zeros((1, 1))).tolist() == [1]
+    weights = np.zeros((6, 6))
+    weights[:3, :3] = weights[3:, 3:] = 1.0
+    np.fill_diagonal(weights, 0)
+    labels = cluster(weights, n_clusters=2)
+    assert len(set(labels[:3])) == 1 and len(set(labels[3:])) == 1 and labels[0] != labels[3]
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+
+from skill_radar.skill_trends import TrendTracker, apply_counts, month_of, new_state, skill_names, summary
+
+
+@pytest.mark.parametrize("date, month", [
+    ("05-03-2024", "2024-03"),                      # scrapers / ETL
+    ("2024-03-05T10:00:00.000Z", "2024-03"),        # LinkedIn publishedAt
+    ("2024-03-05", "2024-03"),
+    (datetime(2024, 1, 2), "2024-01"),
+    (None, None),
+    ("", None),
+    ("not a date", None),
+])
+def test_month_of(date, month):
+    assert month_of(date) == month
+
+
+def test_skill_names():
+    assert skill_names(" Python, SQL ,python,, ") == ["python", "sql"]
+    assert skill_names(None) == []
+
+
+def test_tracker_counts_iso_dates():
+    tracker = TrendTracker(collection=object(), batch_size=100)
+    tracker.add({"Date": "2024-03-05T10:00:00.000Z", "Skills": "Python, SQL"})
+    tracker.add({"Date": "07-03-2024", "Skills": "python"})
+    tracker.add({"Date": "07-03-2024", "Skills": "python", "DuplicateOf": "x"})
+    tracker.add({"Date": None, "Skills": "python"})
+    assert tracker.postings == 2
+    assert tracker.pending["python"] == {"2024-03": 2}
+    assert tracker.pending["sql"] == {"2024-03": 1}
+
+
+def test_apply_counts_and_summary():
+    state = apply_counts(new_state("python"), {"2024-01": 10, "2024-02": 12, "2024-03": 14}, until="2024-04")
+    live = summary(state, until="2024-04")
+    assert live["months"] == 3
+    assert live["slope"] > 0
+    assert live["current_count"] == 0